@@ -0,0 +1,177 @@
+"""Benchmark of lib_file.Project at 10k, 100k and 1M task scale without the GUI
+
+A deterministic dataset is generated for each scale with lib_generate, then each operation is timed over --repeat calls and the
+p50/p95/p99 latencies are reported with the peak Python memory of a single call (from tracemalloc).
+The query cache is cleared before every call so the DB is measured, not the cache.
+Results can be written as JSON and compared with an earlier run to catch regressions. Run from the repository root:
+    python -m benchmarks.bench_project [--scale 10k 100k 1m] [--repeat 50] [--seed 1] [--json out.json]
+    python -m benchmarks.bench_project --scale 10k --compare out.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+
+import src.lib_file as lib_file
+import src.lib_generate as lib_generate
+
+try:
+    import resource  # Peak RSS of the process, not available on Windows
+except ImportError:
+    resource = None
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+TASKS_PER_USER = 1000
+REGRESSION = 1.2  # --compare flags operations whose p50 grew by more than this factor
+REGRESSION_MIN_MS = 0.05  # and by more than this, smaller changes are timer noise
+
+
+def measure(function, repeat, setup) -> dict:
+    """Times repeat calls of function(*setup(i)), setup is not timed
+
+    Returns:
+        dict: latencies in milliseconds and the peak memory of one extra call in KiB
+    """
+    samples = []
+    for i in range(repeat):
+        args = setup(i)
+        start = time.perf_counter()
+        function(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    # Measured separately as tracemalloc slows every allocation down
+    args = setup(repeat)
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    percentiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"calls": repeat, "mean_ms": statistics.fmean(samples), "p50_ms": percentiles[49],
+            "p95_ms": percentiles[94], "p99_ms": percentiles[98], "peak_kib": peak / 1024}
+
+
+def run_scale(project_dir, name, tasks, repeat, seed) -> dict:
+    """Generates a dataset of the given size and times each operation on it"""
+    db = lib_file.Project()
+    db.set_dir(project_dir)
+    db.set_profile("fast")
+    file_name = f"bench_{name}.db"
+    db.create_db(file_name)
+    db.open_db(file_name)
+
+    start = time.perf_counter()
+    sizes = lib_generate.generate(
+        db, users=max(tasks // TASKS_PER_USER, 100), tasks=tasks, seed=seed)
+    generate_s = time.perf_counter() - start
+
+    rand = random.Random(seed)
+    user_ids = range(sizes["users"])
+    project_ids = list(range(1, sizes["projects"] + 1))
+    rand.shuffle(project_ids)
+    to_delete = iter(project_ids)
+
+    def login(i):
+        return lib_generate.user_credentials(rand.choice(user_ids))
+
+    def as_user(i):
+        db.cache.clear()
+        db.login(*login(i))
+        return ()
+
+    def in_project(i):
+        db.cache.clear()
+        db.current_project(rand.choice(project_ids), "")
+        return ()
+
+    def uncached(function):
+        def setup(i):
+            db.cache.clear()
+            return function(i)
+        return setup
+
+    operations = {
+        "login": (db.login, uncached(login)),
+        "list_project": (db.list_project, as_user),
+        "project_data": (db.project_data, uncached(lambda i: (rand.choice(project_ids),))),
+        "list_tasks": (db.list_tasks, in_project),
+        "search_tasks": (db.search_tasks, lambda i: in_project(i) + (" ".join(rand.sample(lib_generate.WORDS, 2))[:6],)),
+        "create_task": (db.create_task, lambda i: in_project(i) + (
+            "bench", "created by the benchmark", lib_generate.START_DATE,
+            lib_generate.START_DATE + timedelta(days=7), False)),
+        "delete_project": (db.delete_project, uncached(lambda i: (next(to_delete),))),
+        "clean_up": (db.clean_up, as_user),
+    }
+
+    results = {}
+    for operation, (function, setup) in operations.items():
+        results[operation] = measure(function, repeat, setup)
+        print(f"  {operation:<16}" + "  ".join(
+            f"{key}={results[operation][key]:.3f}" for key in ("p50_ms", "p95_ms", "p99_ms", "peak_kib")))
+
+    db.exit()
+    return {**sizes, "generate_s": generate_s, "operations": results}
+
+
+def compare(old, new) -> bool:
+    """Prints the change in p50 latency of each operation, returns True if any regressed by more than REGRESSION and REGRESSION_MIN_MS"""
+    regressed = False
+    for scale, result in new["scales"].items():
+        if scale not in old["scales"]:
+            continue
+        print(f"{scale} compared to the previous run:")
+        for operation, timing in result["operations"].items():
+            before = old["scales"][scale]["operations"].get(operation)
+            if before is None:
+                continue
+            ratio = timing["p50_ms"] / before["p50_ms"] if before["p50_ms"] else float("inf")
+            flag = ""
+            if ratio > REGRESSION and timing["p50_ms"] - before["p50_ms"] > REGRESSION_MIN_MS:
+                flag = "  REGRESSION"
+                regressed = True
+            print(f"  {operation:<16}{before['p50_ms']:10.3f} -> {timing['p50_ms']:10.3f} ms  {ratio:5.2f}x{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lib_file.Project without the GUI")
+    parser.add_argument("--scale", nargs="+", choices=SCALES, default=["10k", "100k"],
+                        help="Dataset sizes to run, 1m takes a few minutes")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed calls per operation")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--compare", help="Results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    report = {"seed": args.seed, "repeat": args.repeat, "python": platform.python_version(),
+              "sqlite": sqlite3.sqlite_version, "platform": platform.platform(), "scales": {}}
+    with tempfile.TemporaryDirectory() as project_dir:
+        for name in args.scale:
+            print(f"{name} tasks:")
+            report["scales"][name] = run_scale(
+                project_dir, name, SCALES[name], args.repeat, args.seed)
+    if resource is not None:
+        # ru_maxrss is in KiB on Linux, bytes on macOS
+        report["max_rss_kib"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(f"Peak RSS: {report['max_rss_kib']} KiB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"Results written to {args.json}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            if compare(json.load(file), report):
+                raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
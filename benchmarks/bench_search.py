@@ -0,0 +1,164 @@
+"""Benchmark of search-as-you-type latency in a project with 100k tasks
+
+Latency is measured from the last keystroke to the final results being shown, it includes the debounce delay.
+Compares running a query for every keystroke against lib_search.IncrementalSearch (debounce, cancellation and
+narrowing in memory). Run from the repository root:
+    python -m benchmarks.bench_search [--tasks 100000]
+"""
+
+import argparse
+import heapq
+import itertools
+import random
+import tempfile
+import time
+
+import src.lib_file as lib_file
+import src.lib_search as lib_search
+import src.lib_worker as lib_worker
+
+WORDS = ["deploy", "database", "design", "review", "release", "refactor", "report", "meeting", "migrate",
+         "update", "upgrade", "backup", "budget", "bug", "build", "test", "team", "client", "cleanup", "docs"]
+TYPED = "deploy data"
+KEY_INTERVAL_MS = 80  # Time between keystrokes, roughly 75 words per minute
+PAUSE_MS = 400  # Time the user stops to read the results after each word
+
+
+class Clock:
+    """Stand in for the Tk event loop, runs scheduled functions when they are due"""
+
+    def __init__(self) -> None:
+        self._timers: list = []
+        self._ids = itertools.count()
+        self._cancelled: set = set()
+
+    def after(self, ms, function):
+        timer_id = next(self._ids)
+        heapq.heappush(self._timers, (time.perf_counter() +
+                       ms / 1000, timer_id, function))
+        return timer_id
+
+    def after_cancel(self, timer_id):
+        self._cancelled.add(timer_id)
+
+    def run_until(self, done, timeout=60):
+        """Runs due timers until done() returns True"""
+        end = time.perf_counter() + timeout
+        while not done() and time.perf_counter() < end:
+            while self._timers and self._timers[0][0] <= time.perf_counter():
+                _, timer_id, function = heapq.heappop(self._timers)
+                if timer_id not in self._cancelled:
+                    function()
+            time.sleep(0.0005)
+
+
+def build(db, project_dir, tasks) -> None:
+    """Creates a DB with one project holding the given number of tasks, runs on the DB worker thread"""
+    db.set_dir(project_dir)
+    db.create_db("bench.db")
+    db.open_db("bench.db")
+    db.create_user("bench", "bench")
+    db.login("bench", "bench")
+    db.create_project("Bench", "", db.get_group_id("Default"))
+    db.current_project(1, "Bench")
+    rand = random.Random(1)
+    rows = ((" ".join(rand.sample(WORDS, 2)), " ".join(rand.sample(WORDS, 3)), 1) for _ in range(tasks))
+    db.project_db.execute("BEGIN TRANSACTION;")
+    db.project_db.executemany(
+        "INSERT INTO Task (Name, Description, Complete, projectID) VALUES(?, ?, 0, ?);", rows)
+    db.project_db.commit()
+
+
+class Timed:
+    """Wraps a search function to total the time spent running it on the DB worker thread"""
+
+    def __init__(self, function) -> None:
+        self.function = function
+        self.total = 0.0
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.function(*args, **kwargs)
+        finally:
+            self.total += time.perf_counter() - start
+
+
+def type_search(clock, on_key) -> float:
+    """Types TYPED one key at a time, returns the time the last key was pressed"""
+    for i in range(1, len(TYPED) + 1):
+        on_key(TYPED[:i])
+        last_key = time.perf_counter()
+        wait = PAUSE_MS if TYPED[i - 1:i + 1] == TYPED[i - 1] + " " else KEY_INTERVAL_MS
+        clock.run_until(lambda: time.perf_counter() >= last_key + wait / 1000)
+    return last_key
+
+
+def per_keystroke(db, worker) -> dict:
+    """Runs a query for every keystroke, each one waits for the ones before it"""
+    clock = Clock()
+    worker._schedule = clock.after
+    worker._schedule(0, worker._poll)
+    shown = {}
+    search_tasks = Timed(db.search_tasks)
+
+    def on_key(term):
+        worker.submit(search_tasks, term, True,
+                      callback=lambda rows: shown.setdefault(term, (time.perf_counter(), len(rows))))
+
+    last_key = type_search(clock, on_key)
+    clock.run_until(lambda: TYPED in shown)
+    return {"queries": len(TYPED), "db_ms": search_tasks.total * 1000,
+            "latency_ms": (shown[TYPED][0] - last_key) * 1000, "results": shown[TYPED][1]}
+
+
+def incremental(db, worker) -> dict:
+    """Runs the same typing through IncrementalSearch"""
+    clock = Clock()
+    worker._schedule = clock.after
+    worker._schedule(0, worker._poll)
+    shown = {}
+    tag = "search"
+    search_tasks = Timed(db.search_tasks)
+
+    def request(function, *args, callback):
+        worker.cancel(tag)
+        worker.submit(function, *args, callback=callback, tag=tag)
+
+    search = lib_search.IncrementalSearch(
+        search=lambda term: search_tasks(term, with_text=True),
+        request=request,
+        cancel=lambda: worker.cancel(tag),
+        show=lambda rows: shown.setdefault(search.rows_term, (time.perf_counter(), len(rows))),
+        clear=lambda: None,
+        schedule=clock.after,
+        unschedule=clock.after_cancel)
+
+    last_key = type_search(clock, search.key_pressed)
+    clock.run_until(lambda: TYPED in shown)
+    return {"queries": search.queries, "narrowed": search.narrowed, "cancelled": search.cancelled,
+            "db_ms": search_tasks.total * 1000, "latency_ms": (shown[TYPED][0] - last_key) * 1000, "results": shown[TYPED][1]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search-as-you-type latency")
+    parser.add_argument("--tasks", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as project_dir:
+        db = lib_file.Project()
+        worker = lib_worker.DBWorker(db, lambda ms, function: None)
+        worker.call(build, db, project_dir, args.tasks)
+
+        print(f"Typing {TYPED!r} at {KEY_INTERVAL_MS}ms per key into {args.tasks} tasks")
+        for name, run in (("per keystroke", per_keystroke), ("incremental", incremental)):
+            result = run(db, worker)
+            print(f"{name:<15}" + "  ".join(f"{key}={value:.1f}" if isinstance(value, float)
+                                             else f"{key}={value}" for key, value in result.items()))
+
+        worker.call(db.exit)
+        worker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Load generator for server.py on localhost
+
+Generates a DB with lib_generate, starts server.py on it in a separate process and runs --clients client threads,
+each logged in as a different user through lib_client.RemoteProject. Every client repeatedly browses a random project
+(list, details, tasks, search, a task) and adds or edits a task --write-ratio of the time.
+Throughput and p50/p95 latency per operation are reported for each --readers setting. Run from the repository root:
+    python -m benchmarks.bench_server [--clients 16] [--duration 10] [--readers 1 4] [--tasks 100000]
+"""
+
+import argparse
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+import src.lib_client as lib_client
+import src.lib_file as lib_file
+import src.lib_generate as lib_generate
+
+STARTUP_TIMEOUT_S = 30
+
+
+def free_port() -> int:
+    """Returns a localhost port nothing is listening on"""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_server(project_dir, readers) -> tuple:
+    """Starts server.py in a new process, returns [0]the process and [1]its URL once it answers"""
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "server.py", "--dir", project_dir, "--db", "bench.db", "--port", str(port),
+         "--readers", str(readers), "--profile", "fast"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    end = time.perf_counter() + STARTUP_TIMEOUT_S
+    while time.perf_counter() < end:
+        try:
+            lib_client.RemoteProject(url).status()
+            return process, url
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("server.py did not start")
+
+
+def client(url, user_number, write_ratio, stop, samples, seed) -> None:
+    """Browses and edits projects as one user until stop is set, appending (operation, ms) to samples"""
+    rand = random.Random(seed)
+    remote = lib_client.RemoteProject(url)
+
+    def timed(operation, function, *args):
+        start = time.perf_counter()
+        result = function(*args)
+        samples.append((operation, (time.perf_counter() - start) * 1000))
+        return result
+
+    timed("login", remote.login, *lib_generate.user_credentials(user_number))
+    while not stop.is_set():
+        projects = timed("list_project_page", remote.list_project_page)
+        if not projects:
+            break
+        project_id, project_name = rand.choice(projects)
+        timed("project_data", remote.project_data, project_id)
+        timed("current_project", remote.current_project, project_id, project_name)
+        tasks = timed("list_tasks_page", remote.list_tasks_page)
+        timed("search_tasks", remote.search_tasks, rand.choice(lib_generate.WORDS)[:4])
+        if tasks:
+            task_id = rand.choice(tasks)[0]
+            name, description, _, complete = timed("task_data", remote.task_data, task_id)
+        if rand.random() < write_ratio:
+            if tasks and rand.random() < 0.5:
+                timed("edit_task", remote.edit_task, task_id, name, description,
+                      lib_generate.START_DATE + timedelta(days=rand.randrange(365)), not complete)
+            else:
+                timed("create_task", remote.create_task, "load", "added by bench_server", lib_generate.START_DATE,
+                      lib_generate.START_DATE + timedelta(days=7), False)
+    remote.exit()
+
+
+def run(project_dir, readers, clients, duration, write_ratio, users) -> dict:
+    """Runs the clients against a server with the given number of readers, returns the samples by operation"""
+    process, url = start_server(project_dir, readers)
+    samples = []  # list.append is atomic, shared by the client threads
+    stop = threading.Event()
+    threads = [threading.Thread(target=client, args=(url, i * users // clients, write_ratio, stop, samples, i))
+               for i in range(clients)]
+    try:
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        status = lib_client.RemoteProject(url).status()
+    finally:
+        process.terminate()
+        process.wait()
+
+    by_operation = defaultdict(list)
+    for operation, ms in samples:
+        by_operation[operation].append(ms)
+    return {"requests": len(samples), "per_second": len(samples) / duration, "errors": status["errors"],
+            "operations": by_operation}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for server.py")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of load for each --readers setting")
+    parser.add_argument("--readers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as project_dir:
+        db = lib_file.Project()
+        db.set_dir(project_dir)
+        db.set_profile("fast")
+        db.create_db("bench.db")
+        db.open_db("bench.db")
+        users = lib_generate.generate(db, users=max(args.tasks // 1000, 100), tasks=args.tasks, seed=args.seed)["users"]
+        db.exit()
+
+        print(f"{args.clients} clients, {args.write_ratio:.0%} writes, {args.tasks} tasks, cpus={os.cpu_count()}")
+        for readers in args.readers:
+            result = run(project_dir, readers, args.clients, args.duration, args.write_ratio, users)
+            print(f"readers={readers}: {result['per_second']:.0f} requests/s, {result['errors']} errors")
+            for operation, times in sorted(result["operations"].items()):
+                cuts = statistics.quantiles(times, n=20) if len(times) > 1 else times * 19
+                print(f"  {operation:<18}{len(times):8d} calls  p50={statistics.median(times):7.2f} ms"
+                      f"  p95={cuts[18]:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark comparing f-string built SQL against the bound parameter queries used by lib_file.Project
+
+Run from the repository root:
+    python -m benchmarks.bench_statements
+"""
+
+import tempfile
+import time
+from datetime import date
+
+import src.lib_file as lib_file
+
+CALLS = 20000
+TASKS = 2000
+
+
+def time_per_call(function, calls=CALLS) -> float:
+    """Returns the mean time per call of function in microseconds"""
+    start = time.perf_counter()
+    for i in range(calls):
+        function(i)
+    return (time.perf_counter() - start) / calls * 1_000_000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as project_dir:
+        db = lib_file.Project()
+        db.set_dir(project_dir)
+        db.create_db("bench.db")
+        db.open_db("bench.db")
+        db.create_user("bench", "bench")
+        db.login("bench", "bench")
+        db.create_project("Bench", "Benchmark project",
+                          db.get_group_id("Default"))
+        db.current_project(db.list_project()[0][0], "Bench")
+        for i in range(TASKS):
+            db.create_task(f"Task {i}", "", date.today(),
+                           date.today(), i % 2 == 0)
+        connection = db.project_db
+
+        # Previous implementation, every call is a new SQL string so the statement cache never hits
+        def task_data_fstring(i):
+            connection.execute(
+                f"""SELECT Name, Description, DateDue, Complete from Task where ID = {i % TASKS + 1};""").fetchone()
+
+        # Runs the statement rather than Project.task_data, which would usually answer from the query cache
+        def task_data_bound(i):
+            connection.execute(lib_file.SQL_TASK_DATA, {
+                               "task_id": i % TASKS + 1}).fetchone()
+
+        def login_fstring(i):
+            connection.execute(
+                f"""SELECT ID FROM "User" where UserName = "bench{i}" and PassHash = "{i}";""").fetchone()
+
+        def login_bound(i):
+            connection.execute(lib_file.SQL_USER_LOGIN, {
+                               "user_name": f"bench{i}", "pass_hash": str(i)}).fetchone()
+
+        results = {
+            "task_data": (time_per_call(task_data_fstring), time_per_call(task_data_bound)),
+            "login lookup": (time_per_call(login_fstring), time_per_call(login_bound)),
+        }
+        db.exit()
+
+    print(f"{'query':<15}{'f-string (us)':>15}{'bound (us)':>15}{'speed up':>10}")
+    for name, (before, after) in results.items():
+        print(f"{name:<15}{before:>15.2f}{after:>15.2f}{before / after:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
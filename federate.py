@@ -0,0 +1,54 @@
+"""Queries every TaskMaster DB file in a directory at once as one user, see src/lib_federate.py
+
+The user is matched by name and password in each file, files the user is not in add nothing to the results.
+
+Usage:
+    python federate.py --dir Tests --user NAME due [--start 2024-01-01 --end 2024-01-07]
+    python federate.py --dir Tests --user NAME search WORDS...
+    python federate.py --dir Tests --user NAME completion
+"""
+
+import argparse
+import getpass
+import logging
+from datetime import date
+
+import src.lib_federate as lib_federate
+import src.lib_file as lib_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", default="Tests", help="Directory containing the DB files")
+    parser.add_argument("--user", required=True, help="User name, the password is asked for")
+    parser.add_argument("--workers", type=int, help="Batches of files queried in parallel")
+    commands = parser.add_subparsers(dest="command", required=True)
+    due = commands.add_parser("due", help="Incomplete tasks due between --start and --end, by default this week")
+    due.add_argument("--start", type=date.fromisoformat)
+    due.add_argument("--end", type=date.fromisoformat)
+    search = commands.add_parser("search", help="Projects matching the search words")
+    search.add_argument("words", nargs="+")
+    commands.add_parser("completion", help="Task completion of the user's projects in each file")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(levelname)s: %(message)s",
+                        level=logging.WARNING)
+
+    federation = lib_federate.Federation(args.dir, args.user, lib_file.hash_password(getpass.getpass()),
+                                         args.workers)
+    if args.command == "due":
+        for file, project_name, task_id, task_name, date_due in federation.due_tasks(args.start, args.end):
+            print(f"{date_due}  {file}: {project_name} / {task_name} (task {task_id})")
+    elif args.command == "search":
+        for file, project_id, project_name, description in federation.search_projects(" ".join(args.words)):
+            print(f"{file}: {project_name} (project {project_id}) {description}")
+    else:
+        for file, projects, tasks, complete, percentage in federation.completion():
+            print(f"{file}: {projects} projects, {complete}/{tasks} tasks complete ({percentage}%)")
+
+    for file, reason in sorted(federation.skipped.items()):
+        print(f"Skipped {file}: {reason}")
+
+
+if __name__ == "__main__":
+    main()
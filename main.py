@@ -1,38 +1,175 @@
 """Main python file for "TaskMaster" project management """
 
+# Startup timing for --profile-startup, taken before the imports so they are included
+from time import perf_counter
+STARTUP_MARKS: list = [("Start", perf_counter())]
+
 # Backend imports:
 from datetime import date
 from datetime import datetime
+import argparse
 import logging
+import threading
 
 # GUI:
+# tkcalendar is imported when the first TaskData is built as it is slow to import
 from tkinter import messagebox
 from customtkinter import *
-from tkcalendar import DateEntry
+from PIL import Image  # Already imported by customtkinter for CTkImage
+STARTUP_MARKS.append(("Import customtkinter", perf_counter()))
 
 # Third-party modules
-from PIL import Image
 import src.lib_file as lib_file
+import src.lib_worker as lib_worker
+import src.lib_search as lib_search
+STARTUP_MARKS.append(("Import src modules", perf_counter()))
 
 # Global Variables (Constants):
 PROGRAM_NAME = "TaskMaster"
 VERSION_NUMBER = "V2"
+CACHE_STATS_MS = 1000  # Refresh interval of the query cache counters in the debug settings
+RETAINED_FRAMES = 4  # Hidden frames kept for reuse by FrameManager, the least recently shown are destroyed first
+LOGO_POLL_MS = 20  # How often StartFrame checks if the logo images have been decoded
+BULK_PROMPT = "Bulk action"  # Shown by the TasksFrame bulk action menu when nothing is picked
+BULK_ACTIONS = ("Complete", "Incomplete", "Delete", "Move to project...", "Shift due dates...")
+
+
+class ScrollList(CTkFrame):
+    """Creates a GUI list with scroll bar from passed list, when a item is selected "master.select" is called with the value of the selected item
 
+    Only enough buttons to fill the visible area are created, as the list is scrolled the same buttons are reused to show
+    the items scrolled into view so the number of widgets does not grow with the length of the list.
+    Buttons are only reconfigured when the item or selection state they show changes
+    """
 
-class ScrollList(CTkScrollableFrame):
-    """Creates a GUI list with scroll bar from passed list, when a item is selected "master.select" is called with the value of the selected button"""
+    ROW_HEIGHT = 38  # Button height plus padding in pixels
+    WHEEL_STEP = 3  # Items scrolled per mouse wheel notch
 
     def __init__(self, master, to_list: list):
         super().__init__(master)
+        self.frame: FrameBase = master
+        self.items: list = []
+        self.keys: dict = {}  # Item key to index in self.items
+        self.pool: list = []  # Buttons used to display the visible items
+        self.shown: list = []  # (item, text, state) currently displayed by each button in the pool
+        self.top = 0  # Index in self.items of the item shown by the first button
 
         # configure grid system
         self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.rows_frame = CTkFrame(self, fg_color="transparent")
+        self.rows_frame.grid(row=0, column=0, sticky="nsew")
+        self.rows_frame.grid_columnconfigure(0, weight=1)
+        # Stops the buttons resizing the list, the list size decides how many buttons there are
+        self.rows_frame.grid_propagate(False)
+
+        self.scrollbar = CTkScrollbar(self, command=self.yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.bind_scroll(self.rows_frame)
+        self.rows_frame.bind("<Configure>", self.on_resize)
+
+        self.add_items(to_list)
+
+    def bind_scroll(self, widget):
+        """Scrolls the list when the mouse wheel is used over widget"""
+        widget.bind("<MouseWheel>", lambda event: self.scroll_to(
+            self.top - self.WHEEL_STEP * (1 if event.delta > 0 else -1)))
+        widget.bind("<Button-4>", lambda event: self.scroll_to(self.top - self.WHEEL_STEP))
+        widget.bind("<Button-5>", lambda event: self.scroll_to(self.top + self.WHEEL_STEP))
+
+    def on_resize(self, event):
+        """Grows or shrinks the pool of buttons to fit the visible area"""
+        rows = max(1, event.height // self.ROW_HEIGHT)
+        while len(self.pool) < rows:
+            slot = len(self.pool)
+            select = CTkButton(self.rows_frame, corner_radius=20,
+                               command=lambda slot=slot: self.frame.select(self.items[self.top + slot]))
+            self.bind_scroll(select)
+            self.pool.append(select)
+            self.shown.append(None)
+        while len(self.pool) > rows:
+            self.pool.pop().destroy()
+            self.shown.pop()
+        self.scroll_to(self.top)
+
+    @staticmethod
+    def key(value):
+        """Returns the key identifying a list item, the ID of tuples from the DB or the value itself"""
+        if isinstance(value, tuple):
+            return value[0]
+        return value
+
+    def add_items(self, to_list: list):
+        """Adds the items in to_list to the end of the list"""
+        for index, value in enumerate(to_list, start=len(self.items)):
+            self.keys[self.key(value)] = index
+        self.items.extend(to_list)
+        self.render()
+
+    def set_items(self, to_list: list):
+        """Replaces the listed items, the item at the top of the view stays at the top if it is still listed
+
+        Only buttons whose item has been added, removed, renamed or moved are updated by the next render
+        """
+        top_key = self.key(self.items[self.top]) if self.top < len(self.items) else None
+        self.keys = {}
+        for index, value in enumerate(to_list):
+            self.keys[self.key(value)] = index
+        self.items = list(to_list)
+        self.scroll_to(self.keys.get(top_key, self.top))
+
+    def find(self, value):
+        """Returns the listed item with the same key as value, None if it is not listed"""
+        index = self.keys.get(self.key(value))
+        if index is None:
+            return None
+        return self.items[index]
+
+    def is_selected(self, value) -> bool:
+        """Compares list items by key"""
+        selected = self.frame.selected
+        return selected != "" and self.key(value) == self.key(selected)
+
+    def yview(self, action, value, unit=""):
+        """Handles scroll bar movement"""
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self.items)))
+        elif action == "scroll":
+            step = len(self.pool) if unit == "pages" else 1
+            self.scroll_to(self.top + int(value) * step)
+
+    def scroll_to(self, index):
+        """Shows the items starting at index"""
+        self.top = max(0, min(index, len(self.items) - len(self.pool)))
+        self.render()
+
+    def render(self):
+        """Updates the buttons to show the items currently scrolled into view and the scroll bar to match"""
+        for slot, select in enumerate(self.pool):
+            index = self.top + slot
+            if index < len(self.items):
+                value = self.items[index]
+                shown = (value, self.frame.item_text(value), DISABLED if self.is_selected(value) else NORMAL)
+                if self.shown[slot] != shown:
+                    if self.shown[slot] is None:
+                        select.grid(row=slot, column=0, pady=(10, 0), sticky="ew")
+                    select.configure(text=shown[1], state=shown[2])
+                    self.shown[slot] = shown
+            elif self.shown[slot] is not None:
+                select.grid_remove()
+                self.shown[slot] = None
+
+        if self.items:
+            self.scrollbar.set(self.top / len(self.items),
+                               min(1, (self.top + len(self.pool)) / len(self.items)))
+        else:
+            self.scrollbar.set(0, 1)
 
-        for i, value in enumerate(to_list):
-            select = CTkButton(self, text=value, corner_radius=20,
-                               command=lambda value=value: master.select(value))
-            select.grid(row=i, column=0, pady=(10, 0), sticky="ew")
-            master.buttons[value] = select
+        # Asks the frame for more items when the end of the list is close to being visible
+        if self.pool and self.top + 2 * len(self.pool) >= len(self.items):
+            self.frame.load_more()
 
 
 class FrameBase(CTkFrame):
@@ -46,13 +183,16 @@ class FrameBase(CTkFrame):
         self.frame_manager: FrameManager = master.frame_manager
         self.config: lib_file.Settings = master.config
         self.projects_do: lib_file.Project = master.projects_do
+        self.db_worker: lib_worker.DBWorker = master.db_worker
         # Variables
         self.page_title: CTkLabel
+        self.title_text: str = ""
+        self.loading: set = set()  # Kinds of DB request waiting for a result
         self.selected: str = ""
         self.last_selection: str = ""
-        self.buttons: dict = {}
         self.static_buttons: dict = {}
         self.list_frame: ScrollList
+        self.more_pages: bool = False
         self.on_selection_flag: bool
         self.columns = 3
         self.rows = 3
@@ -87,37 +227,201 @@ class FrameBase(CTkFrame):
             title (string): The frame title
             font_size (int): The font size
         """
+        self.title_text = title
         self.page_title = CTkLabel(
             self, text=title, font=("Mogra", font_size))
         self.page_title.grid(
             row=0, column=0, columnspan=self.columns, sticky="ew")
 
+    def request(self, kind, function, *args, callback=None):
+        """Runs function(*args) on the DB worker thread and passes the result to callback on the GUI thread
+
+        Args:
+            kind (string): A newer request of the same kind cancels this request if it has not finished
+            function (callable): usually a method of self.projects_do or of this frame that uses it
+            callback (callable): called with the return value of function
+        """
+        tag = (self, kind)
+        self.db_worker.cancel(tag)
+        self.loading.add(kind)
+        self.show_loading()
+
+        def done(result):
+            self.loading.discard(kind)
+            self.show_loading()
+            if callback is not None:
+                callback(result)
+
+        def failed(e_thrown):
+            self.loading.discard(kind)
+            self.show_loading()
+            logging.error("Unable to load %s: %s", kind, e_thrown)
+
+        self.db_worker.submit(function, *args, callback=done,
+                              error=failed, tag=tag)
+
+    def write(self, function, *args, callback=None, error=None):
+        """Runs a DB write on the worker thread without waiting for it, passes the result to callback on the GUI thread
+
+        Unlike request it is never cancelled, so a repeated click or leaving the frame does not drop the write.
+        The callback is skipped if the frame has been destroyed by the time the write finishes
+
+        Args:
+            error (callable): called with the exception if function raises one, by default an error message is shown
+        """
+        def done(result):
+            if callback is not None and self.winfo_exists():
+                callback(result)
+
+        def failed(e_thrown):
+            logging.error("Write %s failed ✖: %s", getattr(function, "__name__", function), e_thrown)
+            if error is not None:
+                if self.winfo_exists():
+                    error(e_thrown)
+                return
+            messagebox.showerror(title="Error", message=f"Unable to save the change: {e_thrown}")
+
+        self.db_worker.submit(function, *args, callback=done, error=failed)
+
+    def cancel_request(self, kind):
+        """Cancels the DB request of this kind if it has not finished"""
+        self.db_worker.cancel((self, kind))
+        self.loading.discard(kind)
+        self.show_loading()
+
+    def cancel_requests(self):
+        """Cancels DB requests that have not finished, called when the frame is hidden or destroyed"""
+        for kind in self.loading:
+            self.db_worker.cancel((self, kind))
+        self.loading.clear()
+        self.show_loading()
+
+    def show_loading(self):
+        """Shows "Loading..." after the title while DB requests are running"""
+        if self.title_text:
+            self.page_title.configure(
+                text=f"{self.title_text} Loading..." if self.loading else self.title_text)
+
     def button_auto_grid(self):
         """Places buttons in the list "self.static_buttons" on the frame"""
         for i, button in enumerate(self.static_buttons.values()):
             button.grid(row=self.button_row, column=i, padx=5, sticky="ew")
 
     def list_data(self):
-        """Function used to get the data to list, Should be overwritten by child class"""
+        """Function used to get the data to list, Should be overwritten by child class
+
+        Paged lists return the first page and set self.more_pages to True if there may be more pages
+        """
         raise NotImplementedError
 
+    def item_text(self, value) -> str:
+        """Returns the text shown for a list item, can be overwritten by child classes
+
+        Rows from the DB are shown as "ID Name", anything else as it is
+        """
+        if isinstance(value, tuple):
+            return f"{value[0]} {value[1]}"
+        return str(value)
+
+    def next_page(self, after_id) -> list:
+        """Function used to get the page of data after the item with ID = after_id, Should be overwritten by child classes with paged lists"""
+        return []
+
+    def page_limit(self) -> int:
+        """Returns the number of items a paged list_data should fetch, enough to replace every item already listed"""
+        if hasattr(self, "list_frame"):
+            return max(lib_file.PAGE_SIZE, len(self.list_frame.items))
+        return lib_file.PAGE_SIZE
+
+    def set_more_pages(self, page: list, limit=lib_file.PAGE_SIZE) -> list:
+        """Sets self.more_pages from the length of the page just fetched, returns the page"""
+        self.more_pages = len(page) >= limit
+        return page
+
+    def load_more(self):
+        """Adds the next page of data to the end of the list, if there is one"""
+        if not self.more_pages or not self.list_frame.items:
+            return
+        self.more_pages = False  # Stops repeated scroll events loading the same page
+        self.request("page", self.next_page, self.list_frame.items[-1][0],
+                     callback=self.list_frame.add_items)
+
+    def set_search(self, search_function):
+        """Searches as the user types in self.search_bar, the search also runs straight away when return is pressed
+
+        Args:
+            search_function (callable): search_function(term) runs on the DB worker thread and returns
+            tuples with the structure [0]ID, [1]Name, [2]Description, ...
+        """
+        self.search = lib_search.IncrementalSearch(
+            search=search_function,
+            request=lambda function, *args, callback: self.request(
+                "search", function, *args, callback=callback),
+            cancel=lambda: self.cancel_request("search"),
+            show=self.show_search,
+            clear=self.refresh_list,
+            schedule=self.after,
+            unschedule=self.after_cancel)
+        self.search_bar.bind(
+            "<KeyRelease>", lambda event: self.search.key_pressed(self.search_bar.get()))
+        # lambda used to prevent passing "event" to search.run()
+        self.search_bar.bind(
+            "<Return>", lambda event: self.search.run(self.search_bar.get()))
+
+    def show_search(self, rows):
+        """Displays search results, Can be overwritten by child classes that list more than [0]ID, [1]Name"""
+        self.fresh_list([row[:2] for row in rows])
+
+    def refresh(self, context=None):
+        """Reloads the data of the frame, called by FrameManager every time the frame is shown
+
+        Args:
+            context (any): passed to FrameManager.show_frame by the frame navigating here
+        """
+        self.refresh_list()
+
+    def clear_search(self):
+        """Empties self.search_bar"""
+        self.search_bar.delete(0, END)
+
+    def refresh_list(self):
+        """Runs self.list_data on the DB worker thread and updates the list when it finishes"""
+        if hasattr(self, "search"):  # Search results may be out of date
+            self.search.reset()
+        self.db_worker.cancel((self, "page"))  # Pages after the old data are no longer wanted
+        self.request("list", self.list_data, callback=self.show_list)
+
     def fresh_list(self, to_list=""):
-        """Creates a scrollable list
+        """Creates a scrollable list, or updates the existing list keeping its scroll position and selection
 
         Args:
             to_list (list): Items to be listed, if omitted then the self.list_data method is used
         """
-        if hasattr(self, "list_frame"):  # If a list frame already exists it will be destroyed
-            self.list_frame.destroy()
-
+        self.more_pages = False
         if to_list == "":
             to_list = self.list_data()
+        self.show_list(to_list)
 
+    def show_list(self, to_list):
+        """Displays to_list in the scrollable list"""
         logging.info("Scroll list: %s", to_list)
 
-        self.list_frame = ScrollList(master=self, to_list=to_list)
-        self.list_frame.grid(row=self.list_row, column=self.list_col, rowspan=self.list_r_span, columnspan=self.list_c_span,
-                             padx=10, pady=5, sticky="nsew")
+        if not hasattr(self, "list_frame"):
+            self.list_frame = ScrollList(master=self, to_list=to_list)
+            self.list_frame.grid(row=self.list_row, column=self.list_col, rowspan=self.list_r_span, columnspan=self.list_c_span,
+                                 padx=10, pady=5, sticky="nsew")
+            return
+
+        self.list_frame.set_items(to_list)
+
+        # Keeps the selection if it is still listed, picking up any changes to the selected item
+        if self.selected != "":
+            selected = self.list_frame.find(self.selected)
+            if selected is None:
+                self.clear_select()
+            else:
+                self.selected = selected
+                self.last_selection = selected
 
     def on_selection(self):
         """Handles button selection, Should be overwritten by child class"""
@@ -137,12 +441,10 @@ class FrameBase(CTkFrame):
 
         logging.info("selected %s", selection)
 
-        # Checks for current selection and deselects it
+        # Disables the new selection and enables the last selection if it is visible
         if self.last_selection:
             logging.info("Last selected %s", self.last_selection)
-            self.buttons[self.last_selection].configure(state=NORMAL)
-
-        self.buttons[self.selected].configure(state=DISABLED)
+        self.list_frame.render()
 
         # Enables buttons that require a selection to function
         for button in self.static_buttons.values():
@@ -155,6 +457,8 @@ class FrameBase(CTkFrame):
         """Clears the current selection and disables buttons (except those marked with "_")"""
         self.selected = ""
         self.last_selection = ""
+        if hasattr(self, "list_frame"):
+            self.list_frame.render()
 
         # Disables buttons when there is no selection
         for name, button in self.static_buttons.items():
@@ -163,7 +467,10 @@ class FrameBase(CTkFrame):
 
 
 class StartFrame(CTkFrame):
-    """Start 'Page' where user selects working directory"""
+    """Start 'Page' where user selects working directory
+
+    The program name is shown in place of the logo until the logo images have been decoded on a background thread
+    """
 
     def __init__(self, app):
         super().__init__(app)
@@ -171,17 +478,44 @@ class StartFrame(CTkFrame):
         self.grid_rowconfigure((0, 1), weight=1)  # configure grid system
         self.grid_columnconfigure((0, 1, 2), weight=1)
 
-        self.logo = CTkImage(light_image=Image.open("Logos/Light-Mode.png"),
-                             dark_image=Image.open("Logos/Dark-Mode.png"),
-                             size=(783, 126))
-        # display image with a CTkLabel
-        self.image_logo = CTkLabel(self, image=self.logo, text="")
+        self.logo_images: tuple | None = ()  # Set by load_logos when decoded, None if they could not be loaded
+        self.image_logo = CTkLabel(self, text=PROGRAM_NAME, font=("Mogra", 72))
         self.image_logo.grid(row=0, column=1)
+        threading.Thread(target=self.load_logos,
+                         name="LogoLoader", daemon=True).start()
+        self.after(LOGO_POLL_MS, self.show_logo)
 
         self.open_db = CTkButton(
             self, text="Open", corner_radius=20, command=app.open_dir)
         self.open_db.grid(row=1, column=1)
 
+    def load_logos(self):
+        """Decodes the logo images, runs on a background thread as Tk may only be used by the GUI thread"""
+        images = []
+        try:
+            for file in ("Logos/Light-Mode.png", "Logos/Dark-Mode.png"):
+                image = Image.open(file)
+                image.load()  # Image.open only reads the header, decode now rather than on the GUI thread
+                images.append(image)
+        except OSError as e_thrown:
+            logging.error("Unable to load logo: %s", e_thrown)
+            self.logo_images = None
+            return
+        self.logo_images = tuple(images)
+
+    def show_logo(self):
+        """Replaces the program name with the logo once load_logos has finished"""
+        if self.logo_images is None:  # Keeps the program name
+            return
+        if not self.logo_images:
+            self.after(LOGO_POLL_MS, self.show_logo)
+            return
+        light_image, dark_image = self.logo_images
+        self.logo = CTkImage(light_image=light_image,
+                             dark_image=dark_image, size=(783, 126))
+        # display image with a CTkLabel
+        self.image_logo.configure(image=self.logo, text="")
+
 
 class FilesFrame(FrameBase):
     """Project 'Page' for managing project files"""
@@ -197,8 +531,8 @@ class FilesFrame(FrameBase):
         # Title
         self.set_title(title="Project Files:")
 
-        # Project files list
-        self.fresh_list()
+        # Project files list, filled by refresh
+        self.fresh_list([])
 
         # Buttons
         create_db = CTkButton(
@@ -215,26 +549,44 @@ class FilesFrame(FrameBase):
 
         self.button_auto_grid()
 
+    def refresh(self, context=None):
+        self.fresh_list()
+
+    def fresh_list(self, to_list=""):
+        """Lists the files at once with the metadata already known, then reads new and changed files on the DB worker"""
+        super().fresh_list(to_list)
+        if to_list == "":
+            self.request("files", self.projects_do.list_db_info, callback=self.show_list)
+
     def list_data(self):
-        files = self.projects_do.list_db()
-        logging.info("Files Found: %s", files)
+        files = self.projects_do.list_db_info(read=False)
+        logging.info("Files Found: %s", [file[0] for file in files])
         return files
 
+    def item_text(self, value) -> str:
+        name, size, modified, version, users, projects = value
+        if users is None:  # Not read yet or not a project file
+            return name
+        return (f"{name}  ({size / 1024 / 1024:.1f} MB, {users} users, {projects} projects, "
+                f"modified {datetime.fromtimestamp(modified):%Y-%m-%d %H:%M})")
+
     def open_file(self):
-        """Opens the file passed as a parameter and progress to Projects frame"""
-        file_name = self.selected + ".db"
-        try:
-            self.projects_do.open_db(file_name)
-        except FileNotFoundError:
+        """Opens the selected file on the DB worker thread, upgrading it if needed, then progress to login frame"""
+        file_name = self.selected[0] + ".db"
+        self.cancel_requests()  # Reading the metadata of other files would hold up opening this one
+        self.clear_select()  # Disables the buttons so the file is not opened twice
+        self.write(self.projects_do.open_db, file_name, callback=self.file_opened,
+                   error=lambda e_thrown: messagebox.showerror(title="Open Error", message=f"Unable to open file: {e_thrown}"))
+
+    def file_opened(self, opened):
+        """Called with the result of open_db"""
+        if opened is not True:
             messagebox.showerror(title="Open Error",
-                                 message="File not found")
-            return False
+                                 message="Unable to open file, Please check error log")
+            return
 
-        # Destroy files frame and show login_frame
-        self.frame_manager.show_frame(
-            "login_frame", "files_frame", destroy=True)
-
-        return True
+        # Hide files frame and show login_frame
+        self.frame_manager.show_frame("login_frame", "files_frame")
 
     def create_file(self):
         """Creates a new Projects database file and refreshes list frame"""
@@ -242,20 +594,19 @@ class FilesFrame(FrameBase):
                                 title="New Projects File")
         file_name = dialog.get_input()  # waits for input
         if file_name:
-            try:
-                file_name = file_name + ".db"
-                if not self.projects_do.create_db(file_name):
-                    messagebox.showwarning(
-                        title="Create Error", message="Unable to create file, Please check error log")
-            except FileExistsError:
-                messagebox.showwarning(
-                    title="Create Error", message="File Exists")
-
+            self.write(self.projects_do.create_db, file_name + ".db", callback=self.file_created,
+                       error=lambda e_thrown: messagebox.showwarning(title="Create Error", message=f"Unable to create file: {e_thrown}"))
+
+    def file_created(self, created):
+        """Called with the result of create_db"""
+        if not created:
+            messagebox.showwarning(
+                title="Create Error", message="Unable to create file, Please check error log")
         self.fresh_list()
 
     def remove_file(self):
         """Deletes the file passed as a parameter"""
-        file_name = self.selected + ".db"
+        file_name = self.selected[0] + ".db"
         try:
             self.projects_do.delete_db(file_name)
             messagebox.showinfo(title="Delete File", message="File Deleted")
@@ -274,6 +625,7 @@ class LoginFrame(CTkFrame):
         super().__init__(app)
         self.frame_manager: FrameManager = app.frame_manager
         self.projects_do: lib_file.Project = app.projects_do
+        self.db_worker: lib_worker.DBWorker = app.db_worker
         self.app: APP = app
 
         self.grid_rowconfigure((0, 5), weight=1)  # configure grid system
@@ -302,35 +654,54 @@ class LoginFrame(CTkFrame):
             self, text="New User", corner_radius=20, command=self.user_create)
         self.new_user_button.grid(row=4, column=1, columnspan=2, sticky="n")
 
+    def refresh(self, context=None):
+        """Clears the password entered last time the frame was shown"""
+        self.password_entry.delete(0, END)
+
     def login(self):
         """pass credentials to backend and progresses to the home frame if login successful"""
         username = self.username_entry.get()
         password = self.password_entry.get()
-        if self.projects_do.login(username, password) is False:
+        self.login_button.configure(state=DISABLED)  # Until the password has been checked
+        self.db_worker.submit(self.projects_do.login, username, password,
+                              callback=lambda logged_in: self.logged_in(username, logged_in),
+                              error=self.login_failed)
+
+    def logged_in(self, username, logged_in):
+        """Called with the result of login, progresses to the home frame if login successful"""
+        self.login_button.configure(state=NORMAL)
+        if logged_in is not True:
             messagebox.showerror(title="Login",
                                  message="Incorrect username or password")
-            return 0
+            return
         self.app.set_username(username)
-        self.frame_manager.show_frame(
-            "home_frame", "login_frame", destroy=True)
+        self.frame_manager.show_frame("home_frame", "login_frame")
+
+    def login_failed(self, e_thrown):
+        """Called if login raised an exception"""
+        logging.error("Unable to log in ✖: %s", e_thrown)
+        self.logged_in("", False)
 
     def user_create(self):
         """pass credentials to backend and creates a new user"""
         username = self.username_entry.get()
         password = self.password_entry.get()
         if username and password:
-            if self.projects_do.create_user(username, password) is False:
-                messagebox.showerror(title="User Creation",
-                                     message="Unable to create user, perhaps they already exist?")
-                return False
-            messagebox.showinfo(title="User Creation",
-                                message="User created ✔")
-            logging.info("""User created: "%s" ✔""", username)
-            return True
+            self.db_worker.submit(self.projects_do.create_user, username, password,
+                                  callback=lambda created: self.user_created(username, created))
         else:
             messagebox.showerror(title="User Creation",
                                  message="Unable to create user, Please enter a Username AND Password")
-            return False
+
+    def user_created(self, username, created):
+        """Called with the result of create_user"""
+        if created is False:
+            messagebox.showerror(title="User Creation",
+                                 message="Unable to create user, perhaps they already exist?")
+            return
+        messagebox.showinfo(title="User Creation",
+                            message="User created ✔")
+        logging.info("""User created: "%s" ✔""", username)
 
 
 class HomeFrame(CTkFrame):
@@ -341,6 +712,7 @@ class HomeFrame(CTkFrame):
         self.app: APP = master
         self.frame_manager = master.frame_manager
         self.projects_do: lib_file.Project = master.projects_do
+        self.db_worker: lib_worker.DBWorker = master.db_worker
 
         # configure grid system
         self.grid_rowconfigure((0, 1, 2, 3), weight=1)
@@ -390,16 +762,29 @@ class HomeFrame(CTkFrame):
         self.logout_button.grid(
             row=2, column=2, columnspan=2, sticky="nsew", padx=(3, 6), pady=3)
 
+    def refresh(self, context=None):
+        """Clears the user details entered last time the frame was shown"""
+        self.username_entry.delete(0, END)
+        self.password_entry.delete(0, END)
+
     def user_edit(self):
         """Edits the user using parameters in entry boxes"""
         name = self.username_entry.get()
         password = self.password_entry.get()
-        self.projects_do.edit_user(name, password)
+        # Queued before the log out so it runs first
+        self.db_worker.submit(self.projects_do.edit_user, name, password,
+                              error=lambda e_thrown: logging.error("Unable to edit user ✖: %s", e_thrown))
         self.logout()
 
     def user_remove(self):
-        """Deletes the logged in user"""
-        if self.projects_do.remove_user() is False:
+        """Deletes the logged in user, the clean up runs on the DB worker thread and logs out when it finishes"""
+        self.remove_button.configure(state=DISABLED)
+        self.db_worker.submit(self.projects_do.remove_user,
+                              callback=self.user_removed)
+
+    def user_removed(self, removed):
+        """Called with the result of remove_user"""
+        if removed is False:
             logging.error("Unable to remove user!")
             messagebox.showerror(title="User Deletion",
                                  message="Unable to delete user, See log")
@@ -409,7 +794,9 @@ class HomeFrame(CTkFrame):
         """Destroy all frames and show start frame"""
         self.frame_manager.show_frame("start_frame", "all", destroy=True)
 
-        self.projects_do.logout()
+        # Untagged so it still runs after the requests of the destroyed frames are cancelled
+        self.db_worker.submit(self.projects_do.logout,
+                              error=lambda e_thrown: logging.error("Unable to log out ✖: %s", e_thrown))
 
 
 class GroupsFrame(FrameBase):
@@ -426,8 +813,8 @@ class GroupsFrame(FrameBase):
         # Title
         self.set_title(title="Groups:")
 
-        # Project files list
-        self.fresh_list()
+        # Groups list, filled by refresh
+        self.fresh_list([])
 
         # Buttons
         create_group_button = CTkButton(
@@ -459,8 +846,8 @@ class GroupsFrame(FrameBase):
                                 title="New Group")
         group_name = dialog.get_input()  # waits for input
         if group_name:
-            self.projects_do.create_group(self.app.username, group_name)
-            self.fresh_list()
+            self.write(self.projects_do.create_group, self.app.username, group_name,
+                       callback=lambda created: self.refresh_list())
 
     def join_group(self) -> None:
         """Prompts for a username to grant access to the group"""
@@ -468,15 +855,21 @@ class GroupsFrame(FrameBase):
                                 title="Add to group")
         username_to_add = dialog.get_input()  # waits for input
         if username_to_add:
-            if self.projects_do.join_group(username_to_add, self.selected[1]) is not True:
-                messagebox.showerror(title="Add to Group",
-                                     message="No user with that name")
+            self.write(self.projects_do.join_group, username_to_add, self.selected[1],
+                       callback=self.group_joined)
+
+    def group_joined(self, joined):
+        """Called with the result of join_group"""
+        if joined is not True:
+            messagebox.showerror(title="Add to Group",
+                                 message="No user with that name")
 
     def leave_group(self) -> None:
         """Removes the logged in user from the group"""
         # self.selected[0] represents the group ID and is the same number as displayed next to the Group name in the GUI
-        self.projects_do.leave_group(self.selected[0])
-        self.fresh_list()
+        self.write(self.projects_do.leave_group, self.selected[0],
+                   callback=lambda result: self.refresh_list())
+        self.clear_select()  # Disables the buttons so the same group is not left twice
 
 
 class ThemesSubFrame(FrameBase):
@@ -505,13 +898,15 @@ class ThemesSubFrame(FrameBase):
 
 
 class DebugSubFrame(FrameBase):
-    """Sub Frame intended to be placed on another frame, used for selecting the debug level"""
+    """Sub Frame intended to be placed on another frame, used for selecting the debug level and showing the query cache counters"""
 
     def __init__(self, master, app):
         super().__init__(master)
         self.on_selection_flag = True
         self.app: APP = app
         self.config = app.config
+        self.projects_do: lib_file.Project = app.projects_do
+        self.stats_timer = None
 
         # configure frame
         self.configure_frame(columns=1, rows=2, list_c_span=1,
@@ -520,6 +915,35 @@ class DebugSubFrame(FrameBase):
         self.set_title("Debug Level:", font_size=25)
         self.fresh_list()
 
+        self.cache_stats = CTkLabel(self, text="", justify="left")
+        self.cache_stats.grid(row=self.button_row,
+                              column=0, sticky="ew", padx=10)
+
+    def refresh(self, context=None):
+        """Starts updating the counters again, called when the settings frame is shown"""
+        self.stop_cache_stats()
+        self.show_cache_stats()
+
+    def stop_cache_stats(self):
+        """Stops updating the counters, called when the settings frame is hidden"""
+        if self.stats_timer is not None:
+            self.after_cancel(self.stats_timer)
+            self.stats_timer = None
+
+    def show_cache_stats(self):
+        """Displays the query cache and query metrics counters, updated every CACHE_STATS_MS while shown"""
+        stats = self.projects_do.cache.stats()
+        metrics = self.projects_do.metrics
+        self.cache_stats.configure(
+            text=f"Query cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']}%)\n"
+                 f"{stats['size']} results, {stats['evictions']} evicted\n"
+                 f"{metrics.statements} statements, {len(metrics.slow)} slow (>{metrics.slow_ms} ms)")
+        self.stats_timer = self.after(CACHE_STATS_MS, self.show_cache_stats)
+
+    def destroy(self):
+        self.stop_cache_stats()
+        super().destroy()
+
     def list_data(self):
         return ["Debug", "Info", "Warning",
                 "Error", "Critical"]
@@ -538,6 +962,36 @@ class DebugSubFrame(FrameBase):
                 self.config.settings["Debug"] = logging.CRITICAL
 
 
+class DBProfileSubFrame(FrameBase):
+    """Sub Frame intended to be placed on another frame, used for selecting the DB performance profile"""
+
+    def __init__(self, master, app):
+        super().__init__(master)
+        self.on_selection_flag = True
+        self.app: APP = app
+        self.config: lib_file.Settings = app.config
+        self.projects_do: lib_file.Project = app.projects_do
+
+        # configure frame
+        self.configure_frame(columns=1, rows=2, list_c_span=1,
+                             list_r_span=1, list_row=1, list_col=0, button_row=2, has_list=True)
+
+        self.set_title("DB Profile:", font_size=25)
+        self.fresh_list()
+
+    def list_data(self):
+        return list(lib_file.DB_PROFILES)
+
+    def item_text(self, value) -> str:
+        return f"{value} ({lib_file.DB_PROFILE_NOTES[value]})"
+
+    def on_selection(self):
+        # The profile is applied the next time a DB file is opened
+        self.projects_do.set_profile(self.selected)
+        logging.info("set DB profile to %s", self.selected)
+        self.config.settings["DB Profile"] = self.selected
+
+
 class SettingsFrame(CTkFrame):
     def __init__(self, app):
         super().__init__(app)
@@ -545,14 +999,15 @@ class SettingsFrame(CTkFrame):
         self.config: lib_file.Settings = app.config
         self.frame_manager: FrameManager = app.frame_manager
         self.projects_do: lib_file.Project = app.projects_do
+        self.db_worker: lib_worker.DBWorker = app.db_worker
 
         self.grid_rowconfigure((0, 2), weight=1)  # configure grid system
         self.grid_rowconfigure(1, weight=2)
-        self.grid_columnconfigure((0, 1), weight=1)
+        self.grid_columnconfigure((0, 1, 2), weight=1)
 
         self.page_title = CTkLabel(
             self, text="Settings:", font=("Mogra", 36))
-        self.page_title.grid(row=0, column=0, columnspan=2, sticky="sew")
+        self.page_title.grid(row=0, column=0, columnspan=3, sticky="sew")
 
         self.themes = ThemesSubFrame(self, self.app)
         self.themes.grid(column=0, row=1, sticky="nsew")
@@ -560,13 +1015,23 @@ class SettingsFrame(CTkFrame):
         self.debug = DebugSubFrame(self, self.app)
         self.debug.grid(column=1, row=1, sticky="nsew")
 
+        self.db_profile = DBProfileSubFrame(self, self.app)
+        self.db_profile.grid(column=2, row=1, sticky="nsew")
+
         self.save_button = CTkButton(
             self, text="Save", corner_radius=20, command=self.config.write)
         self.save_button.grid(row=2, column=0, padx=5, sticky="ew")
 
         self.back_button = CTkButton(
             self, text="Back", corner_radius=20, command=lambda: self.frame_manager.show_frame("home_frame", "settings_frame"))
-        self.back_button.grid(row=2, column=1, padx=5, sticky="ew")
+        self.back_button.grid(row=2, column=1, columnspan=2, padx=5, sticky="ew")
+
+    def refresh(self, context=None):
+        self.debug.refresh()
+
+    def leave(self):
+        """Called by FrameManager when the frame is hidden or destroyed"""
+        self.debug.stop_cache_stats()
 
 
 class ProjectData(CTkFrame):
@@ -647,6 +1112,14 @@ class ProjectData(CTkFrame):
     def set_percentage_complete(self, percentage):
         self.percentage_complete_var.set(f"{percentage}% Complete")
 
+    def set_groups(self, groups):
+        """Sets the groups listed in the group option menu
+
+        Args:
+            groups (list): Group names
+        """
+        self.group_select.configure(values=groups)
+
 
 class ProjectFrame(FrameBase):
     """Project 'Page' for managing projects in file"""
@@ -667,16 +1140,13 @@ class ProjectFrame(FrameBase):
             self, placeholder_text="Search", corner_radius=5)
         self.search_bar.grid(row=1, columnspan=5,
                              sticky="nsew", padx=10)
-        self.search_bar.bind(
-            '<Return>', self.search_projects)
+        self.set_search(self.search_data)
 
-        # Project in file
-        self.fresh_list()
+        # Project in file, filled by refresh
+        self.fresh_list([])
 
         # Create Project
-        groups = self.projects_do.de_tuple(
-            self.projects_do.list_groups())
-        self.project_data = ProjectData(self, groups, name_text="Project Name")
+        self.project_data = ProjectData(self, [], name_text="Project Name")
         self.project_data.grid(row=2, column=3, columnspan=2,
                                padx=10, pady=5, sticky="nsew")
 
@@ -698,32 +1168,64 @@ class ProjectFrame(FrameBase):
         self.static_buttons["remove"] = remove_project_button
 
         home_button = CTkButton(
-            self, text="home", corner_radius=20, command=lambda: self.frame_manager.show_frame("home_frame", "projects_frame", destroy=True))
+            self, text="home", corner_radius=20, command=lambda: self.frame_manager.show_frame("home_frame", "projects_frame"))
         self.static_buttons["_home"] = home_button
 
         self.button_auto_grid()
 
+    def refresh(self, context=None):
+        """Reloads the projects and the groups a project can be assigned to"""
+        self.clear_search()
+        self.refresh_list()
+        self.request("groups", self.projects_do.list_groups,
+                     callback=lambda groups: self.project_data.set_groups(self.projects_do.de_tuple(groups)))
+
     def list_data(self):
-        projects = self.projects_do.list_project()
+        limit = self.page_limit()
+        projects = self.set_more_pages(
+            self.projects_do.list_project_page(limit=limit), limit)
         logging.info("Projects Found: %s", projects)
-        return projects
+        return self.with_completeness(projects)
 
-    def search_projects(self, event):
-        """Updates the project list with projects meeting search in self.search_bar
+    def next_page(self, after_id):
+        return self.with_completeness(self.set_more_pages(self.projects_do.list_project_page(after_id)))
+
+    def with_completeness(self, projects) -> list:
+        """Adds the percentage complete to each project in a list using a single query
 
         Args:
-            event: passed by tk bind, logged for debug purposes
+            projects (list): tuples with the structure [0]ID, [1]Name
+
+        Returns:
+            list: the same tuples with the percentage complete text added to the end
         """
-        logging.debug(event)
+        data = self.projects_do.projects_data(
+            self.projects_do.de_tuple(projects, extract_element=0))
+        return [(*project, f"{data[project[0]][3]}% Complete") for project in projects]
+
+    def item_text(self, value) -> str:
+        """Shows projects as "ID Name  (percentage complete text)" """
+        return f"{value[0]} {value[1]}  ({value[2]})"
 
-        projects = self.projects_do.search_projects(
-            self.search_bar.get())
+    def search_data(self, search) -> list:
+        """Returns the projects meeting search as [0]ID, [1]Name, [2]Description, [3]percentage complete text, runs on the DB worker thread"""
+        projects = self.projects_do.search_projects(search, with_text=True)
         logging.info("Projects Found: %s", projects)
-        self.fresh_list(projects)
+        return self.with_completeness(projects)
+
+    def show_search(self, rows):
+        self.fresh_list([(project_id, name, complete)
+                        for project_id, name, _, complete in rows])
 
     def on_selection(self):
-        """Updates fields in project_data frame with currently selected project data"""
-        data = self.projects_do.project_data(self.selected[0])
+        """Requests the currently selected project data to display in the project_data frame"""
+        self.request("selection", self.projects_do.project_data, self.selected[0],
+                     callback=self.show_project_data)
+
+    def show_project_data(self, data):
+        """Updates fields in project_data frame with the selected project data"""
+        if data is None:  # Project deleted since it was listed
+            return
         name: str = data[0]
         desc: str = data[1]
         group: str = data[2]
@@ -738,57 +1240,71 @@ class ProjectFrame(FrameBase):
         project_id = selected[0]
         project_name = selected[1]
 
-        self.projects_do.current_project(project_id, project_name)
+        # Queued before the task list requests of the tasks frame so they run against this project
+        self.db_worker.submit(self.projects_do.current_project, project_id, project_name,
+                              error=lambda e_thrown: messagebox.showerror(
+                                  title="Open Project", message=f"Unable to open project: {e_thrown}"))
 
         self.frame_manager.show_frame(
-            "tasks_frame", "projects_frame", destroy=True)
+            "tasks_frame", "projects_frame", context=(project_id, project_name))
 
     def create_project(self):
         """Creates a new Projects database file and refreshes list frame"""
         project_name: str = self.project_data.get_name()
         project_description: str = self.project_data.get_desc()
         group_name: str = self.project_data.get_group()
-        group_id = self.projects_do.get_group_id(group_name)
 
         if project_name:
-            if self.projects_do.create_project(project_name, project_description, group_id) is not True:
-                messagebox.showwarning(
-                    title="Create Error", message="File Exists")
+            self.write(self.save_project, project_name, project_description, group_name,
+                       callback=self.project_created)
 
-        projects = self.projects_do.list_project()
-        logging.info("Projects Found: %s", projects)
-        self.fresh_list(projects)
+    def project_created(self, created):
+        """Called with the result of save_project for a new project"""
+        if created is not True:
+            messagebox.showwarning(
+                title="Create Error", message="File Exists")
+        self.refresh_list()
 
     def edit_project(self):
         """Edits the selected project with the data entered in the project_data frame"""
         project_name: str = self.project_data.get_name()
         project_description: str = self.project_data.get_desc()
         group_name: str = self.project_data.get_group()
-        group_id = self.projects_do.get_group_id(group_name)
 
         if project_name:
-            if self.projects_do.edit_project(project_name, project_description, group_id, self.selected[0]) is not True:
-                messagebox.showerror(title="Edit Project",
-                                     message="Unable to Edit project")
-
-        projects = self.projects_do.list_project()
-        logging.info("Projects Found: %s", projects)
-        self.fresh_list(projects)
-        self.clear_select()
+            self.write(self.save_project, project_name, project_description, group_name, self.selected[0],
+                       callback=self.project_edited)
+
+    def project_edited(self, edited):
+        """Called with the result of save_project for the selected project"""
+        if edited is not True:
+            messagebox.showerror(title="Edit Project",
+                                 message="Unable to Edit project")
+        self.refresh_list()
+
+    def save_project(self, project_name, project_description, group_name, project_id=None) -> bool:
+        """Creates a project, or edits it if project_id is given, in the group named group_name, runs on the DB worker thread"""
+        group_id = self.projects_do.get_group_id(group_name)
+        if project_id is None:
+            return self.projects_do.create_project(project_name, project_description, group_id)
+        return self.projects_do.edit_project(project_name, project_description, group_id, project_id)
 
     def remove_project(self):
-        """Deletes the project passed as a parameter"""
-        if self.projects_do.delete_project(self.selected[0]) is True:
+        """Deletes the selected project on the DB worker thread"""
+        self.write(self.projects_do.delete_project, self.selected[0],
+                   callback=self.project_removed)
+        self.clear_select()  # Disables the buttons so the same project is not deleted twice
+
+    def project_removed(self, removed):
+        """Called with the result of delete_project"""
+        if removed is True:
             messagebox.showinfo(title="Delete Project",
                                 message="Project Deleted")
         else:
             messagebox.showerror(title="Delete Project",
                                  message="Unable to Delete project")
 
-        projects = self.projects_do.list_project()
-        logging.info("Projects Found: %s", projects)
-        self.fresh_list(projects)
-        self.clear_select()
+        self.refresh_list()
 
 
 class TaskData(CTkFrame):
@@ -796,6 +1312,8 @@ class TaskData(CTkFrame):
 
     def __init__(self, master, name_text="Name"):
         super().__init__(master)
+        # Imported here as tkcalendar (and babel) take a long time to import and are only needed by this frame
+        from tkcalendar import DateEntry
 
         self.name_var = StringVar(value=name_text)
         self.desc_var = StringVar(value="Description")
@@ -886,9 +1404,11 @@ class TasksFrame(FrameBase):
         super().__init__(app)
 
         self.on_selection_flag = True
+        self.project = None  # [0]ID, [1]Name of the project listed
+        self.chosen: dict = {}  # task ID to list item, tasks picked while selecting many
 
         # configure grid system
-        self.configure_frame(columns=4, rows=4, list_c_span=2,
+        self.configure_frame(columns=4, rows=5, list_c_span=2,
                              list_r_span=1, list_row=2, list_col=0, button_row=3, has_list=True)
 
         # Title
@@ -898,13 +1418,10 @@ class TasksFrame(FrameBase):
         self.search_bar = CTkEntry(
             self, placeholder_text="Search", corner_radius=5)
         self.search_bar.grid(row=1, columnspan=4, sticky="nsew", padx=10)
-        self.search_bar.bind(
-            '<Return>', self.search_tasks)
+        self.set_search(self.search_data)
 
-        # Tasks in project
-        tasks = self.projects_do.list_tasks()
-        logging.info("Tasks Found: %s", tasks)
-        self.fresh_list(tasks)
+        # Tasks in project, filled by refresh
+        self.fresh_list([])
 
         # Create task
         self.task_data = TaskData(master=self, name_text="Task Name")
@@ -925,23 +1442,57 @@ class TasksFrame(FrameBase):
         self.static_buttons["remove"] = remove_project_button
 
         back_button = CTkButton(
-            self, text="Back", corner_radius=20, command=lambda: self.frame_manager.show_frame("projects_frame", "tasks_frame", destroy=True))
+            self, text="Back", corner_radius=20, command=lambda: self.frame_manager.show_frame("projects_frame", "tasks_frame"))
         self.static_buttons["_back"] = back_button
 
         self.button_auto_grid()
 
-    def search_tasks(self, event):
-        """Updates the tasks list with tasks meeting search in self.search_bar
+        # Bulk actions on the tasks picked while selecting many
+        self.multi_select = CTkCheckBox(
+            self, text="Select many", command=self.toggle_multi_select)
+        self.multi_select.grid(row=4, column=0, padx=10, sticky="w")
+
+        self.chosen_count = CTkLabel(self, text="")
+        self.chosen_count.grid(row=4, column=1, padx=10, sticky="w")
+
+        self.bulk_var = StringVar(value=BULK_PROMPT)
+        self.bulk_menu = CTkOptionMenu(
+            self, values=list(BULK_ACTIONS), variable=self.bulk_var, corner_radius=5,
+            state=DISABLED, command=self.bulk_action)
+        self.bulk_menu.grid(row=4, column=2, columnspan=2, padx=10, sticky="ew")
+
+    def refresh(self, context=None):
+        """Reloads the tasks, clearing the frame first if a different project was opened
 
         Args:
-            event: passed by tk bind, logged for debug purposes
+            context (tuple): [0]ID, [1]Name of the project opened, None to keep the current project
         """
-        logging.debug(event)
+        if context is not None and context != self.project:
+            self.project = context
+            self.clear_search()
+            self.clear_select()
+            self.clear_chosen()
+            self.fresh_list([])  # Tasks of the last project should not be shown while loading
+            self.task_data.set_name("Task Name")
+            self.task_data.set_desc("Description")
+            self.task_data.set_status(False)
+        self.refresh_list()
+
+    def list_data(self):
+        limit = self.page_limit()
+        tasks = self.set_more_pages(
+            self.projects_do.list_tasks_page(limit=limit), limit)
+        logging.info("Tasks Found: %s", tasks)
+        return tasks
 
-        tasks = self.projects_do.search_tasks(
-            self.search_bar.get())
+    def next_page(self, after_id):
+        return self.set_more_pages(self.projects_do.list_tasks_page(after_id))
+
+    def search_data(self, search) -> list:
+        """Returns the tasks meeting search as [0]ID, [1]Name, [2]Description, runs on the DB worker thread"""
+        tasks = self.projects_do.search_tasks(search, with_text=True)
         logging.info("Tasks Found: %s", tasks)
-        self.fresh_list(tasks)
+        return tasks
 
     def create_task(self):
         """Creates a task with the parameters given in the TaskData frame"""
@@ -952,13 +1503,15 @@ class TasksFrame(FrameBase):
         complete: bool = self.task_data.get_status()
 
         if task_name and task_due >= task_set:
-            if self.projects_do.create_task(task_name, task_description, task_set, task_due, complete) is not True:
-                messagebox.showwarning(
-                    title="Create Error", message="Unable to create task")
+            self.write(self.projects_do.create_task, task_name, task_description, task_set, task_due, complete,
+                       callback=self.task_created)
 
-        tasks = self.projects_do.list_tasks()
-        logging.info("Projects Found: %s", tasks)
-        self.fresh_list(tasks)
+    def task_created(self, created):
+        """Called with the result of create_task"""
+        if created is not True:
+            messagebox.showwarning(
+                title="Create Error", message="Unable to create task")
+        self.refresh_list()
 
     def edit_task(self):
         """Edits a existing task with the parameters given in the TaskData frame"""
@@ -969,31 +1522,134 @@ class TasksFrame(FrameBase):
         complete: bool = self.task_data.get_status()
 
         if task_name:
-            if self.projects_do.edit_task(task_id, task_name, task_description, task_due, complete) is not True:
-                messagebox.showwarning(
-                    title="Edit Error", message="Unable to edit task")
+            self.write(self.projects_do.edit_task, task_id, task_name, task_description, task_due, complete,
+                       callback=self.task_edited)
 
-        tasks = self.projects_do.list_tasks()
-        logging.info("Projects Found: %s", tasks)
-        self.fresh_list(tasks)
-        self.clear_select()
+    def task_edited(self, edited):
+        """Called with the result of edit_task"""
+        if edited is not True:
+            messagebox.showwarning(
+                title="Edit Error", message="Unable to edit task")
+        self.refresh_list()
 
     def remove_task(self):
-        """Removes the selected task from the project"""
-        if self.projects_do.delete_task(self.selected[0]) is True:
+        """Removes the selected task from the project on the DB worker thread"""
+        self.write(self.projects_do.delete_task, self.selected[0],
+                   callback=self.task_removed)
+        self.clear_select()  # Disables the buttons so the same task is not deleted twice
+
+    def task_removed(self, removed):
+        """Called with the result of delete_task"""
+        if removed is True:
             messagebox.showinfo(title="Delete Task",
                                 message="Task Deleted")
         else:
             messagebox.showerror(title="Delete Task",
                                  message="Unable to Delete Task")
+        self.refresh_list()
 
-        tasks = self.projects_do.list_tasks()
-        logging.info("Tasks Found: %s", tasks)
-        self.fresh_list(tasks)
+    def select(self, selection):
+        """Selects a task, or adds it to (or removes it from) the chosen tasks while selecting many"""
+        if not self.multi_select.get():
+            super().select(selection)
+            return
+        task_id = selection[0]
+        if task_id in self.chosen:
+            del self.chosen[task_id]
+        else:
+            self.chosen[task_id] = selection
+        self.show_chosen()
+
+    def item_text(self, value) -> str:
+        if value[0] in self.chosen:
+            return f"✔ {super().item_text(value)}"
+        return super().item_text(value)
+
+    def toggle_multi_select(self):
+        """Switches between editing one task and choosing many for a bulk action"""
         self.clear_select()
+        self.clear_chosen()
+
+    def clear_chosen(self):
+        """Forgets the chosen tasks"""
+        self.chosen = {}
+        self.show_chosen()
+
+    def show_chosen(self):
+        """Marks the chosen tasks in the list and enables the bulk actions when there are any"""
+        self.chosen_count.configure(text=f"{len(self.chosen)} selected" if self.chosen else "")
+        self.bulk_menu.configure(state=NORMAL if self.chosen else DISABLED)
+        if hasattr(self, "list_frame"):
+            self.list_frame.render()
+
+    def bulk_action(self, action):
+        """Runs a bulk action on the chosen tasks as one DB write, the list is refreshed once it finishes"""
+        self.bulk_var.set(BULK_PROMPT)
+        task_ids = list(self.chosen)
+        if not task_ids:
+            return
+
+        match action:
+            case "Complete" | "Incomplete":
+                self.write(self.projects_do.complete_tasks, task_ids, action == "Complete",
+                           callback=self.bulk_done)
+            case "Delete":
+                if not messagebox.askyesno(title="Delete Tasks", message=f"Delete {len(task_ids)} tasks?"):
+                    return
+                self.write(self.projects_do.delete_tasks, task_ids, callback=self.bulk_done)
+            case "Move to project...":
+                target = self.ask_project()
+                if target is None:
+                    return
+                self.write(self.move_to_project, task_ids, target, self.project[0], callback=self.bulk_done)
+            case "Shift due dates...":
+                dialog = CTkInputDialog(text="Days to move the due dates by (negative for earlier):",
+                                        title="Shift Due Dates")
+                try:
+                    days = int(dialog.get_input() or "")  # waits for input
+                except ValueError:
+                    return
+                self.write(self.projects_do.shift_tasks, task_ids, days, callback=self.bulk_done)
+            case _:
+                return
+        self.clear_chosen()  # The same tasks are not sent twice by picking another action while this one runs
+
+    def bulk_done(self, changed):
+        """Called with the number of tasks a bulk action changed, None if the target project was not found"""
+        if changed is None:
+            messagebox.showerror(title="Move Tasks", message="No other project with that name or ID")
+        elif not changed:
+            messagebox.showwarning(title="Bulk Action", message="No tasks were changed, Please check error log")
+        self.refresh_list()
+
+    def ask_project(self):
+        """Prompts for the name or ID of the project to move tasks to, returns it or None"""
+        dialog = CTkInputDialog(text="Move to project (name or ID):",
+                                title="Move Tasks")
+        target = dialog.get_input()  # waits for input
+        if not target or not target.strip():
+            return None
+        return target.strip()
+
+    def move_to_project(self, task_ids, target, from_project_id):
+        """Moves tasks to the project of the user named or numbered target, runs on the DB worker thread
+
+        Returns:
+            int: number of tasks moved, None if the user has no other project matching target
+        """
+        for project_id, project_name in self.projects_do.list_project():
+            if target in (str(project_id), project_name) and project_id != from_project_id:
+                return self.projects_do.move_tasks(task_ids, project_id)
+        return None
 
     def on_selection(self):
-        data = self.projects_do.task_data(self.selected[0])
+        self.request("selection", self.projects_do.task_data, self.selected[0],
+                     callback=self.show_task_data)
+
+    def show_task_data(self, data):
+        """Updates fields in the task_data frame with the selected task data"""
+        if data is None:  # Task deleted since it was listed
+            return
         self.task_data.set_name(data[0])
         self.task_data.set_desc(data[1])
         self.task_data.set_due(data[2])
@@ -1049,39 +1705,80 @@ class FrameManager():
                 self.existing_frames[frame_name] = self.tasks_frame
             case _: raise NameError
 
-    def show_frame(self, frame_name, from_frame="", destroy=False):
-        """Shows the frame passed as a argument, destroys the current frame if destroy is True"""
+    def show_frame(self, frame_name, from_frame="", destroy=False, context=None):
+        """Shows the frame passed as a argument, destroys the current frame if destroy is True otherwise hides it for reuse
+
+        Frames are built once and refreshed with frame.refresh(context) every time they are shown,
+        at most RETAINED_FRAMES hidden frames are kept and the least recently shown are destroyed first
+
+        Args:
+            context (any): passed to the refresh method of the frame being shown
+        """
         if frame_name in self.frames:  # Checks if valid frame name
 
             if frame_name not in self.existing_frames:  # Creates the frame if it does not exist
                 self.__create_frame(frame_name)
+            else:  # Moves the frame to the end, existing_frames is ordered from least to most recently shown
+                self.existing_frames[frame_name] = self.existing_frames.pop(
+                    frame_name)
 
             self.existing_frames[frame_name].grid(
                 row=0, column=0, padx=20, pady=20, sticky="nsew")
 
             if from_frame == "all":  # if from_frame is set to "all" then destroy all frames
                 for frame in list(self.existing_frames):
-                    if frame != "start_frame":
+                    if frame not in ("start_frame", frame_name):
+                        self.__leave_frame(frame)
                         self.existing_frames.pop(frame).destroy()
             elif from_frame:  # Otherwise only destroy the from_frame if destroy is True
+                self.__leave_frame(from_frame)
                 if destroy:
                     self.existing_frames.pop(from_frame).destroy()
                 else:
                     self.existing_frames[from_frame].grid_forget()
 
+            # Destroys the least recently shown hidden frames
+            hidden = [frame for frame in self.existing_frames if frame != frame_name]
+            for frame in hidden[:max(len(hidden) - RETAINED_FRAMES, 0)]:
+                self.__leave_frame(frame)
+                self.existing_frames.pop(frame).destroy()
+                logging.debug("Destroyed frame: %s", frame)
+
+            if hasattr(self.existing_frames[frame_name], "refresh"):
+                self.existing_frames[frame_name].refresh(context)
+
+    def __leave_frame(self, frame_name):
+        """Cancels DB requests and timers of a frame that is being hidden or destroyed"""
+        frame = self.existing_frames[frame_name]
+        if isinstance(frame, FrameBase):
+            frame.cancel_requests()
+        if hasattr(frame, "leave"):
+            frame.leave()
+
 
 class APP(CTk):
     """GUI Code"""
 
-    def __init__(self, program_name, version_number, config):
+    def __init__(self, program_name, version_number, config, server=None):
         super().__init__()
         self.frame_manager = FrameManager(self)
-        self.projects_do = lib_file.Project()
+        self.server: str | None = server
+        if server:
+            # Uses a DB served by server.py instead of a local file, it only needs importing in this mode
+            import src.lib_client as lib_client
+            self.projects_do = lib_client.RemoteProject(server)
+        else:
+            self.projects_do = lib_file.Project()
+        # Runs everything that uses the DB connection on a background thread
+        self.db_worker = lib_worker.DBWorker(self.projects_do, self.after)
         self.config = config
 
         self.username = ""
 
         set_appearance_mode(self.config.settings["Theme"])
+        self.projects_do.set_profile(self.config.settings["DB Profile"])
+        self.projects_do.metrics.enabled = self.config.settings["Query Metrics"]
+        self.projects_do.metrics.slow_ms = self.config.settings["Slow Query ms"]
 
         self.title(f"{program_name} (Version: {version_number})")
         self.geometry("900x450")
@@ -1095,6 +1792,10 @@ class APP(CTk):
 
     def open_dir(self):
         """Instantiates Project class and progress to Project files frame"""
+        if self.server:  # The server has already opened the DB
+            self.frame_manager.show_frame("login_frame", "start_frame")
+            return 0
+
         db_directory = filedialog.askdirectory()  # Prompts user for project directory
         logging.info("Directory selected: %s", db_directory)
 
@@ -1116,8 +1817,39 @@ class APP(CTk):
         set_appearance_mode(theme)
 
 
+def startup_report() -> str:
+    """Returns the time taken by each startup step in STARTUP_MARKS"""
+    lines = ["Startup profile:"]
+    start = STARTUP_MARKS[0][1]
+    for (_, last), (step, mark) in zip(STARTUP_MARKS, STARTUP_MARKS[1:]):
+        lines.append(
+            f"  {step:<24}{(mark - last) * 1000:8.1f} ms{(mark - start) * 1000:10.1f} ms total")
+    return "\n".join(lines)
+
+
+def profile_first_paint(app):
+    """Prints the startup report once the start frame has been drawn"""
+    def painted():
+        if STARTUP_MARKS[-1][0] == "First paint":  # Start frame shown again after logging out
+            return
+        STARTUP_MARKS.append(("First paint", perf_counter()))
+        report = startup_report()
+        logging.info(report)
+        print(report)
+
+    # <Map> fires when the frame is placed on screen, idle tasks (drawing) run after it
+    app.frame_manager.start_frame.bind(
+        "<Map>", lambda event: app.after_idle(painted), add="+")
+
+
 def main():
     """Main Function holding setup code"""
+    parser = argparse.ArgumentParser(description=f"{PROGRAM_NAME} project management")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print the time taken by each step until the first window is drawn")
+    parser.add_argument("--server", metavar="URL",
+                        help="Use the DB served by server.py at URL (e.g. http://127.0.0.1:8765) instead of a file")
+    args = parser.parse_args()
 
     # Used to read and write settings to config file
     config = lib_file.Settings()
@@ -1131,8 +1863,13 @@ def main():
                         encoding='utf-8',
                         filemode='w')
 
+    STARTUP_MARKS.append(("Settings and logging", perf_counter()))
+
     # Main app code
-    app = APP(PROGRAM_NAME, VERSION_NUMBER, config)
+    app = APP(PROGRAM_NAME, VERSION_NUMBER, config, server=args.server)
+    STARTUP_MARKS.append(("Build start frame", perf_counter()))
+    if args.profile_startup:
+        profile_first_paint(app)
     app.mainloop()
 
 
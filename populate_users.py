@@ -1,26 +1,104 @@
-import src.lib_file as lib_file
+"""Generates a TaskMaster DB filled with synthetic users, groups, projects and tasks
+
+The same arguments and seed always produce a byte-identical DB file, user names and passwords follow
+lib_generate.user_credentials (user000000 / password0, ...). Users can also be loaded from a CSV file
+(columns "Uname" and "Password") such as MOCK_USERS_DATA.csv.
+
+Usage:
+    python populate_users.py [--users 1000] [--tasks 100000] [--seed 0] [--dir Tests] [--db test.db] [--fresh]
+    python populate_users.py --users-csv MOCK_USERS_DATA.csv --users 0 --tasks 0
+"""
+
+import argparse
 import csv
+import hashlib
 import os
+import logging
+import sqlite3 as sql
+import sys
+import time
+
+import src.lib_file as lib_file
+import src.lib_generate as lib_generate
+
+
+def read_users(data_file):
+    """Yields (user name, password) pairs from data_file one row at a time"""
+    with open(data_file, "r", encoding="utf-8", newline="") as data:
+        for line in csv.DictReader(data):
+            yield line["Uname"], line["Password"]
 
-users_data_file = "MOCK_USERS_DATA.csv"
 
-db = lib_file.Project()
+def file_digest(file_path) -> str:
+    """Returns the SHA-256 of a file, used to check that a seed reproduces the same DB"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        while block := file.read(1024 * 1024):
+            digest.update(block)
+    return digest.hexdigest()
 
-# Setup
-db.set_dir("Tests")
-if True is os.path.isfile("Tests/test.db"):
-    print("Cleaning up old tests")
-    assert db.delete_db("test.db") is True
 
-    print("Creating DB to use for tests")
-    assert db.create_db("test.db") is True
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--groups", type=int,
+                        help="Shared groups, defaults to one for every 10 users")
+    parser.add_argument("--members", type=int, default=8,
+                        help="Typical number of members of a shared group")
+    parser.add_argument("--projects-per-group", type=int, default=3)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--users-csv", help="Also load the users in this CSV file")
+    parser.add_argument("--dir", default="Tests",
+                        help="Directory containing the DB")
+    parser.add_argument("--db", default="test.db", help="DB file name")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Delete and re-create the DB before loading")
+    parser.add_argument("--profile", choices=lib_file.DB_PROFILES, default="fast",
+                        help="DB profile used while generating")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(levelname)s: %(message)s",
+                        level=logging.INFO)
+
+    db = lib_file.Project()
+    db.set_profile(args.profile)
+
+    # Setup
+    os.makedirs(args.dir, exist_ok=True)
+    db.set_dir(args.dir)
+    file_path = os.path.join(args.dir, args.db)
+    if args.fresh and os.path.isfile(file_path):
+        print("Cleaning up old DB")
+        assert db.delete_db(args.db) is True
+
+    if not os.path.isfile(file_path):
+        print("Creating DB")
+        assert db.create_db(args.db) is True
 
     print("Opening DB:")
-    assert db.open_db("test.db") is True
+    assert db.open_db(args.db) is True
+
+    # Add data
+    start = time.perf_counter()
+    if args.users_csv:
+        created, conflicts = db.create_users_bulk(read_users(args.users_csv))
+        print(f"{created} users added from {args.users_csv}, {len(conflicts)} skipped")
+        for row_number, user_name, reason in conflicts:
+            print(f"  row {row_number}: {user_name!r} {reason}")
+
+    try:
+        counts = lib_generate.generate(db, users=args.users, groups=args.groups, members=args.members,
+                                       projects_per_group=args.projects_per_group, tasks=args.tasks, seed=args.seed)
+    except sql.Error as e_thrown:
+        db.exit()
+        sys.exit(f"Unable to generate data ✖: {e_thrown}")
+    print(f"Generated in {time.perf_counter() - start:.1f}s: " +
+          ", ".join(f"{count} {name}" for name, count in counts.items()))
+
+    db.exit()
+    print(f"SHA-256: {file_digest(file_path)}")
 
-# Add data
-with open(data_file, "r") as data:
-    for line in csv.DictReader(data):
-        assert db.create_user(line["Uname"], line["Password"]) is True
-        assert db.login(line["Uname"], line["Password"]) is True
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Serves a TaskMaster DB file to many users over a JSON API, see src/lib_server.py
+
+Point the GUI at it with: python main.py --server http://HOST:PORT
+
+Usage:
+    python server.py --dir Tests --db test.db [--host 127.0.0.1] [--port 8765] [--readers 4]
+"""
+
+import argparse
+import asyncio
+import logging
+
+import src.lib_file as lib_file
+import src.lib_server as lib_server
+
+
+async def serve(args):
+    server = lib_server.Server(args.dir, args.db, readers=args.readers, profile=args.profile)
+    listener = await server.start(args.host, args.port)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", default="Tests", help="Directory containing the DB")
+    parser.add_argument("--db", default="test.db", help="DB file name")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Address to listen on, requests are not encrypted so only serve other machines "
+                             "(0.0.0.0) on a trusted network")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--readers", type=int, default=lib_server.READERS,
+                        help="Read connections used in parallel")
+    parser.add_argument("--profile", choices=lib_file.DB_PROFILES, default=lib_file.DEFAULT_DB_PROFILE,
+                        help="DB profile, needs WAL (balanced or fast) for reads to run alongside writes")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(levelname)s (%(asctime)s): %(message)s",
+                        level=logging.INFO)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
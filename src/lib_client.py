@@ -0,0 +1,124 @@
+"""This module lets 'TaskMaster' use a DB served by lib_server in place of a local DB file"""
+# Use PEP 8
+# Use logging module not print statements
+# Use tick and cross symbols (✔/✖) in logging
+
+import http.client
+import json
+import logging
+from urllib.parse import urlsplit
+
+import src.lib_file as lib_file
+import src.lib_metrics as lib_metrics
+import src.lib_server as lib_server
+
+
+class RemoteError(Exception):
+    """Raised when the server rejects a request or can not be reached"""
+
+
+def as_tuples(value):
+    """Turns the JSON arrays of a result back into the tuples returned by lib_file.Project"""
+    if isinstance(value, list):
+        return [tuple(item) if isinstance(item, list) else item for item in value]
+    return value
+
+
+class RemoteProject:
+    """Stands in for lib_file.Project, every method listed in lib_server is sent to the server
+
+    Like Project it must only be used from one thread at a time (the DB worker in the GUI),
+    requests are sent one at a time over a single kept-alive HTTP connection
+    """
+
+    def __init__(self, url, timeout=30) -> None:
+        address = urlsplit(url)
+        self.url: str = url
+        self._connection = http.client.HTTPConnection(
+            address.hostname, address.port or 8765, timeout=timeout)
+        self._session: str = ""
+        self.user_name: str = ""
+        # Local stand-ins so the debug frame works the same as with a DB file
+        self.cache = lib_file.QueryCache()
+        self.metrics = lib_metrics.QueryMetrics()
+
+    def call(self, method, *args, **kwargs):
+        """Runs a method of the Project on the server, returns its result
+
+        Raises:
+            RemoteError: If the request fails or the server returns an error
+        """
+        body = json.dumps({"args": args, "kwargs": kwargs}, default=str)
+        headers = {"Content-Type": "application/json", "X-Session": self._session}
+        try:
+            self._connection.request("POST", f"/api/{method}", body, headers)
+            response = self._connection.getresponse()
+            payload = json.loads(response.read())
+        except (OSError, http.client.HTTPException, ValueError) as e_thrown:
+            self._connection.close()  # Reconnects on the next request
+            logging.error("Request %s to %s ✖: %s", method, self.url, e_thrown)
+            raise RemoteError(f"Unable to reach {self.url}: {e_thrown}") from e_thrown
+        if response.status != 200:
+            logging.error("Request %s ✖: %s", method, payload.get("error"))
+            raise RemoteError(payload.get("error", response.reason))
+        return payload
+
+    def __getattr__(self, name):
+        if name not in lib_server.READ_METHODS + lib_server.WRITE_METHODS:
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            return as_tuples(self.call(name, *args, **kwargs)["result"])
+        method.__name__ = name
+        return method
+
+    def login(self, user_name, user_password) -> bool:
+        """Logs in on the server, the session token is sent with every later request"""
+        payload = self.call("login", user_name, user_password)
+        if payload["result"]:
+            self._session = payload["session"]
+            self.user_name = user_name
+        return payload["result"]
+
+    def logout(self) -> bool:
+        """Ends the session on the server"""
+        if self._session:
+            self.call("logout")
+        self._session = ""
+        return True
+
+    def remove_user(self) -> bool:
+        """Removes the logged in user, the server ends the session"""
+        removed = self.call("remove_user")["result"]
+        if removed:
+            self._session = ""
+        return removed
+
+    def current_project(self, project_id, project_name) -> None:
+        """Sets the project used by the task methods for this session"""
+        self.call("current_project", project_id, project_name)
+
+    def projects_data(self, project_ids) -> dict:
+        """Same as Project.projects_data, JSON object keys are strings so the project IDs are turned back into ints"""
+        data = self.call("projects_data", list(project_ids))["result"]
+        return {int(project_id): values for project_id, values in data.items()}
+
+    def set_profile(self, profile) -> None:
+        """DB profiles are applied by the server, kept so the settings frame works unchanged"""
+
+    def status(self) -> dict:
+        """Returns the counters of the server"""
+        self._connection.request("GET", "/status")
+        return json.loads(self._connection.getresponse().read())["result"]
+
+    def exit(self) -> bool:
+        """Ends the session and closes the connection"""
+        try:
+            self.logout()
+        except RemoteError:
+            pass
+        self._connection.close()
+        return True
+
+    de_tuple = lib_file.Project.de_tuple
+    completeness = lib_file.Project.completeness
@@ -0,0 +1,178 @@
+"""This module runs read-only 'TaskMaster' queries across every DB file in a project directory"""
+# Use PEP 8
+# Use logging module not print statements
+# Use tick and cross symbols (✔/✖) in logging
+
+import sqlite3 as sql
+import logging
+import os
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import src.lib_file as lib_file
+
+# SQLite's default SQLITE_MAX_ATTACHED, used when the limit can not be read from the connection
+ATTACH_LIMIT = 10
+# Oldest schema version that can be queried, the search indexes were added in version 3
+MIN_SCHEMA_VERSION = 3
+
+# Queries:
+# Each is run once per attached file and joined with UNION ALL, {schema} is the name the file is attached as.
+# Users are matched on name and password hash as every file has its own "User" table and IDs
+SQL_FEDERATED_DUE = """SELECT '{schema}', Project.Name, Task.ID, Task.Name, Task.DateDue FROM {schema}."User" \
+    INNER JOIN {schema}."Member" ON "Member".memberID = "User".ID \
+    INNER JOIN {schema}.Project ON Project.groupID = "Member".groupID \
+    INNER JOIN {schema}.Task ON Task.projectID = Project.ID \
+    WHERE UserName = :user_name AND PassHash = :pass_hash \
+    AND Task.DateDue BETWEEN :start AND :end AND Task.Complete IS NOT TRUE"""
+SQL_FEDERATED_SEARCH = """SELECT '{schema}', Project.ID, Project.Name, Project.Description, bm25(ProjectSearch) \
+    FROM {schema}.ProjectSearch \
+    INNER JOIN {schema}.Project ON Project.ID = ProjectSearch.rowid \
+    INNER JOIN {schema}."Member" ON "Member".groupID = Project.groupID \
+    INNER JOIN {schema}."User" ON "User".ID = "Member".memberID \
+    WHERE ProjectSearch MATCH :search AND UserName = :user_name AND PassHash = :pass_hash"""
+SQL_FEDERATED_COMPLETION = """SELECT '{schema}', COUNT(Project.ID), TOTAL(TotalTasks), TOTAL(CompletedTasks) \
+    FROM {schema}."User" \
+    INNER JOIN {schema}."Member" ON "Member".memberID = "User".ID \
+    INNER JOIN {schema}.Project ON Project.groupID = "Member".groupID \
+    WHERE UserName = :user_name AND PassHash = :pass_hash"""
+
+
+def week_bounds(day) -> tuple:
+    """Returns the Monday and Sunday of the week containing day"""
+    monday = day - timedelta(days=day.weekday())
+    return monday, monday + timedelta(days=6)
+
+
+class Federation:
+    """Runs a query over every DB file in a directory and merges the results, tagged with their file
+
+    Files are attached read-only to in-memory connections in batches no larger than SQLite's attach limit,
+    the batches run in parallel on a thread pool (sqlite3 releases the GIL while a statement runs).
+    Files that can not be attached or have an unsupported schema version are skipped and listed in skipped
+    """
+
+    def __init__(self, project_dir, user_name, pass_hash, workers=None, file_index=None) -> None:
+        self.project_dir: str = project_dir
+        self.user_name: str = user_name
+        self.pass_hash: str = pass_hash
+        self.workers: int = workers or min(os.cpu_count() or 1, 8)
+        self.file_index: lib_file.FileIndex = file_index or lib_file.FileIndex()
+        self.skipped: dict = {}  # file name to the reason it was left out of the last query
+
+    @classmethod
+    def for_project(cls, project, workers=None):
+        """Returns a Federation over the directory and logged in user of a lib_file.Project, sharing its FileIndex"""
+        return cls(project.project_dir, project.user_name, project.pass_hash, workers, project.file_index)
+
+    def files(self) -> list:
+        """Returns the DB files in project_dir, without the .db extension as returned by lib_file.Project.list_db"""
+        return [entry[0] for entry in self.file_index.scan(self.project_dir, read=False)]
+
+    def due_tasks(self, start=None, end=None) -> list:
+        """Returns the incomplete tasks of the user due between start and end (inclusive), by default this week
+
+        Returns:
+            list: tuples with the structure [0]file, [1]project name, [2]task ID, [3]task name, [4]date due,
+            soonest first
+        """
+        if start is None or end is None:
+            start, end = week_bounds(date.today())
+        rows = self.query(SQL_FEDERATED_DUE, {"start": str(start), "end": str(end)})
+        return sorted(rows, key=lambda row: (row[4], row[0], row[2]))
+
+    def search_projects(self, search) -> list:
+        """Returns the projects of the user in any file matching search, best matches first
+
+        Scores are computed separately for each file so the order across files is approximate
+
+        Returns:
+            list: tuples with the structure [0]file, [1]project ID, [2]name, [3]description
+        """
+        query = lib_file.fts_query(search)
+        if not query:
+            return []
+        rows = self.query(SQL_FEDERATED_SEARCH, {"search": query})
+        return [row[:4] for row in sorted(rows, key=lambda row: row[4])]
+
+    def completion(self) -> list:
+        """Returns the task completion of the user's projects in each file
+
+        Returns:
+            list: tuples with the structure [0]file, [1]projects, [2]tasks, [3]tasks complete, [4]percentage complete
+        """
+        rows = []
+        for file, projects, tasks, complete in sorted(self.query(SQL_FEDERATED_COMPLETION)):
+            percentage = round(complete / tasks * 100, 2) if tasks else 0
+            rows.append((file, projects, int(tasks), int(complete), percentage))
+        return rows
+
+    def query(self, template, parameters=None) -> list:
+        """Runs template (with {schema} for the attached file) against every file, returns the rows of all files
+
+        The first column of template must be '{schema}', it is replaced by the file name in the results
+        """
+        parameters = {"user_name": self.user_name, "pass_hash": self.pass_hash, **(parameters or {})}
+        files = self.files()
+        self.skipped = {}
+        batch_size = self.attach_limit()
+        batches = [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
+
+        rows = []
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(batches) or 1),
+                                thread_name_prefix="Federation") as pool:
+            for batch_rows, skipped in pool.map(lambda batch: self._query_batch(template, parameters, batch), batches):
+                rows += batch_rows
+                self.skipped.update(skipped)
+        logging.info("Federated query over %s files in %s batches ✔, %s skipped",
+                     len(files), len(batches), len(self.skipped))
+        return rows
+
+    def attach_limit(self) -> int:
+        """Returns the number of files SQLite allows to be attached to one connection"""
+        connection = sql.connect(":memory:")
+        try:
+            return connection.getlimit(sql.SQLITE_LIMIT_ATTACHED)
+        except AttributeError:  # getlimit was added in Python 3.11
+            return ATTACH_LIMIT
+        finally:
+            connection.close()
+
+    def _query_batch(self, template, parameters, batch) -> tuple:
+        """Attaches the files in batch to a new connection and runs template against each of them
+
+        Returns:
+            tuple: [0]rows with the file name in the first column, [1]dict of skipped files and the reason
+        """
+        connection = sql.connect("file::memory:", uri=True)
+        schemas = {}
+        skipped = {}
+        try:
+            for i, file in enumerate(batch):
+                schema = f"db{i}"  # Generated names, safe to use in statements
+                file_uri = pathlib.Path(self.project_dir, f"{file}.db").resolve().as_uri() + "?mode=ro"
+                try:
+                    connection.execute(f"ATTACH DATABASE ? AS {schema};", (file_uri,))
+                    version = connection.execute(f"PRAGMA {schema}.user_version;").fetchone()[0]
+                except sql.Error as e_thrown:
+                    skipped[file] = str(e_thrown)
+                    logging.warning("Unable to attach \"%s\" ✖: %s", file, e_thrown)
+                    continue
+                if not MIN_SCHEMA_VERSION <= version <= lib_file.SCHEMA_VERSION:
+                    skipped[file] = f"schema version {version}"
+                    logging.warning("Skipped \"%s\" ✖: schema version %s", file, version)
+                    connection.execute(f"DETACH DATABASE {schema};")
+                    continue
+                schemas[schema] = file
+
+            if not schemas:
+                return [], skipped
+            statement = " UNION ALL ".join(template.format(schema=schema) for schema in schemas) + ";"
+            rows = connection.execute(statement, parameters).fetchall()
+        except sql.Error as e_thrown:
+            logging.error("Federated query over %s ✖: %s", ", ".join(batch), e_thrown)
+            return [], {**skipped, **{file: str(e_thrown) for file in schemas.values()}}
+        finally:
+            connection.close()
+        return [(schemas[row[0]], *row[1:]) for row in rows], skipped
@@ -7,37 +7,697 @@ import sqlite3 as sql
 import os
 import logging
 import hashlib
+import itertools
 import json
+import pathlib
+import threading
+from collections import OrderedDict
+
+import src.lib_metrics as lib_metrics
+
+# Schema migrations:
+# Each entry in MIGRATIONS upgrades the DB by one version, the version of a DB file is stored in "PRAGMA user_version"
+# Entries are tuples of SQL statements that are run inside a single transaction, NEVER edit an entry once released
+MIGRATIONS: list = [
+    # Version 1: Indexes for the membership, project and task lookups
+    (
+        """CREATE INDEX IF NOT EXISTS idx_member_member_group ON "Member" (memberID, groupID);""",
+        """CREATE INDEX IF NOT EXISTS idx_member_group_member ON "Member" (groupID, memberID);""",
+        """CREATE INDEX IF NOT EXISTS idx_project_group_name ON Project (groupID, Name);""",
+        """CREATE INDEX IF NOT EXISTS idx_task_project_name ON Task (projectID, Name);""",
+        """CREATE INDEX IF NOT EXISTS idx_task_project_complete ON Task (projectID, Complete);""",
+    ),
+    # Version 2: Per-project task counters kept exact by triggers on Task
+    (
+        """ALTER TABLE Project ADD COLUMN TotalTasks INTEGER NOT NULL DEFAULT 0;""",
+        """ALTER TABLE Project ADD COLUMN CompletedTasks INTEGER NOT NULL DEFAULT 0;""",
+        """CREATE TRIGGER IF NOT EXISTS trg_task_count_insert AFTER INSERT ON Task BEGIN \
+            UPDATE Project SET TotalTasks = TotalTasks + 1, \
+            CompletedTasks = CompletedTasks + (NEW.Complete IS TRUE) WHERE ID = NEW.projectID; \
+        END;""",
+        """CREATE TRIGGER IF NOT EXISTS trg_task_count_delete AFTER DELETE ON Task BEGIN \
+            UPDATE Project SET TotalTasks = TotalTasks - 1, \
+            CompletedTasks = CompletedTasks - (OLD.Complete IS TRUE) WHERE ID = OLD.projectID; \
+        END;""",
+        """CREATE TRIGGER IF NOT EXISTS trg_task_count_update AFTER UPDATE OF Complete, projectID ON Task BEGIN \
+            UPDATE Project SET TotalTasks = TotalTasks - 1, \
+            CompletedTasks = CompletedTasks - (OLD.Complete IS TRUE) WHERE ID = OLD.projectID; \
+            UPDATE Project SET TotalTasks = TotalTasks + 1, \
+            CompletedTasks = CompletedTasks + (NEW.Complete IS TRUE) WHERE ID = NEW.projectID; \
+        END;""",
+        # Backfill, same statement as SQL_COUNTERS_REBUILD
+        """UPDATE Project SET \
+            TotalTasks = (SELECT COUNT(ID) FROM Task WHERE projectID = Project.ID), \
+            CompletedTasks = (SELECT COUNT(ID) FROM Task WHERE projectID = Project.ID AND Complete IS TRUE);""",
+    ),
+    # Version 3: FTS5 full-text indexes over project and task names and descriptions, kept in sync by triggers
+    (
+        """CREATE VIRTUAL TABLE IF NOT EXISTS ProjectSearch USING fts5 \
+            (Name, Description, content='Project', content_rowid='ID', prefix='2 3');""",
+        """CREATE VIRTUAL TABLE IF NOT EXISTS TaskSearch USING fts5 \
+            (Name, Description, content='Task', content_rowid='ID', prefix='2 3');""",
+        """CREATE TRIGGER IF NOT EXISTS trg_project_search_insert AFTER INSERT ON Project BEGIN \
+            INSERT INTO ProjectSearch (rowid, Name, Description) VALUES(NEW.ID, NEW.Name, NEW.Description); \
+        END;""",
+        """CREATE TRIGGER IF NOT EXISTS trg_project_search_delete AFTER DELETE ON Project BEGIN \
+            INSERT INTO ProjectSearch (ProjectSearch, rowid, Name, Description) \
+            VALUES('delete', OLD.ID, OLD.Name, OLD.Description); \
+        END;""",
+        """CREATE TRIGGER IF NOT EXISTS trg_project_search_update AFTER UPDATE OF Name, Description ON Project BEGIN \
+            INSERT INTO ProjectSearch (ProjectSearch, rowid, Name, Description) \
+            VALUES('delete', OLD.ID, OLD.Name, OLD.Description); \
+            INSERT INTO ProjectSearch (rowid, Name, Description) VALUES(NEW.ID, NEW.Name, NEW.Description); \
+        END;""",
+        """CREATE TRIGGER IF NOT EXISTS trg_task_search_insert AFTER INSERT ON Task BEGIN \
+            INSERT INTO TaskSearch (rowid, Name, Description) VALUES(NEW.ID, NEW.Name, NEW.Description); \
+        END;""",
+        """CREATE TRIGGER IF NOT EXISTS trg_task_search_delete AFTER DELETE ON Task BEGIN \
+            INSERT INTO TaskSearch (TaskSearch, rowid, Name, Description) \
+            VALUES('delete', OLD.ID, OLD.Name, OLD.Description); \
+        END;""",
+        """CREATE TRIGGER IF NOT EXISTS trg_task_search_update AFTER UPDATE OF Name, Description ON Task BEGIN \
+            INSERT INTO TaskSearch (TaskSearch, rowid, Name, Description) \
+            VALUES('delete', OLD.ID, OLD.Name, OLD.Description); \
+            INSERT INTO TaskSearch (rowid, Name, Description) VALUES(NEW.ID, NEW.Name, NEW.Description); \
+        END;""",
+        # Backfill from the existing rows
+        """INSERT INTO ProjectSearch (ProjectSearch) VALUES('rebuild');""",
+        """INSERT INTO TaskSearch (TaskSearch) VALUES('rebuild');""",
+    ),
+    # Version 4: Index for walking a project's tasks in ID order for keyset pagination
+    (
+        """CREATE INDEX IF NOT EXISTS idx_task_project_id_name ON Task (projectID, ID, Name);""",
+    ),
+]
+# Version 5: ON DELETE CASCADE foreign keys on Member, Project and Task so Project.clean_up only deletes groups
+# SQLite can not alter a foreign key, each table is copied into a new one and rows already breaking a foreign key are
+# dropped. The indexes and triggers go with the old tables and are recreated with the statements of versions 1 to 4
+MIGRATIONS.append((
+    *(f"""DROP TRIGGER IF EXISTS {trigger};""" for trigger in (
+        "trg_task_count_insert", "trg_task_count_delete", "trg_task_count_update",
+        "trg_project_search_insert", "trg_project_search_delete", "trg_project_search_update",
+        "trg_task_search_insert", "trg_task_search_delete", "trg_task_search_update")),
+    """CREATE TABLE "Member_new" \
+        (ID INTEGER PRIMARY KEY NOT NULL UNIQUE, \
+        groupID         INT, \
+        memberID         INT, \
+        FOREIGN KEY(groupID) REFERENCES "Group"(ID) ON DELETE CASCADE \
+        FOREIGN KEY(memberID) REFERENCES "User"(ID) ON DELETE CASCADE);""",
+    """INSERT INTO "Member_new" (ID, groupID, memberID) SELECT ID, groupID, memberID FROM "Member" \
+        WHERE groupID IN (SELECT ID FROM "Group") AND memberID IN (SELECT ID FROM "User");""",
+    """DROP TABLE "Member";""",
+    """ALTER TABLE "Member_new" RENAME TO "Member";""",
+    """CREATE TABLE "Project_new" \
+        (ID INTEGER PRIMARY KEY NOT NULL UNIQUE, \
+        Name            TEXT(20), \
+        Description     TEXT(200), \
+        groupID         INT, \
+        TotalTasks      INTEGER NOT NULL DEFAULT 0, \
+        CompletedTasks  INTEGER NOT NULL DEFAULT 0, \
+        FOREIGN KEY(groupID) REFERENCES "Group"(ID) ON DELETE CASCADE);""",
+    """INSERT INTO "Project_new" (ID, Name, Description, groupID) SELECT ID, Name, Description, groupID FROM Project \
+        WHERE groupID IS NULL OR groupID IN (SELECT ID FROM "Group");""",
+    """DROP TABLE Project;""",
+    """ALTER TABLE "Project_new" RENAME TO "Project";""",
+    """CREATE TABLE "Task_new" \
+        (ID INTEGER PRIMARY KEY NOT NULL UNIQUE, \
+        Name            TEXT(20),\
+        Description     TEXT(200), \
+        DateSet         DATE,\
+        DateDue         DATE,\
+        Complete        BINARY(1), \
+        projectID       INT,\
+        FOREIGN KEY(projectID) REFERENCES "Project"(ID) ON DELETE CASCADE);""",
+    """INSERT INTO "Task_new" SELECT ID, Name, Description, DateSet, DateDue, Complete, projectID FROM Task \
+        WHERE projectID IS NULL OR projectID IN (SELECT ID FROM Project);""",
+    """DROP TABLE Task;""",
+    """ALTER TABLE "Task_new" RENAME TO "Task";""",
+    *(statement for statement in itertools.chain(*MIGRATIONS)
+      if statement.startswith(("CREATE INDEX", "CREATE TRIGGER"))),
+    # Rows may have been dropped, the counters and search indexes are rebuilt from what is left
+    """UPDATE Project SET \
+        TotalTasks = (SELECT COUNT(ID) FROM Task WHERE projectID = Project.ID), \
+        CompletedTasks = (SELECT COUNT(ID) FROM Task WHERE projectID = Project.ID AND Complete IS TRUE);""",
+    """INSERT INTO ProjectSearch (ProjectSearch) VALUES('rebuild');""",
+    """INSERT INTO TaskSearch (TaskSearch) VALUES('rebuild');""",
+))
+SCHEMA_VERSION: int = len(MIGRATIONS)
+# Foreign keys are checked after migrating to this version or later, older versions can still hold the orphaned rows
+# that the version 5 rebuild drops
+FOREIGN_KEY_CHECK_VERSION = 5
+
+# Connection performance profiles:
+# Applied to every connection by Project.open_db and Project.create_db, selected with the "DB Profile" setting
+# "safe" should be used for DB files on network shares as WAL needs shared memory on the host, the journal mode is
+# stored in the file so "balanced" and "fast" are only used when chosen in the settings.
+# busy_timeout comes first so changing the journal mode waits for other connections instead of failing at once
+DB_PROFILES: dict = {
+    "safe": {
+        "busy_timeout": 5000,  # Milliseconds
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2000,  # Negative values are in KiB
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+    },
+    "balanced": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+    "fast": {
+        "busy_timeout": 10000,
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+}
+DEFAULT_DB_PROFILE = "safe"
+# Shown next to each profile in the settings
+DB_PROFILE_NOTES: dict = {
+    "safe": "works on network shares",
+    "balanced": "WAL, local disks only",
+    "fast": "WAL, local disks only, may lose recent changes on power loss",
+}
+
+# Default number of rows returned by the *_page methods of Project
+PAGE_SIZE = 200
+
+# Size of the per-connection prepared statement cache, must hold every query below
+CACHED_STATEMENTS = 256
+
+# Maximum number of read query results kept by the QueryCache of a Project
+QUERY_CACHE_SIZE = 512
+
+# Queries:
+# All values are passed as bound parameters so each query is only parsed and planned once per connection
+# User:
+SQL_USER_ID = """SELECT ID FROM "User" WHERE UserName = :user_name;"""
+SQL_USER_LOGIN = """SELECT ID FROM "User" WHERE UserName = :user_name AND PassHash = :pass_hash;"""
+SQL_USER_INSERT = """INSERT INTO "User" (UserName, PassHash) VALUES(:user_name, :pass_hash);"""
+SQL_USER_UPDATE = """UPDATE "User" SET UserName = :user_name, PassHash = :pass_hash WHERE ID = :user_id;"""
+SQL_USER_UPDATE_NAME = """UPDATE "User" SET UserName = :user_name WHERE ID = :user_id;"""
+SQL_USER_UPDATE_PASS = """UPDATE "User" SET PassHash = :pass_hash WHERE ID = :user_id;"""
+SQL_USER_DELETE = """DELETE FROM "User" WHERE ID = :user_id;"""
+# Group:
+SQL_GROUP_ID = """SELECT ID FROM "Group" WHERE groupName = :group_name;"""
+SQL_GROUP_INSERT = """INSERT INTO "Group" (groupName) VALUES(:group_name);"""
+SQL_GROUP_RENAME = """UPDATE "Group" SET groupName = :new_name WHERE groupName = :group_name;"""
+SQL_GROUP_LIST = """SELECT "Group".ID, groupName FROM "Group" \
+    INNER JOIN "Member" ON "Member".groupID = "Group".ID \
+    WHERE "Member".memberID = :user_id;"""
+# Deleting a group cascades to its memberships, projects and their tasks
+SQL_GROUP_DELETE_ORPHANS = """DELETE FROM "Group" \
+    WHERE NOT EXISTS (SELECT 1 FROM "Member" WHERE "Member".groupID = "Group".ID);"""
+SQL_GROUP_DELETE_IF_EMPTY = """DELETE FROM "Group" WHERE ID = :group_id \
+    AND NOT EXISTS (SELECT 1 FROM "Member" WHERE "Member".groupID = "Group".ID);"""
+# Run before the user is deleted, the groups the user is the last member of
+SQL_GROUP_DELETE_LAST_MEMBER = """DELETE FROM "Group" \
+    WHERE ID IN (SELECT groupID FROM "Member" WHERE memberID = :user_id) \
+    AND NOT EXISTS (SELECT 1 FROM "Member" WHERE "Member".groupID = "Group".ID AND memberID != :user_id);"""
+# Member:
+SQL_MEMBER_INSERT = """INSERT INTO "Member" (groupID, memberID) VALUES(:group_id, :user_id);"""
+SQL_MEMBER_DELETE = """DELETE FROM "Member" WHERE groupID = :group_id AND memberID = :user_id;"""
+# Project:
+SQL_PROJECT_LIST = """SELECT Project.ID, Name FROM Project \
+    INNER JOIN "Member" ON "Member".groupID = Project.groupID \
+    WHERE memberID = :user_id;"""
+# Full-text search, :search is a FTS5 query built by fts_query, best matches first
+# Keyset pagination, pages are ordered by ID and start after the last ID of the previous page
+SQL_PROJECT_PAGE = """SELECT ID, Name FROM Project \
+    WHERE groupID IN (SELECT groupID FROM "Member" WHERE memberID = :user_id) AND ID > :after_id \
+    ORDER BY ID LIMIT :limit;"""
+SQL_PROJECT_SEARCH = """SELECT Project.ID, Project.Name, Project.Description FROM ProjectSearch \
+    INNER JOIN Project ON Project.ID = ProjectSearch.rowid \
+    INNER JOIN "Member" ON "Member".groupID = Project.groupID \
+    WHERE ProjectSearch MATCH :search AND memberID = :user_id \
+    ORDER BY bm25(ProjectSearch);"""
+SQL_PROJECT_DATA = """SELECT Name, Description, groupName FROM Project \
+    INNER JOIN "Group" ON Project.groupID = "Group".ID \
+    WHERE Project.ID = :project_id;"""
+# Project data with the task totals maintained by the trg_task_count_* triggers
+SQL_PROJECT_DATA_COMPLETE = """SELECT Name, Description, groupName, TotalTasks, CompletedTasks FROM Project \
+    INNER JOIN "Group" ON Project.groupID = "Group".ID \
+    WHERE Project.ID = :project_id;"""
+# Project IDs are passed as a JSON array so the statement is the same for any number of projects
+SQL_PROJECTS_DATA_COMPLETE = """SELECT Project.ID, Name, Description, groupName, TotalTasks, CompletedTasks FROM Project \
+    INNER JOIN "Group" ON Project.groupID = "Group".ID \
+    WHERE Project.ID IN (SELECT value FROM json_each(:project_ids));"""
+# Task counters that do not match the Task table
+SQL_COUNTERS_CHECK = """SELECT Project.ID, TotalTasks, CompletedTasks, \
+    COUNT(Task.ID), COUNT(CASE WHEN Task.Complete IS TRUE THEN 1 END) FROM Project \
+    LEFT JOIN Task ON Task.projectID = Project.ID GROUP BY Project.ID \
+    HAVING TotalTasks != COUNT(Task.ID) OR CompletedTasks != COUNT(CASE WHEN Task.Complete IS TRUE THEN 1 END);"""
+SQL_COUNTERS_REBUILD = """UPDATE Project SET \
+    TotalTasks = (SELECT COUNT(ID) FROM Task WHERE projectID = Project.ID), \
+    CompletedTasks = (SELECT COUNT(ID) FROM Task WHERE projectID = Project.ID AND Complete IS TRUE);"""
+SQL_PROJECT_INSERT = """INSERT INTO Project (Name, Description, groupID) \
+    VALUES(:project_name, :description, :group_id);"""
+SQL_PROJECT_UPDATE = """UPDATE Project SET Name = :project_name, Description = :description, groupID = :group_id \
+    WHERE ID = :project_id;"""
+SQL_PROJECT_DELETE = """DELETE FROM Project WHERE ID = :project_id;"""
+# Task:
+SQL_TASK_LIST = """SELECT ID, Name FROM Task WHERE projectID = :project_id;"""
+SQL_TASK_PAGE = """SELECT ID, Name FROM Task WHERE projectID = :project_id AND ID > :after_id \
+    ORDER BY ID LIMIT :limit;"""
+SQL_TASK_DATA = """SELECT Name, Description, DateDue, Complete FROM Task WHERE ID = :task_id;"""
+SQL_TASK_SEARCH = """SELECT Task.ID, Task.Name, Task.Description FROM TaskSearch \
+    INNER JOIN Task ON Task.ID = TaskSearch.rowid \
+    WHERE TaskSearch MATCH :search AND Task.projectID = :project_id \
+    AND Task.projectID IN (SELECT Project.ID FROM Project \
+        INNER JOIN "Member" ON "Member".groupID = Project.groupID WHERE memberID = :user_id) \
+    ORDER BY bm25(TaskSearch);"""
+SQL_TASK_INSERT = """INSERT INTO Task (Name, Description, DateSet, DateDue, Complete, projectID) \
+    VALUES(:task_name, :description, :date_set, :date_due, :complete, :project_id);"""
+SQL_TASK_UPDATE = """UPDATE Task SET Name = :task_name, Description = :description, \
+    DateDue = :date_due, Complete = :complete WHERE ID = :task_id;"""
+SQL_TASK_DELETE = """DELETE FROM Task WHERE ID = :task_id;"""
+# Bulk task operations, :task_ids is a JSON array and only tasks of the current project are changed
+SQL_TASKS_COMPLETE = """UPDATE Task SET Complete = :complete \
+    WHERE projectID = :project_id AND ID IN (SELECT value FROM json_each(:task_ids)) \
+    AND Complete IS NOT :complete;"""
+SQL_TASKS_DELETE = """DELETE FROM Task \
+    WHERE projectID = :project_id AND ID IN (SELECT value FROM json_each(:task_ids));"""
+SQL_TASKS_MOVE = """UPDATE Task SET projectID = :target_id \
+    WHERE projectID = :project_id AND ID IN (SELECT value FROM json_each(:task_ids)) \
+    AND :target_id IN (SELECT Project.ID FROM Project \
+        INNER JOIN "Member" ON "Member".groupID = Project.groupID WHERE memberID = :user_id);"""
+SQL_TASKS_SHIFT_DUE = """UPDATE Task SET DateDue = date(DateDue, :days || ' days') \
+    WHERE projectID = :project_id AND ID IN (SELECT value FROM json_each(:task_ids));"""
+# Bulk user provisioning, new users are staged in a temporary table and copied across with set based statements
+SQL_BULK_STAGE_CREATE = """CREATE TEMP TABLE IF NOT EXISTS bulk_user \
+    (UserName TEXT PRIMARY KEY, PassHash CHAR(64), RowNumber INT);"""
+SQL_BULK_STAGE_CLEAR = """DELETE FROM temp.bulk_user;"""
+SQL_BULK_STAGE_INSERT = """INSERT INTO temp.bulk_user (UserName, PassHash, RowNumber) \
+    VALUES(:user_name, :pass_hash, :row_number);"""
+SQL_BULK_STAGE_CONFLICTS = """SELECT RowNumber, UserName FROM temp.bulk_user \
+    WHERE UserName IN (SELECT UserName FROM "User") OR UserName IN (SELECT groupName FROM "Group");"""
+SQL_BULK_STAGE_DELETE = """DELETE FROM temp.bulk_user WHERE UserName = :user_name;"""
+SQL_BULK_USER_INSERT = """INSERT INTO "User" (UserName, PassHash) \
+    SELECT UserName, PassHash FROM temp.bulk_user ORDER BY RowNumber;"""
+SQL_BULK_GROUP_INSERT = """INSERT INTO "Group" (groupName) \
+    SELECT UserName FROM temp.bulk_user ORDER BY RowNumber;"""
+SQL_BULK_MEMBER_INSERT = """INSERT INTO "Member" (groupID, memberID) \
+    SELECT "Group".ID, "User".ID FROM temp.bulk_user \
+    INNER JOIN "User" ON "User".UserName = bulk_user.UserName \
+    INNER JOIN "Group" ON "Group".groupName = bulk_user.UserName \
+    ORDER BY RowNumber;"""
+# Bulk task loading, the triggers on Task are dropped during the load and their work is redone once at the end
+SQL_BULK_TASK_TRIGGERS = """SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'Task' ORDER BY name;"""
+SQL_BULK_TASK_SEARCH_REBUILD = """INSERT INTO TaskSearch (TaskSearch) VALUES('rebuild');"""
+
+# Data copied by Project.export_rows and Project.import_rows, table and columns of each kind of row.
+# Listed in an order where rows only refer to rows of earlier kinds, the task counters and search indexes are
+# not copied as the triggers rebuild them while importing. Users are copied with their password hashes
+TRANSFER_TABLES = {
+    "users": ("User", ("ID", "UserName", "PassHash")),
+    "groups": ("Group", ("ID", "groupName")),
+    "members": ("Member", ("ID", "groupID", "memberID")),
+    "projects": ("Project", ("ID", "Name", "Description", "groupID")),
+    "tasks": ("Task", ("ID", "Name", "Description", "DateSet", "DateDue", "Complete", "projectID")),
+}
+# Table and column names come from TRANSFER_TABLES and can not be bound parameters
+SQL_TRANSFER_SELECT = {kind: f"""SELECT {", ".join(columns)} FROM "{table}" ORDER BY ID;"""
+                       for kind, (table, columns) in TRANSFER_TABLES.items()}
+SQL_TRANSFER_INSERT = {kind: f"""INSERT INTO "{table}" ({", ".join(columns)}) \
+    VALUES({", ".join("?" * len(columns))});"""
+                       for kind, (table, columns) in TRANSFER_TABLES.items()}
+# 1 if any of the tables in TRANSFER_TABLES has a row
+SQL_TRANSFER_HAS_ROWS = "SELECT " + " OR ".join(
+    f"""EXISTS (SELECT 1 FROM "{table}")""" for table, _ in TRANSFER_TABLES.values()) + ";"
+
+# Number of rows staged at a time by Project.create_users_bulk and inserted at a time by Project.create_tasks_bulk,
+# also the number of rows fetched at a time by Project.export_rows and committed at a time by Project.import_rows
+BULK_CHUNK_SIZE = 1000
+
+
+def fts_query(search) -> str:
+    """Converts user search text into a FTS5 query where every word is matched as a prefix
+
+    Each word is quoted so punctuation and FTS5 operators in the search text are treated as plain text
+
+    Returns:
+        str: the FTS5 query, empty if search contains no words
+    """
+    words = search.split()
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+
+
+def hash_password(password) -> str:
+    """Returns the SHA-256 hex digest stored in "User".PassHash for password"""
+    password_hasher = hashlib.sha256()
+    password_hasher.update(password.encode())
+    return password_hasher.hexdigest()
 
 # Code relating to creating and managing Projects and Tasks
 
 
-class Project:
-    """This class provides functions for creating and managing a project with sqlite3"""
+class QueryCache:
+    """Bounded LRU cache of read query results
+
+    Keys are tuples where [0] is the kind of query, e.g. ("task", task_id), so writes can invalidate
+    a single result or every result of a kind. Results that depend on the user have the user ID as [1].
+    Values must not be modified by callers. Shared by every session of a Store so it is safe to use from many threads
+    """
+
+    def __init__(self, max_size=QUERY_CACHE_SIZE) -> None:
+        self.max_size: int = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0  # Increased by every invalidation, see get
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, load):
+        """Returns the cached result for key, calling load() to fetch and store it on a miss"""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                generation = self._generation
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        # Loaded without the lock, a write on another thread may invalidate the result before it is stored
+        value = load()
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = value
+                if len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def invalidate(self, kind, *key) -> None:
+        """Removes the result for (kind, *key), or every result of kind when key is not given"""
+        with self._lock:
+            self._generation += 1
+            if key:
+                self._entries.pop((kind, *key), None)
+                return
+            for stale in [entry for entry in self._entries if entry[0] == kind]:
+                del self._entries[stale]
+
+    def clear(self) -> None:
+        """Removes every result, called when the DB changes"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Returns the counters of the cache for debugging"""
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self._entries), "hit_rate": round(self.hits / lookups * 100, 1) if lookups else 0}
+
+
+class FileIndex:
+    """Metadata of the DB files in a directory, built with os.scandir
+
+    A file is only opened to read its schema version and user and project counts when it is new or its size or
+    modification time (or those of its -wal file) changed since the last scan, the rest comes from the index.
+    Entries are tuples with the structure [0]name without .db, [1]size in bytes, [2]modification time,
+    [3]schema version, [4]number of users, [5]number of projects. [3]-[5] are None until the file has been read,
+    or if it is not a 'TaskMaster' DB
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict = {}  # name to (signature, entry)
+        self._lock = threading.Lock()  # Scanned from the GUI thread and the DB worker thread
+        self.opened = 0  # Files opened by scans, for debugging
+
+    def scan(self, directory, read=True) -> list:
+        """Returns the entries of the DB files in directory sorted by name
+
+        Args:
+            directory (string): Directory to scan
+            read (bool): Opens new and changed files to read their metadata, if False their previous entry is used
+        """
+        files = {}
+        wal = {}
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".db") and entry.is_file():
+                    files[entry.name.removesuffix(".db")] = entry.stat()
+                elif entry.name.endswith(".db-wal"):
+                    wal[entry.name.removesuffix(".db-wal")] = entry.stat()
+
+        with self._lock:
+            known = dict(self._entries)
+
+        scanned = {}
+        for name, stat in files.items():
+            signature = self.signature(stat, wal.get(name))
+            cached = known.get(name)
+            if cached is not None and (cached[0] == signature or not read):
+                scanned[name] = cached
+            elif read:
+                # Read without holding the lock so scans with read=False are never kept waiting
+                file_path = os.path.join(directory, f"{name}.db")
+                metadata = self.read(file_path)
+                # Opening a WAL mode DB recreates its -wal file, the signature is taken again after reading
+                try:
+                    wal_stat = os.stat(f"{file_path}-wal")
+                except FileNotFoundError:
+                    wal_stat = None
+                signature = self.signature(os.stat(file_path), wal_stat)
+                scanned[name] = (signature, (name, stat.st_size, stat.st_mtime, *metadata))
+            else:
+                # Listed without metadata and not kept so the next scan reads it
+                scanned[name] = (None, (name, stat.st_size, stat.st_mtime, None, None, None))
+
+        with self._lock:
+            self._entries = {name: cached for name, cached in scanned.items() if cached[0] is not None}
+        return [scanned[name][1] for name in sorted(scanned)]
+
+    @staticmethod
+    def signature(stat, wal_stat) -> tuple:
+        """Returns what is compared between scans to tell if a DB file changed"""
+        return (stat.st_size, stat.st_mtime_ns,
+                wal_stat and (wal_stat.st_size, wal_stat.st_mtime_ns))
+
+    def read(self, file_path) -> tuple:
+        """Returns [0]schema version, [1]number of users, [2]number of projects of a DB file, None where unreadable"""
+        self.opened += 1
+        try:
+            connection = sql.connect(pathlib.Path(file_path).resolve().as_uri() + "?mode=ro", uri=True)
+        except sql.Error as e_thrown:
+            logging.warning("Unable to read \"%s\" ✖: %s", file_path, e_thrown)
+            return None, None, None
+        try:
+            version = connection.execute("PRAGMA user_version;").fetchone()[0]
+            users = connection.execute("""SELECT COUNT(ID) FROM "User";""").fetchone()[0]
+            projects = connection.execute("""SELECT COUNT(ID) FROM Project;""").fetchone()[0]
+        except sql.Error as e_thrown:
+            logging.warning("Unable to read \"%s\" ✖: %s", file_path, e_thrown)
+            return None, None, None
+        finally:
+            connection.close()
+        return version, users, projects
+
+
+class Store:
+    """Connections to one DB file and the state shared by every session (Project) using it, safe to use from many threads
+
+    Each thread gets its own connection the first time it asks for one, with the pragmas of the selected profile
+    and its own prepared statement cache (see CACHED_STATEMENTS). Sessions only hold the user and current project,
+    so many users can be served by one Store at the cost of a connection per thread rather than per user
+    """
 
     def __init__(self) -> None:
         self.project_dir: str = ""
+        self.db_profile: str = DEFAULT_DB_PROFILE
+        self.file_path: str | None = None
+        # Results of list_groups, get_group_id, list_project(_page) and task_data for every session
+        self.cache = QueryCache()
+        # Timings of methods and statements, off until metrics.enabled is set
+        self.metrics = lib_metrics.QueryMetrics()
+        # Metadata of the DB files in project_dir, see Project.list_db_info
+        self.file_index = FileIndex()
+        self._local = threading.local()  # connection, generation and read_only of each thread
+        self._connections: list = []  # Every open connection so close can reach those of other threads
+        self._lock = threading.Lock()
+        self._generation = 0  # Increased by open and close so threads drop connections to the previous file
+
+    def open(self, file_path) -> sql.Connection:
+        """Closes the connections to the previous DB file, returns the connection of this thread to file_path
+
+        Raises:
+            sql.Error: If the file can not be opened
+        """
+        self.close()
+        self.file_path = file_path
+        return self.connection()
+
+    def connection(self) -> sql.Connection:
+        """Returns the connection of the calling thread, connecting if it does not have one yet
+
+        Raises:
+            sql.ProgrammingError: If no DB file is open
+        """
+        connection = self.current_connection()
+        if connection is not None:
+            return connection
+        if self.file_path is None:
+            raise sql.ProgrammingError("No DB file is open")
+
+        generation = self._generation
+        connection = self.connect(self.file_path)
+        if getattr(self._local, "read_only", False):
+            connection.execute("PRAGMA query_only = ON;")
+        with self._lock:
+            self._connections.append(connection)
+        self._local.connection = connection
+        self._local.generation = generation
+        return connection
+
+    def current_connection(self) -> sql.Connection | None:
+        """Returns the connection of the calling thread if it has one to the open DB file, without connecting"""
+        if getattr(self._local, "generation", None) != self._generation:
+            return None
+        return self._local.connection
+
+    def connect(self, file_path) -> sql.Connection:
+        """Returns a new connection to the DB file with the profile applied, its statements are recorded by self.metrics
+        when enabled. Connections may be closed from any thread but are only used by the thread that made them"""
+        connection = sql.connect(file_path, cached_statements=CACHED_STATEMENTS, check_same_thread=False,
+                                 factory=lib_metrics.InstrumentedConnection)
+        connection.metrics = self.metrics
+        # Off by default in SQLite and set per connection, clean_up relies on the ON DELETE CASCADE of version 5
+        connection.execute("PRAGMA foreign_keys = ON;")
+        try:
+            self.apply_profile(connection)
+        except sql.Error:
+            connection.close()
+            raise
+        return connection
+
+    def apply_profile(self, connection) -> dict:
+        """Applies the pragmas of the selected profile to connection, returns the values SQLite reports back"""
+        applied = {}
+        for pragma, value in DB_PROFILES[self.db_profile].items():
+            # PRAGMA does not accept bound parameters, values only come from DB_PROFILES
+            connection.execute(f"PRAGMA {pragma} = {value};")
+            applied[pragma] = connection.execute(
+                f"PRAGMA {pragma};").fetchone()[0]
+        logging.info("DB profile \"%s\" applied: %s", self.db_profile, applied)
+        return applied
+
+    def set_read_only(self) -> None:
+        """Makes the connections of the calling thread read-only (PRAGMA query_only), e.g. as a thread pool initializer"""
+        self._local.read_only = True
+
+    def close(self) -> None:
+        """Closes every connection to the open DB file
+
+        Raises:
+            sql.Error: If a connection can not be closed, the others are still closed
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+        self.file_path = None
+        self.cache.clear()
+        failed = None
+        for connection in connections:
+            try:
+                connection.close()
+            except sql.Error as e_thrown:
+                failed = e_thrown
+        if failed is not None:
+            raise failed
+
+
+class Project:
+    """This class provides functions for creating and managing a project with sqlite3
+
+    A Project is one user's session on a Store, session creates more sessions sharing the same Store.
+    The connection, caches and settings live in the Store so a session only costs its few attributes
+    """
+
+    __slots__ = ("store", "user_id", "user_name", "pass_hash", "_user_auth", "project_id", "project_name")
+
+    def __init__(self, store=None) -> None:
+        self.store: Store = store if store is not None else Store()
         self.user_id = 0
         self.user_name = ""
+        self.pass_hash = ""
         self._user_auth = False
         self.project_id = 0
         self.project_name: str = ""
-        self.project_db: sql.Connection
+
+    def session(self):
+        """Returns a new logged out Project sharing the store of this one"""
+        return Project(self.store)
+
+    @property
+    def project_db(self) -> sql.Connection:
+        """Connection of the calling thread to the open DB"""
+        return self.store.connection()
+
+    @property
+    def cache(self) -> QueryCache:
+        return self.store.cache
+
+    @property
+    def metrics(self) -> lib_metrics.QueryMetrics:
+        return self.store.metrics
+
+    @property
+    def file_index(self) -> FileIndex:
+        return self.store.file_index
+
+    @property
+    def project_dir(self) -> str:
+        return self.store.project_dir
+
+    @property
+    def db_profile(self) -> str:
+        return self.store.db_profile
 
     def set_dir(self, project_dir) -> None:
         """Sets the working directory"""
-        self.project_dir: str = project_dir
+        self.store.project_dir = project_dir
+
+    def set_profile(self, profile) -> None:
+        """Sets the performance profile applied to DB connections opened after this call
+
+        Raises:
+            KeyError: If profile is not in DB_PROFILES
+        """
+        if profile not in DB_PROFILES:
+            raise KeyError(f"No such DB profile: {profile}")
+        self.store.db_profile = profile
+
+    def apply_profile(self) -> dict:
+        """Applies the pragmas of the selected profile to the open DB, returns the values SQLite reports back"""
+        return self.store.apply_profile(self.project_db)
 
     def list_db(self) -> list:
-        """Returns a list of DB files in project_dir"""
+        """Returns a list of DB files in project_dir, without opening any of them"""
+        return [entry[0] for entry in self.file_index.scan(self.project_dir, read=False)]
 
-        files = os.listdir(self.project_dir)
-        projects = []
-        for file in files:
-            if file.endswith(".db"):
-                projects.append(file.removesuffix(".db"))
+    def list_db_info(self, read=True) -> list:
+        """Returns the DB files in project_dir with their metadata, see FileIndex for the structure of the tuples
+
+        Args:
+            read (bool): Opens the files that are new or changed since the last call, if False nothing is opened
+            and their metadata is None or from the previous read
+        """
+        return self.file_index.scan(self.project_dir, read=read)
 
-        return projects
+    def connect(self, file_path) -> sql.Connection:
+        """Returns a new connection to the DB file that is not managed by the store, see Store.connect"""
+        return self.store.connect(file_path)
 
     def create_db(self, file_name) -> bool:
         """Creates DB file, returns True if successful"""
@@ -51,7 +711,7 @@ class Project:
 
         try:
             # Create DB File
-            self.project_db = sql.connect(file_path)
+            self.store.open(file_path)
             logging.info("DB connected ✔")
 
             self.project_db.execute("BEGIN TRANSACTION;")
@@ -100,8 +760,11 @@ class Project:
             logging.info("Task Table ✔")
 
             self.project_db.commit()
+
+            # Brings the new DB up to the latest schema version
+            self.migrate()
         except sql.Error as e_thrown:
-            self.project_db.close()
+            self.store.close()
             logging.debug("exception while creating database: %s", e_thrown)
             logging.error("Error, Attempting to clean up:")
             try:
@@ -114,7 +777,7 @@ class Project:
             return False
 
         logging.info("DB Created ✔")
-        self.project_db.close()
+        self.store.close()
         return True
 
     def open_db(self, file_name) -> bool:
@@ -123,17 +786,68 @@ class Project:
 
         if True is os.path.isfile(file_path):
             try:
-                self.project_db = sql.connect(file_path)
+                self.store.open(file_path)
             except sql.Error:
                 logging.error("Unable to open DB")
+                self.store.close()
                 return False
         else:
             logging.error("File not found: %s", file_path)
             raise FileNotFoundError(f"No such file: {file_path}")
 
         logging.info("DB connected ✔")
+
+        # Upgrades DB files created by older versions in place
+        try:
+            self.migrate()
+        except sql.Error as e_thrown:
+            logging.error("Unable to upgrade DB: %s", e_thrown)
+            self.store.close()
+            return False
         return True
 
+    def schema_version(self) -> int:
+        """Returns the schema version of the open DB"""
+        return self.project_db.execute("PRAGMA user_version;").fetchone()[0]
+
+    def migrate(self) -> int:
+        """Runs any migrations the open DB has not had applied yet, returns the schema version of the DB
+
+        Raises:
+            sql.DatabaseError: If the DB was created by a newer version of the program
+        """
+        version = self.schema_version()
+        if version > SCHEMA_VERSION:
+            logging.error("DB schema version %s is newer than supported version %s",
+                          version, SCHEMA_VERSION)
+            raise sql.DatabaseError(
+                f"Unsupported schema version: {version}")
+
+        # Dropping a table with foreign keys enforced would delete (cascade) the rows referencing it,
+        # the foreign keys are checked before committing each migration from FOREIGN_KEY_CHECK_VERSION instead
+        self.project_db.execute("PRAGMA foreign_keys = OFF;")
+        try:
+            for version, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+                try:
+                    self.project_db.execute("BEGIN TRANSACTION;")
+                    for statement in statements:
+                        self.project_db.execute(statement)
+                    if version >= FOREIGN_KEY_CHECK_VERSION and \
+                            self.project_db.execute("PRAGMA foreign_key_check;").fetchone():
+                        raise sql.IntegrityError("Foreign key check failed")
+                    # PRAGMA does not accept bound parameters, version is always an int
+                    self.project_db.execute(f"PRAGMA user_version = {version:d};")
+                    self.project_db.commit()
+                except sql.Error:
+                    logging.error("Migration to schema version %s ✖", version)
+                    self.project_db.rollback()
+                    raise
+                logging.info("Migrated to schema version %s ✔", version)
+        finally:
+            self.project_db.execute("PRAGMA foreign_keys = ON;")
+
+        return self.schema_version()
+
     def delete_db(self, file_name) -> bool:
         """Deletes the DB {file_name}, return True if successful"""
 
@@ -154,20 +868,23 @@ class Project:
 
     def join_group(self, user_name, group_name) -> bool:
         """Finds the user IDs corresponding to the username and group then creates a entry in the "Member" table to add user to group"""
-        user_id: int = self.project_db.execute(
-                f"""SELECT ID FROM "User" where UserName = "{user_name}";""").fetchone()[0]
+        user_id = self.project_db.execute(
+            SQL_USER_ID, {"user_name": user_name}).fetchone()
         if user_id:
             try:
                 group_id: int = self.project_db.execute(
-                    f"""SELECT ID FROM "Group" where groupName = "{group_name}";""").fetchone()[0]
+                    SQL_GROUP_ID, {"group_name": group_name}).fetchone()[0]
                 self.project_db.execute("BEGIN TRANSACTION;")
                 self.project_db.execute(
-                    f"""INSERT INTO "Member" (groupID, memberID) VALUES({group_id},{user_id});""")
+                    SQL_MEMBER_INSERT, {"group_id": group_id, "user_id": user_id[0]})
                 self.project_db.commit()
             except sql.IntegrityError:
                 logging.error("Unable to join group")
                 self.project_db.rollback()
                 return False
+            # The group and its projects are now listed for the user
+            self.cache.invalidate("groups", user_id[0])
+            self.cache.invalidate("projects")
             return True
         else:
             return False
@@ -176,7 +893,7 @@ class Project:
         """creates a group with the name "group_name" and calls the "join_group function to add the group creator to the new group"""
         try:
             self.project_db.execute(
-                f"""INSERT INTO "Group" (groupName) VALUES("{group_name}");""")
+                SQL_GROUP_INSERT, {"group_name": group_name})
             self.project_db.commit()
             self.join_group(user_name=owner, group_name=group_name)
         except sql.IntegrityError as e_thrown:
@@ -186,20 +903,32 @@ class Project:
         return True
 
     def leave_group(self, group_id) -> bool:
-        """Removes the logged in user from the group with the ID = group_id, Calls clean_up after running"""
-        self.project_db.execute(f"""DELETE FROM "Member" where groupID = {
-                                group_id} AND memberID = {self.user_id}""")
-        self.clean_up()
+        """Removes the logged in user from the group with the ID = group_id,
+        the group with its projects and tasks is deleted if nobody else is in it"""
+        try:
+            self.project_db.execute("BEGIN TRANSACTION;")
+            self.project_db.execute(
+                SQL_MEMBER_DELETE, {"group_id": group_id, "user_id": self.user_id})
+            deleted = self.project_db.execute(
+                SQL_GROUP_DELETE_IF_EMPTY, {"group_id": group_id}).rowcount
+            self.project_db.commit()
+        except sql.Error as e_thrown:
+            logging.error("Unable to leave group %s: %s", group_id, e_thrown)
+            self.project_db.rollback()
+            return False
+        self.cache.invalidate("groups", self.user_id)
+        self.cache.invalidate("projects")
+        if deleted:
+            self.cache.invalidate("group_id")
+            self.cache.invalidate("task")  # The IDs of the deleted tasks are not known without another query
+        return True
 
     def create_user(self, user_name, user_password) -> bool:
         """Adds a new user to the DB and creates the users personal group"""
-        password: str = user_password
-        password_hasher = hashlib.sha256()
-        password_hasher.update(password.encode())
-        pass_hash = password_hasher.hexdigest()
+        pass_hash = hash_password(user_password)
         try:
             self.project_db.execute(
-                f"""INSERT INTO "User" (UserName, PassHash) VALUES("{user_name}", "{pass_hash}");""")
+                SQL_USER_INSERT, {"user_name": user_name, "pass_hash": pass_hash})
         except sql.IntegrityError:
             logging.error(
                 """Unable to add User: "%s" to database""", user_name)
@@ -208,18 +937,83 @@ class Project:
         self.create_group(owner=user_name, group_name=user_name)
         return True
 
+    def create_users_bulk(self, users, chunk_size=BULK_CHUNK_SIZE) -> tuple:
+        """Adds many users and their personal groups to the DB in a single transaction
+
+        Rows that conflict with an existing user or group, repeat an earlier row or are missing a field are skipped
+        and reported instead of aborting the whole operation
+
+        Args:
+            users (iterable): (user_name, user_password) pairs, consumed lazily in chunks of chunk_size
+            chunk_size (int): number of rows hashed and staged at a time
+
+        Returns:
+            tuple: [0]number of users created, [1]list of conflicts as tuples [0]row number, [1]user name, [2]reason
+
+        Raises:
+            sql.Error: If the transaction fails, no users are added
+        """
+        created = 0
+        conflicts = []
+        seen = set()
+        chunk = []
+
+        def flush() -> int:
+            """Moves the staged chunk into the User, Group and Member tables, returns the number of users added"""
+            self.project_db.execute(SQL_BULK_STAGE_CLEAR)
+            self.project_db.executemany(SQL_BULK_STAGE_INSERT, chunk)
+            for row_number, user_name in self.project_db.execute(SQL_BULK_STAGE_CONFLICTS).fetchall():
+                conflicts.append((row_number, user_name, "already exists"))
+                self.project_db.execute(
+                    SQL_BULK_STAGE_DELETE, {"user_name": user_name})
+            added = self.project_db.execute(SQL_BULK_USER_INSERT).rowcount
+            self.project_db.execute(SQL_BULK_GROUP_INSERT)
+            self.project_db.execute(SQL_BULK_MEMBER_INSERT)
+            chunk.clear()
+            return added
+
+        try:
+            self.project_db.execute(SQL_BULK_STAGE_CREATE)
+            self.project_db.execute("BEGIN TRANSACTION;")
+            for row_number, (user_name, user_password) in enumerate(users, start=1):
+                if not user_name or not user_password:
+                    conflicts.append(
+                        (row_number, user_name, "missing user name or password"))
+                    continue
+                if user_name in seen:
+                    conflicts.append((row_number, user_name, "duplicate row"))
+                    continue
+                seen.add(user_name)
+                chunk.append({"user_name": user_name, "pass_hash": hash_password(user_password),
+                              "row_number": row_number})
+                if len(chunk) >= chunk_size:
+                    created += flush()
+            if chunk:
+                created += flush()
+            self.project_db.execute(SQL_BULK_STAGE_CLEAR)
+            self.project_db.commit()
+        except sql.Error as e_thrown:
+            logging.error("Unable to add users: %s", e_thrown)
+            self.project_db.rollback()
+            raise
+
+        conflicts.sort()
+        for row_number, user_name, reason in conflicts:
+            logging.warning("""Skipped User: "%s" (row %s) %s""",
+                            user_name, row_number, reason)
+        logging.info("%s Users added ✔", created)
+        return created, conflicts
+
     def login(self, user_name, user_password) -> bool:
         """Checks login credentials by hashing and comparing against DB values, sets the user authorisation flag to True if successful"""
-        password: str = user_password
-        password_hasher = hashlib.sha256()
-        password_hasher.update(password.encode())
-        pass_hash = password_hasher.hexdigest()
+        pass_hash = hash_password(user_password)
         user_id = self.project_db.execute(
-            f"""SELECT ID FROM "User" where UserName = "{user_name}" and PassHash = "{pass_hash}";""").fetchone()
+            SQL_USER_LOGIN, {"user_name": user_name, "pass_hash": pass_hash}).fetchone()
         if user_id is None:
             return False
         self.user_id: int = user_id[0]  # gets int from tuple
         self.user_name: str = user_name
+        self.pass_hash: str = pass_hash  # Identifies the user in other DB files, see lib_federate
         self._user_auth = True
         logging.info("Logged In")
         return True
@@ -227,27 +1021,30 @@ class Project:
     def logout(self):
         """De-authenticates the session"""
         self._user_auth = False
+        self.pass_hash = ""
         logging.info("Logged Out")
         return True
 
     def remove_user(self) -> bool:
-        """Removes the logged in user from the DB and calls the clean_up function"""
+        """Removes the logged in user from the DB with the groups they were the last member of,
+        their memberships and the projects and tasks of those groups are deleted by ON DELETE CASCADE"""
         if not self._user_auth:
             return False
 
         try:
             self.project_db.execute("BEGIN TRANSACTION;")
             self.project_db.execute(
-                f"""DELETE FROM "Member" WHERE memberID = {self.user_id};""")
+                SQL_GROUP_DELETE_LAST_MEMBER, {"user_id": self.user_id})
             self.project_db.execute(
-                f"""DELETE FROM "User" WHERE ID = {self.user_id};""")
+                SQL_USER_DELETE, {"user_id": self.user_id})
             self.project_db.commit()
-            logging.info("User: %s Deleted from database")
-        except sql.IntegrityError:
+            logging.info("User: %s Deleted from database", self.user_id)
+        except sql.Error:
             logging.error(
                 "Unable to delete user: %s from database", self.user_id)
+            self.project_db.rollback()
             return False
-        self.clean_up()
+        self.cache.clear()
         return True
 
     def edit_user(self, new_name="", new_password="") -> bool:
@@ -258,12 +1055,10 @@ class Project:
         new_pass_hash: str = ""
         to_edit: str = ""
         new_val: str = ""
+        edit_query: str = ""
 
         if new_password != "":
-            password: str = new_password
-            password_hasher = hashlib.sha256()
-            password_hasher.update(password.encode())
-            new_pass_hash = password_hasher.hexdigest()
+            new_pass_hash = hash_password(new_password)
 
         if new_name != "" and new_password != "":
             edit_both = True
@@ -272,46 +1067,50 @@ class Project:
             edit_both = False
             to_edit = "UserName"
             new_val = new_name
+            edit_query = SQL_USER_UPDATE_NAME
         elif new_name == "" and new_password != "":
             edit_both = False
             to_edit = "PassHash"
             new_val = new_pass_hash
+            edit_query = SQL_USER_UPDATE_PASS
         else:
             return True
 
         try:
             if edit_both:
                 self.project_db.execute(
-                    f"""UPDATE "User" set UserName = "{new_name}", PassHash = "{new_pass_hash}"  where ID = {self.user_id};""")
+                    SQL_USER_UPDATE, {"user_name": new_name, "pass_hash": new_pass_hash, "user_id": self.user_id})
             else:
                 self.project_db.execute(
-                    f"""UPDATE "User" set {to_edit} = "{new_val}" where ID = {self.user_id};""")
+                    edit_query, {"user_name": new_val, "pass_hash": new_val, "user_id": self.user_id})
             if edit_both or to_edit == "UserName":  # Update group name
-                self.project_db.execute(f"""UPDATE "Group" SET groupName = "{
-                                        new_val}" where groupName = "{self.user_name}";""")
+                self.project_db.execute(
+                    SQL_GROUP_RENAME, {"new_name": new_name, "group_name": self.user_name})
         except sql.IntegrityError:
             logging.error("Unable to edit User: %s", self.user_id)
             return False
         self. project_db.commit()
+        if edit_both or to_edit == "UserName":
+            self.cache.invalidate("groups")
+            self.cache.invalidate("group_id", self.user_name)
+            self.cache.invalidate("group_id", new_name)
         return True
 
     def list_groups(self) -> list:
         """Returns a list of groups that the logged in user is part of"""
         if not self._user_auth:
             return []
-        groups = self.project_db.execute(
-            f"""SELECT "Group".ID, groupName FROM "Group" \
-                INNER JOIN "Member" on "Member".groupID = "Group".ID \
-                where "Member".memberID = {self.user_id};""").fetchall()
-        return groups
+        groups = self.cache.get(("groups", self.user_id), lambda: tuple(self.project_db.execute(
+            SQL_GROUP_LIST, {"user_id": self.user_id}).fetchall()))
+        return list(groups)
 
     def get_group_id(self, name):
         """Returns the ID corresponding to a group name"""
         if name == "Default":
             name = self.user_name
-        group_id = self.project_db.execute(
-            f"""SELECT ID, groupName FROM "Group" where groupName = "{name}";""").fetchone()
-        return group_id[0]
+        group_id = self.cache.get(("group_id", name), lambda: self.project_db.execute(
+            SQL_GROUP_ID, {"group_name": name}).fetchone()[0])
+        return group_id
 
     def de_tuple(self, list_of_tuples, extract_element=1) -> list:
         """Takes the lists of tuples outputted by sqlite3 fetch functions and extracts the tuple in the "extract_element" position"""
@@ -327,47 +1126,112 @@ class Project:
             list: a list of projects, items in the list are tuples with the structure [0]ID, [1]Name
         """
 
-        project = self.project_db.execute(
-            f"""SELECT Project.ID, Name FROM Project \
-                INNER JOIN "Group" on Project.groupID = "Group".ID \
-                INNER JOIN "Member" on "Member".groupID = "Group".ID \
-                where memberID = {self.user_id};""").fetchall()
-        return project
+        project = self.cache.get(("projects", self.user_id), lambda: tuple(self.project_db.execute(
+            SQL_PROJECT_LIST, {"user_id": self.user_id}).fetchall()))
+        return list(project)
+
+    def list_project_page(self, after_id=0, limit=PAGE_SIZE) -> list:
+        """Returns a page of the projects owned by the current user, ordered by ID
+
+        Args:
+            after_id (int): ID of the last project on the previous page, 0 for the first page
+            limit (int): maximum number of projects to return, a shorter page is the last page
+
+        Returns:
+            list: a list of projects, items in the list are tuples with the structure [0]ID, [1]Name
+        """
+        if not self._user_auth:
+            return []
+        page = self.cache.get(("projects", self.user_id, after_id, limit), lambda: tuple(self.project_db.execute(
+            SQL_PROJECT_PAGE, {"user_id": self.user_id, "after_id": after_id, "limit": limit}).fetchall()))
+        return list(page)
 
-    def search_projects(self, search) -> list:
-        """Returns list of tuples of projects in current DB meeting search criteria"""
+    def search_projects(self, search, with_text=False) -> list:
+        """Returns list of tuples of projects in current DB meeting search criteria
+
+        Words in search are matched as prefixes against project names and descriptions, best matches first
+
+        Args:
+            search (string): Search string
+            with_text (bool): Adds the description to each tuple, None when search is empty
+
+        Returns:
+            list: items in the list are tuples with the structure [0]ID, [1]Name (, [2]Description)
+        """
 
         if self._user_auth is not True:
             return []
 
+        query = fts_query(search)
+        if not query:  # Nothing to search for, list every project
+            project = self.list_project()
+            return [(*row, None) for row in project] if with_text else project
+
         project = self.project_db.execute(
-            f"""SELECT Project.ID, Name FROM Project \
-                INNER JOIN "Group" on Project.groupID = "Group".ID \
-                INNER JOIN "Member" on "Member".groupID = "Group".ID \
-                where Name like "%{search}%" AND memberID = {self.user_id};""").fetchall()
-        return project
+            SQL_PROJECT_SEARCH, {"search": query, "user_id": self.user_id}).fetchall()
+        return project if with_text else [row[:2] for row in project]
+
+    def completeness(self, tasks_in_project, tasks_complete) -> float:
+        """Returns the percentage of tasks complete rounded to 2 decimal places"""
+        if tasks_complete > 0 and tasks_in_project > 0:
+            return round(tasks_complete/tasks_in_project * 100, 2)
+        return 0
 
     def project_data(self, project_id, percentage_complete=True) -> list:
         """Returns all entries for a project"""
+        if not percentage_complete:
+            return self.project_db.execute(
+                SQL_PROJECT_DATA, {"project_id": project_id}).fetchone()
+
         project = self.project_db.execute(
-            f"""SELECT Name,Description,groupName FROM Project \
-                INNER JOIN "Group" on Project.groupID = "Group".ID \
-                where Project.ID={project_id};""").fetchone()
-        if percentage_complete:
-            project = list(project)  # Convert to list to append later
-            tasks_in_project = self.project_db.execute(
-                f"""SELECT COUNT(ID) FROM Task where projectID = {project_id};""").fetchone()
-            tasks_complete = self.project_db.execute(
-                f"""SELECT COUNT(ID) FROM Task where projectID = {project_id} and Complete = True;""").fetchone()
-            if tasks_complete[0] > 0 and tasks_in_project[0] > 0:
-                completeness = round(
-                    tasks_complete[0]/tasks_in_project[0] * 100, 2)
-            else:
-                completeness = 0
-            logging.debug("%s complete", completeness)
-            project.append(completeness)
+            SQL_PROJECT_DATA_COMPLETE, {"project_id": project_id}).fetchone()
+        if project is None:
+            return None
+        project = list(project)  # Convert to list to replace the task totals
+        completeness = self.completeness(project.pop(3), project.pop(3))
+        logging.debug("%s complete", completeness)
+        project.append(completeness)
         return project
 
+    def projects_data(self, project_ids) -> dict:
+        """Returns the data for many projects using a single query
+
+        Args:
+            project_ids (iterable): Unique ids of the projects
+
+        Returns:
+            dict: project ID to a list with the same structure as project_data, [0]Name, [1]Description, [2]groupName, [3]completeness
+        """
+        rows = self.project_db.execute(
+            SQL_PROJECTS_DATA_COMPLETE, {"project_ids": json.dumps(list(project_ids))})
+        return {project_id: [name, description, group_name, self.completeness(tasks_in_project, tasks_complete)]
+                for project_id, name, description, group_name, tasks_in_project, tasks_complete in rows}
+
+    def check_counters(self, rebuild=False) -> list:
+        """Compares the per-project task counters with the Task table
+
+        Args:
+            rebuild (bool): Recounts every project's counters if any are wrong
+
+        Returns:
+            list: mismatched projects, tuples with the structure [0]ID, [1]TotalTasks, [2]CompletedTasks, [3]actual total, [4]actual completed
+        """
+        mismatched = self.project_db.execute(SQL_COUNTERS_CHECK).fetchall()
+        for project in mismatched:
+            logging.warning("Task counters wrong for Project: %s", project)
+
+        if mismatched and rebuild:
+            try:
+                self.project_db.execute("BEGIN TRANSACTION;")
+                self.project_db.execute(SQL_COUNTERS_REBUILD)
+                self.project_db.commit()
+            except sql.Error as e_thrown:
+                logging.error("Unable to rebuild task counters: %s", e_thrown)
+                self.project_db.rollback()
+                return mismatched
+            logging.info("Task counters rebuilt ✔")
+        return mismatched
+
     def create_project(self, project_name, description, group_id) -> bool:
         """Creates a mew project
 
@@ -381,13 +1245,13 @@ class Project:
 
         try:
             self.project_db.execute(
-                f"""INSERT INTO Project (Name, Description, groupID) \
-                    VALUES("{project_name}", "{description}", {group_id});""")
+                SQL_PROJECT_INSERT, {"project_name": project_name, "description": description, "group_id": group_id})
         except sql.Error as e_thrown:
-            logging.error(f"Unable to add  \
-            {project_name} to database: {e_thrown}")
+            logging.error("Unable to add %s to database: %s",
+                          project_name, e_thrown)
             return False
         self.project_db.commit()
+        self.cache.invalidate("projects")
         return True
 
     def current_project(self, project_id, project_name) -> None:
@@ -403,12 +1267,13 @@ class Project:
         """
         try:
             self.project_db.execute(
-                f"UPDATE Project set Name = '{project_name}', Description = '{description}', groupID = {group_id} \
-                where ID = {project_id};")
+                SQL_PROJECT_UPDATE, {"project_name": project_name, "description": description,
+                                     "group_id": group_id, "project_id": project_id})
         except sql.Error:
             logging.error("Unable to edit %s in database", project_name)
             return False
         self.project_db.commit()
+        self.cache.invalidate("projects")
         return True
 
     def delete_project(self, project_id) -> bool:
@@ -421,16 +1286,17 @@ class Project:
             bool: Status of the operation (True=Successful)
         """
         try:
-            self.project_db.execute("BEGIN TRANSACTION;")
+            # The tasks of the project are deleted by ON DELETE CASCADE
             self.project_db.execute(
-                f"""DELETE FROM Task WHERE ProjectID = {project_id};""")
-            self.project_db.execute(
-                f"""DELETE FROM Project WHERE ID = {project_id};""")
+                SQL_PROJECT_DELETE, {"project_id": project_id})
             self.project_db.commit()
-            logging.info("%s Deleted from database")
+            logging.info("%s Deleted from database", project_id)
         except sql.Error:
             logging.error("Unable to delete %s from database", project_id)
+            self.project_db.rollback()
             return False
+        self.cache.invalidate("projects")
+        self.cache.invalidate("task")  # The IDs of the deleted tasks are not known without another query
         return True
 
     def list_tasks(self) -> list:
@@ -440,10 +1306,23 @@ class Project:
             list: a list of tasks, items in the list are tuples with the structure [0]ID, [1]Name
         """
 
-        tasks = self.project_db.execute(f"""SELECT ID, Name FROM Task \
-                                        WHERE projectID = {self.project_id};""").fetchall()
+        tasks = self.project_db.execute(
+            SQL_TASK_LIST, {"project_id": self.project_id}).fetchall()
         return tasks
 
+    def list_tasks_page(self, after_id=0, limit=PAGE_SIZE) -> list:
+        """Returns a page of the tasks in the project, ordered by ID
+
+        Args:
+            after_id (int): ID of the last task on the previous page, 0 for the first page
+            limit (int): maximum number of tasks to return, a shorter page is the last page
+
+        Returns:
+            list: a list of tasks, items in the list are tuples with the structure [0]ID, [1]Name
+        """
+        return self.project_db.execute(
+            SQL_TASK_PAGE, {"project_id": self.project_id, "after_id": after_id, "limit": limit}).fetchall()
+
     def task_data(self, task_id) -> tuple:
         """Returns a tuple containing the task data for the task with id = task_id
 
@@ -453,20 +1332,70 @@ class Project:
         Returns:
             tuple: [0]Name, [1]Description, [2]DateDue, [3]Complete
         """
-        return self.project_db.execute(f"""SELECT Name, Description, DateDue, Complete from Task where ID = {task_id};""").fetchone()
+        return self.cache.get(("task", task_id), lambda: self.project_db.execute(
+            SQL_TASK_DATA, {"task_id": task_id}).fetchone())
 
-    def search_tasks(self, search):
+    def search_tasks(self, search, with_text=False):
         """Returns a list of tasks matching the search criteria
 
+        Words in search are matched as prefixes against task names and descriptions, best matches first
+
         Args:
             search (string): Search string
+            with_text (bool): Adds the description to each tuple, None when search is empty
 
         Returns:
-            list: list of matching tasks
+            list: list of matching tasks, items in the list are tuples with the structure [0]ID, [1]Name (, [2]Description)
         """
-        tasks = self.project_db.execute(f"""SELECT ID, Name FROM Task \
-                                        WHERE projectID = {self.project_id} and Name like "%{search}%";""").fetchall()
-        return tasks
+        query = fts_query(search)
+        if not query:  # Nothing to search for, list every task
+            tasks = self.list_tasks()
+            return [(*row, None) for row in tasks] if with_text else tasks
+
+        tasks = self.project_db.execute(
+            SQL_TASK_SEARCH, {"project_id": self.project_id, "search": query, "user_id": self.user_id}).fetchall()
+        return tasks if with_text else [row[:2] for row in tasks]
+
+    def create_tasks_bulk(self, tasks, chunk_size=BULK_CHUNK_SIZE) -> int:
+        """Adds many tasks to any projects in a single transaction, for loading data rather than everyday use
+
+        The triggers on Task are dropped for the load and recreated afterwards, the search index and task counters
+        they would have kept up to date are rebuilt once for the whole table instead of once per task
+
+        Args:
+            tasks (iterable): dicts with the parameters of SQL_TASK_INSERT, consumed lazily in chunks of chunk_size
+
+        Returns:
+            int: number of tasks added
+
+        Raises:
+            sql.Error: If the transaction fails, no tasks are added and the triggers are left in place
+        """
+        created = 0
+        tasks = iter(tasks)
+        try:
+            self.project_db.execute("BEGIN TRANSACTION;")
+            triggers = self.project_db.execute(
+                SQL_BULK_TASK_TRIGGERS).fetchall()
+            for name, _ in triggers:
+                # Trigger names come from sqlite_master and can not be bound parameters
+                self.project_db.execute(f"""DROP TRIGGER "{name}";""")
+            while chunk := list(itertools.islice(tasks, chunk_size)):
+                self.project_db.executemany(SQL_TASK_INSERT, chunk)
+                created += len(chunk)
+            self.project_db.execute(SQL_BULK_TASK_SEARCH_REBUILD)
+            self.project_db.execute(SQL_COUNTERS_REBUILD)
+            for _, trigger_sql in triggers:
+                self.project_db.execute(trigger_sql)
+            self.project_db.commit()
+        except sql.Error as e_thrown:
+            logging.error("Unable to add tasks: %s", e_thrown)
+            self.project_db.rollback()
+            raise
+
+        self.cache.invalidate("task")  # New tasks can reuse the IDs of deleted ones
+        logging.info("%s Tasks added ✔", created)
+        return created
 
     def create_task(self, task_name, task_description, date_set, date_due, complete) -> bool:
         """Creates Task within Current Project, returns True if successful
@@ -483,14 +1412,17 @@ class Project:
         """
 
         try:
-            self.project_db.execute(f"""INSERT INTO Task (Name, Description, DateSet, DateDue, Complete, projectID) \
-                                    VALUES("{task_name}", "{task_description}", "{date_set}", "{date_due}", {complete}, {self.project_id});""")
+            # Dates are stored as ISO 8601 strings
+            cursor = self.project_db.execute(
+                SQL_TASK_INSERT, {"task_name": task_name, "description": task_description, "date_set": str(date_set),
+                                  "date_due": str(date_due), "complete": bool(complete), "project_id": self.project_id})
         except sql.Error:
             logging.error("Unable to create task: %s in Project: %s",
                           task_name, self.project_name)
             return False
 
         self.project_db.commit()
+        self.cache.invalidate("task", cursor.lastrowid)  # IDs of deleted tasks can be reused
         return True
 
     def edit_task(self, task_id, task_name, task_description, date_due, complete) -> None:
@@ -505,14 +1437,15 @@ class Project:
 
         try:
             self.project_db.execute(
-                f"""UPDATE Task set Name = "{task_name}", Description = "{task_description}", \
-                DateDue = "{date_due}", Complete = {complete} where ID = {task_id};""")
+                SQL_TASK_UPDATE, {"task_name": task_name, "description": task_description,
+                                  "date_due": str(date_due), "complete": bool(complete), "task_id": task_id})
         except sql.Error:
             logging.error("Unable to edit task: %s in Project: %s",
                           task_name, self.project_name)
             return False
 
         self.project_db.commit()
+        self.cache.invalidate("task", task_id)
         return True
 
     def delete_task(self, task_id) -> bool:
@@ -525,30 +1458,169 @@ class Project:
         """
         try:
             self.project_db.execute(
-                f"""DELETE FROM Task WHERE ID = {task_id};""")
+                SQL_TASK_DELETE, {"task_id": task_id})
         except sql.IntegrityError:
             logging.error("Unable to delete %s from database", task_id)
             return False
 
         self.project_db.commit()
+        self.cache.invalidate("task", task_id)
         return True
 
-    def clean_up(self) -> None:
-        """Removes orphaned entities"""
-
-        # Check for orphans:
-        groups = self.de_tuple(self.list_groups(), extract_element=0)
-        # Checks if a group has members, If a group has no members then the group will be deleted
-        for group_id in groups:
-            members = self.project_db.execute(
-                f"""SELECT COUNT(ID) FROM "Member" where groupID = {group_id};""").fetchone()
-            if members[0] == 0:
-                # Get the projects owned by the group:
-                projects = self.project_db.execute(
-                    f"""SELECT Project.ID FROM Project where groupID = {group_id};""").fetchall()
-                projects = self.de_tuple(projects, extract_element=0)
-                for project_id in projects:
-                    self.delete_project(project_id)
+    def complete_tasks(self, task_ids, complete=True) -> int:
+        """Marks the tasks with ids in task_ids complete (or incomplete) in one statement
+
+        Args:
+            task_ids (iterable): Unique ids of tasks in the current project
+            complete (bool)
+
+        Returns:
+            int: Number of tasks changed, 0 if the operation failed
+        """
+        return self._bulk_tasks(SQL_TASKS_COMPLETE, task_ids, complete=bool(complete))
+
+    def delete_tasks(self, task_ids) -> int:
+        """Deletes the tasks with ids in task_ids in one statement
+
+        Args:
+            task_ids (iterable): Unique ids of tasks in the current project
+
+        Returns:
+            int: Number of tasks deleted, 0 if the operation failed
+        """
+        return self._bulk_tasks(SQL_TASKS_DELETE, task_ids)
+
+    def move_tasks(self, task_ids, project_id) -> int:
+        """Moves the tasks with ids in task_ids to another project in one statement,
+        nothing is moved unless the user is a member of the group of that project
+
+        Args:
+            task_ids (iterable): Unique ids of tasks in the current project
+            project_id (int): Unique id of the project the tasks are moved to
+
+        Returns:
+            int: Number of tasks moved, 0 if the operation failed
+        """
+        return self._bulk_tasks(SQL_TASKS_MOVE, task_ids, target_id=project_id, user_id=self.user_id)
+
+    def shift_tasks(self, task_ids, days) -> int:
+        """Moves the due dates of the tasks with ids in task_ids by a number of days in one statement
+
+        Args:
+            task_ids (iterable): Unique ids of tasks in the current project
+            days (int): Days to add to each due date, negative to bring them forward
+
+        Returns:
+            int: Number of tasks changed, 0 if the operation failed
+        """
+        return self._bulk_tasks(SQL_TASKS_SHIFT_DUE, task_ids, days=int(days))
+
+    def _bulk_tasks(self, statement, task_ids, **parameters) -> int:
+        """Runs a bulk task statement for task_ids as a single transaction, returns its rowcount
+
+        The task counters of the projects are kept up to date by the Task triggers
+        """
+        task_ids = [int(task_id) for task_id in task_ids]
+        if not task_ids:
+            return 0
+        try:
+            changed = self.project_db.execute(
+                statement, {"task_ids": json.dumps(task_ids), "project_id": self.project_id, **parameters}).rowcount
+            self.project_db.commit()
+        except sql.Error as e_thrown:
+            logging.error("Unable to change %s tasks in Project: %s ✖: %s",
+                          len(task_ids), self.project_name, e_thrown)
+            self.project_db.rollback()
+            return 0
+        for task_id in task_ids:
+            self.cache.invalidate("task", task_id)
+        logging.info("%s Tasks changed ✔", changed)
+        return changed
+
+    def clean_up(self) -> int:
+        """Removes orphaned entities, returns the number of groups removed
+
+        Every group without members is deleted in a single statement, ON DELETE CASCADE removes their projects
+        and the tasks of those projects. leave_group and remove_user already do this for the groups they touch
+        """
+        try:
+            deleted = self.project_db.execute(SQL_GROUP_DELETE_ORPHANS).rowcount
+            self.project_db.commit()
+        except sql.Error as e_thrown:
+            logging.error("Unable to clean up: %s", e_thrown)
+            self.project_db.rollback()
+            return 0
+        if deleted:
+            logging.info("%s Orphaned groups removed ✔", deleted)
+            self.cache.invalidate("group_id")
+            self.cache.invalidate("projects")
+            self.cache.invalidate("task")
+        return deleted
+
+    def export_rows(self, chunk_size=BULK_CHUNK_SIZE):
+        """Yields every row of the tables in TRANSFER_TABLES, fetched chunk_size rows at a time
+
+        The rows are read in one transaction so they are a consistent snapshot of the DB,
+        only one chunk is held in memory however many rows there are
+
+        Yields:
+            tuple: [0]kind of row (a key of TRANSFER_TABLES), [1]tuple of the values of its columns
+        """
+        try:
+            self.project_db.execute("BEGIN TRANSACTION;")
+            for kind, statement in SQL_TRANSFER_SELECT.items():
+                cursor = self.project_db.execute(statement)
+                while rows := cursor.fetchmany(chunk_size):
+                    for row in rows:
+                        yield kind, row
+        finally:
+            self.project_db.rollback()  # Nothing was written, ends the read transaction
+
+    def import_rows(self, rows, chunk_size=BULK_CHUNK_SIZE) -> dict:
+        """Adds rows as returned by export_rows to the DB, for copying data into an empty DB
+
+        Rows keep their IDs so references between them stay valid, so nothing is imported unless the DB is empty.
+        Every chunk_size rows are inserted with executemany and committed as one transaction,
+        the triggers keep the task counters and search indexes up to date as the rows are added
+
+        Args:
+            rows (iterable): (kind, values) pairs, consumed lazily in chunks of chunk_size
+            chunk_size (int): number of rows inserted in each transaction
+
+        Returns:
+            dict: kind to number of rows added
+
+        Raises:
+            sql.Error: If a chunk fails, the chunks before it stay committed
+            ValueError: If the DB is not empty or a row is of an unknown kind
+        """
+        if self.project_db.execute(SQL_TRANSFER_HAS_ROWS).fetchone()[0]:
+            logging.error("Unable to import rows ✖: the DB already has data, import into a new DB")
+            raise ValueError("The DB already has data, import into a new DB")
+
+        imported = dict.fromkeys(TRANSFER_TABLES, 0)
+        rows = iter(rows)
+        try:
+            while chunk := list(itertools.islice(rows, chunk_size)):
+                added = []
+                self.project_db.execute("BEGIN TRANSACTION;")
+                for kind, group in itertools.groupby(chunk, key=lambda row: row[0]):
+                    if kind not in SQL_TRANSFER_INSERT:
+                        raise ValueError(f"Unknown kind of row: {kind!r}")
+                    added.append((kind, self.project_db.executemany(
+                        SQL_TRANSFER_INSERT[kind], (values for _, values in group)).rowcount))
+                self.project_db.commit()
+                for kind, count in added:
+                    imported[kind] += count
+        except (sql.Error, ValueError) as e_thrown:
+            logging.error("Unable to import rows after %s were added ✖: %s", sum(imported.values()), e_thrown)
+            self.project_db.rollback()
+            raise
+        finally:
+            self.cache.clear()
+
+        logging.info("Imported %s ✔", ", ".join(f"{count} {kind}" for kind, count in imported.items()))
+        return imported
 
     def exit(self) -> bool:
         """Closes open database, Returns true if successful
@@ -557,7 +1629,7 @@ class Project:
             bool: Status of the operation (True=Successful)
         """
         try:
-            self.project_db.close()
+            self.store.close()
         except sql.Error:
             logging.error("Error closing database")
             return False
@@ -565,6 +1637,10 @@ class Project:
         return True
 
 
+# Records the time and statement count of every public method of Project
+lib_metrics.instrument_methods(Project)
+
+
 class Settings:
     """This class is responsible for reading from and updating the config.json file"""
 
@@ -575,7 +1651,10 @@ class Settings:
         self.settings: dict = {
             "Note to user": "Please do not edit this file directly",
             "Theme": "System",
-            "Debug": 20
+            "Debug": 20,
+            "DB Profile": DEFAULT_DB_PROFILE,
+            "Query Metrics": True,
+            "Slow Query ms": lib_metrics.SLOW_QUERY_MS
         }
         self.read()
 
@@ -599,11 +1678,20 @@ class Settings:
     def check(self) -> None:
         """Checks the values read from the config and corrects erroneous data"""
         error_flag = False
-        if self.settings["Debug"] not in range(51):
+        if self.settings.get("Debug") not in range(51):
             self.settings["Debug"] = 20
             error_flag = True
-        if self.settings["Theme"] not in ("System", "Dark", "Light"):
+        if self.settings.get("Theme") not in ("System", "Dark", "Light"):
             self.settings["Theme"] = "System"
             error_flag = True
+        if self.settings.get("DB Profile") not in DB_PROFILES:
+            self.settings["DB Profile"] = DEFAULT_DB_PROFILE
+            error_flag = True
+        if not isinstance(self.settings.get("Query Metrics"), bool):
+            self.settings["Query Metrics"] = True
+            error_flag = True
+        if not isinstance(self.settings.get("Slow Query ms"), (int, float)) or self.settings["Slow Query ms"] < 0:
+            self.settings["Slow Query ms"] = lib_metrics.SLOW_QUERY_MS
+            error_flag = True
         if error_flag is True:
             self.write()
@@ -0,0 +1,135 @@
+"""This module generates synthetic 'TaskMaster' data for testing and benchmarks"""
+# Use PEP 8
+# Use logging module not print statements
+# Use tick and cross symbols (✔/✖) in logging
+
+import sqlite3 as sql
+import itertools
+import json
+import logging
+import math
+import random
+from collections import Counter
+from datetime import date, timedelta
+
+import src.lib_file as lib_file
+
+# Nothing depends on the current date or time so the same seed always gives a byte-identical DB
+START_DATE = date(2024, 1, 1)
+DATE_RANGE_DAYS = 365  # Tasks are set on a day within this many days of START_DATE
+MAX_DURATION_DAYS = 180  # Longest time between a task being set and being due
+MEAN_DURATION_DAYS = 14
+TASK_SKEW = 1.16  # Pareto shape for the number of tasks per project, 1.16 is the 80/20 rule
+TASK_SKEW_CAP = 200  # Largest project is at most this many times the typical size, ~70% of tasks in 20% of projects
+MEMBER_SPREAD = 0.75  # Sigma of the log-normal size of shared groups
+
+# Queries:
+SQL_LAST_IDS = """SELECT (SELECT COALESCE(MAX(ID), 0) FROM "User"), (SELECT COALESCE(MAX(ID), 0) FROM "Group");"""
+SQL_USERS_AFTER = """SELECT ID FROM "User" WHERE ID > :after_id ORDER BY ID;"""
+SQL_GROUPS_AFTER = """SELECT ID FROM "Group" WHERE ID > :after_id ORDER BY ID;"""
+SQL_GROUP_NAMES = """SELECT groupName FROM "Group";"""
+SQL_PROJECTS_OF_GROUPS = """SELECT ID FROM Project WHERE groupID IN (SELECT value FROM json_each(:group_ids)) \
+    ORDER BY ID;"""
+
+WORDS = ["deploy", "database", "design", "review", "release", "refactor", "report", "meeting", "migrate",
+         "update", "upgrade", "backup", "budget", "bug", "build", "test", "team", "client", "cleanup", "docs",
+         "invoice", "launch", "plan", "research", "support", "survey", "training", "website", "audit", "hire"]
+
+
+def user_credentials(user_number) -> tuple:
+    """Returns the (user name, password) of a generated user"""
+    return f"user{user_number:06d}", f"password{user_number}"
+
+
+def generate(db, users=1000, groups=None, members=8, projects_per_group=3, tasks=100_000, seed=0) -> dict:
+    """Fills the open DB of a lib_file.Project with generated users, groups, projects and tasks
+
+    Every user gets the usual personal group, the shared groups have a log-normal number of members around members.
+    Each group owns between 0 and twice projects_per_group projects. The tasks are spread over the projects with a
+    Pareto distribution so a few projects hold most of them, each project has its own completion ratio.
+    Only the users and groups added here are given memberships and projects, rows already in the DB are left alone
+    and users or shared groups whose names are taken are skipped
+
+    Args:
+        db (lib_file.Project): Project with an open DB, ideally a new one
+        users (int): Number of users, see user_credentials for their names and passwords
+        groups (int): Number of shared groups, defaults to one for every 10 users
+        members (int): Typical number of members of a shared group
+        projects_per_group (int): Average number of projects owned by each group
+        tasks (int): Total number of tasks
+        seed (int): Seed for the random number generator
+
+    Returns:
+        dict: Number of users, groups, memberships, projects and tasks added
+
+    Raises:
+        sql.Error: If the data can not be added
+    """
+    rand = random.Random(seed)
+    if groups is None:
+        groups = users // 10
+    connection = db.project_db
+
+    # Users and their personal groups, new rows get IDs above the largest ID already used
+    last_user_id, last_group_id = connection.execute(SQL_LAST_IDS).fetchone()
+    db.create_users_bulk(user_credentials(i) for i in range(users))
+    user_ids = [user_id for user_id, in connection.execute(
+        SQL_USERS_AFTER, {"after_id": last_user_id})]
+
+    # Shared groups, numbered past any team names already taken
+    try:
+        connection.execute("BEGIN TRANSACTION;")
+        _, personal_last_id = connection.execute(SQL_LAST_IDS).fetchone()
+        taken = {name for name, in connection.execute(SQL_GROUP_NAMES)}
+        names = (name for name in (f"team{i:05d}" for i in itertools.count()) if name not in taken)
+        # Members are only drawn from the new users, without any a shared group would be left empty
+        connection.executemany(lib_file.SQL_GROUP_INSERT, (
+            {"group_name": name} for name in itertools.islice(names, groups if user_ids else 0)))
+        shared_ids = [group_id for group_id, in connection.execute(
+            SQL_GROUPS_AFTER, {"after_id": personal_last_id})]
+        memberships = []
+        for group_id in shared_ids:
+            size = round(rand.lognormvariate(math.log(members), MEMBER_SPREAD))
+            memberships += [{"group_id": group_id, "user_id": user_id}
+                            for user_id in rand.sample(user_ids, min(max(size, 1), len(user_ids)))]
+        connection.executemany(lib_file.SQL_MEMBER_INSERT, memberships)
+
+        # Projects, for the personal groups of the new users and the shared groups
+        group_ids = [group_id for group_id, in connection.execute(
+            SQL_GROUPS_AFTER, {"after_id": last_group_id})]
+        projects = [{"project_name": f"{rand.choice(WORDS).title()} {rand.choice(WORDS)}",
+                     "description": " ".join(rand.sample(WORDS, 6)), "group_id": group_id}
+                    for group_id in group_ids for _ in range(rand.randint(0, 2 * projects_per_group))]
+        connection.executemany(lib_file.SQL_PROJECT_INSERT, projects)
+        connection.commit()
+    except sql.Error as e_thrown:
+        logging.error("Unable to generate groups and projects: %s", e_thrown)
+        connection.rollback()
+        raise
+    db.cache.clear()
+    project_ids = [project_id for project_id, in connection.execute(
+        SQL_PROJECTS_OF_GROUPS, {"group_ids": json.dumps(group_ids)})]
+
+    # Tasks, inserted project by project
+    weights = [min(rand.paretovariate(TASK_SKEW), TASK_SKEW_CAP) for _ in project_ids]
+    task_counts = Counter(rand.choices(project_ids, weights, k=tasks)) if project_ids else Counter()
+    day_names = [str(START_DATE + timedelta(days=day))
+                 for day in range(DATE_RANGE_DAYS + MAX_DURATION_DAYS)]
+
+    def task_rows():
+        for project_id in project_ids:
+            complete_ratio = rand.betavariate(0.8, 0.8)  # Most projects are either nearly done or barely started
+            for _ in range(task_counts[project_id]):
+                day_set = rand.randrange(DATE_RANGE_DAYS)
+                duration = min(int(rand.expovariate(1 / MEAN_DURATION_DAYS)), MAX_DURATION_DAYS - 1)
+                yield {"task_name": " ".join(rand.sample(WORDS, 2)).capitalize(),
+                       "description": " ".join(rand.sample(WORDS, 5)),
+                       "date_set": day_names[day_set], "date_due": day_names[day_set + duration],
+                       "complete": rand.random() < complete_ratio, "project_id": project_id}
+
+    created_tasks = db.create_tasks_bulk(task_rows()) if tasks else 0
+
+    counts = {"users": len(user_ids), "groups": len(shared_ids), "memberships": len(memberships),
+              "projects": len(project_ids), "tasks": created_tasks}
+    logging.info("Generated: %s ✔", counts)
+    return counts
@@ -0,0 +1,304 @@
+"""This module records how long 'TaskMaster' DB methods and SQL statements take"""
+# Use PEP 8
+# Use logging module not print statements
+# Use tick and cross symbols (✔/✖) in logging
+
+import sqlite3 as sql
+import functools
+import inspect
+import logging
+import re
+import threading
+from collections import deque
+from time import perf_counter
+
+# Upper bounds in milliseconds of the histogram buckets, the last bucket holds everything slower
+HISTOGRAM_BUCKETS_MS = (0.1, 0.3, 1, 3, 10, 30, 100, 300, 1000)
+HISTOGRAM_WINDOW = 1000  # Most recent executions of each query shape kept for its histogram
+SLOW_QUERY_MS = 50
+SLOW_LOG_SIZE = 50  # Most recent slow statements kept with their query plan
+SUMMARY_INTERVAL_S = 300  # Seconds between summaries written to the log, 0 to turn them off
+SUMMARY_TOP = 5  # Number of methods and query shapes listed in a summary
+PLAN_PENDING = "(query plan being explained)"  # Plan of a slow statement while another thread explains its shape
+
+# Statements EXPLAIN QUERY PLAN can describe
+_PLANNED = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=512)
+def query_shape(sql_text) -> str:
+    """Returns sql_text with literals replaced by ? and whitespace collapsed, so statements built with
+    f-strings (PRAGMA, DROP TRIGGER) are counted together"""
+    return _SPACE.sub(" ", _LITERAL.sub("?", sql_text)).strip()
+
+
+def percentile(sorted_values, fraction) -> float:
+    """Returns the value at fraction (0-1) of a sorted list, nearest rank"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+class QueryMetrics:
+    """Collects the wall time and statement count of each Project method and the time of each query shape
+
+    Methods are recorded by wrappers added with instrument_methods, statements by InstrumentedConnection.
+    Everything is recorded on the thread using the DB, snapshot and summary can be called from any thread
+    """
+
+    def __init__(self, enabled=False, slow_ms=SLOW_QUERY_MS, summary_interval_s=SUMMARY_INTERVAL_S) -> None:
+        self.enabled: bool = enabled
+        self.slow_ms: float = slow_ms
+        self.summary_interval_s: float = summary_interval_s
+        self.statements = 0  # Statements run since the last reset by every thread
+        self._thread = threading.local()  # Statements run by each thread, methods record the difference
+        self._lock = threading.Lock()
+        self._last_summary = perf_counter()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forgets everything recorded so far"""
+        with self._lock:
+            self.statements = 0
+            self._methods: dict = {}  # name to [calls, total seconds, max seconds, statements]
+            self._queries: dict = {}  # shape to [executions, total seconds, deque of recent seconds]
+            self._plans: dict = {}  # shape to its query plan, explained once
+            self.slow: deque = deque(maxlen=SLOW_LOG_SIZE)
+
+    def record_method(self, name, elapsed, statements) -> None:
+        """Adds a call of a Project method taking elapsed seconds"""
+        with self._lock:
+            method = self._methods.setdefault(name, [0, 0.0, 0.0, 0])
+            method[0] += 1
+            method[1] += elapsed
+            method[2] = max(method[2], elapsed)
+            method[3] += statements
+        self._maybe_summarise()
+
+    def count_statement(self) -> None:
+        """Adds a statement to the count of statements run, in total and by the calling thread"""
+        self._thread.statements = self.thread_statements() + 1
+        with self._lock:
+            self.statements += 1
+
+    def thread_statements(self) -> int:
+        """Returns the number of statements the calling thread has run, methods record the difference"""
+        return getattr(self._thread, "statements", 0)
+
+    def record_statement(self, connection, sql_text, parameters, many, elapsed) -> None:
+        """Adds an execution of sql_text taking elapsed seconds including fetching its rows, explains it if slow"""
+        shape = query_shape(sql_text)
+        with self._lock:
+            query = self._queries.get(shape)
+            if query is None:
+                query = self._queries[shape] = [0, 0.0, deque(maxlen=HISTOGRAM_WINDOW)]
+            query[0] += 1
+            query[1] += elapsed
+            query[2].append(elapsed)
+
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms >= self.slow_ms:
+            # Each shape is explained once, by the first thread to see it slow. The EXPLAIN runs without the lock
+            # so other threads are not held up, until it finishes they record PLAN_PENDING
+            with self._lock:
+                plan = self._plans.get(shape)
+                if plan is None:
+                    self._plans[shape] = PLAN_PENDING
+            if plan is None:
+                plan = explain(connection, sql_text, None if many else parameters)
+                with self._lock:
+                    self._plans[shape] = plan
+            with self._lock:
+                self.slow.append({"ms": round(elapsed_ms, 3), "query": shape, "plan": plan})
+            logging.warning("Slow query ✖ %.1f ms: %s\n%s", elapsed_ms, shape, plan)
+
+    def snapshot(self) -> dict:
+        """Returns everything recorded so far
+
+        Returns:
+            dict: "methods" name to calls, total/mean/max ms and statements,
+            "queries" shape to executions, total/p50/p95/max ms and a histogram of the recent executions,
+            "slow" the recent slow statements with their query plans
+        """
+        with self._lock:
+            methods = {name: {"calls": calls, "total_ms": total * 1000, "mean_ms": total / calls * 1000,
+                              "max_ms": longest * 1000, "statements": statements}
+                       for name, (calls, total, longest, statements) in self._methods.items()}
+            queries = {}
+            for shape, (executions, total, recent) in self._queries.items():
+                recent = sorted(recent)
+                histogram = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+                bucket = 0
+                for elapsed in recent:
+                    while bucket < len(HISTOGRAM_BUCKETS_MS) and elapsed * 1000 >= HISTOGRAM_BUCKETS_MS[bucket]:
+                        bucket += 1
+                    histogram[bucket] += 1
+                queries[shape] = {"executions": executions, "total_ms": total * 1000,
+                                  "p50_ms": percentile(recent, 0.5) * 1000, "p95_ms": percentile(recent, 0.95) * 1000,
+                                  "max_ms": recent[-1] * 1000, "histogram": histogram}
+            return {"statements": self.statements, "methods": methods, "queries": queries, "slow": list(self.slow)}
+
+    def summary(self, top=SUMMARY_TOP) -> str:
+        """Returns the slowest methods and query shapes by total time as text"""
+        snapshot = self.snapshot()
+        lines = [f"DB metrics: {snapshot['statements']} statements, {len(snapshot['slow'])} slow"]
+        for name, method in sorted(snapshot["methods"].items(), key=lambda item: -item[1]["total_ms"])[:top]:
+            lines.append(f"  {name}: {method['calls']} calls, {method['total_ms']:.1f} ms total, "
+                         f"{method['mean_ms']:.2f} ms mean, {method['statements'] / method['calls']:.1f} statements per call")
+        for shape, query in sorted(snapshot["queries"].items(), key=lambda item: -item[1]["total_ms"])[:top]:
+            lines.append(f"  {query['executions']}x {query['total_ms']:.1f} ms total, p50 {query['p50_ms']:.2f} ms, "
+                         f"p95 {query['p95_ms']:.2f} ms: {shape[:120]}")
+        return "\n".join(lines)
+
+    def _maybe_summarise(self) -> None:
+        """Logs a summary if summary_interval_s has passed since the last one"""
+        if not self.summary_interval_s or perf_counter() - self._last_summary < self.summary_interval_s:
+            return
+        self._last_summary = perf_counter()
+        logging.info(self.summary())
+
+
+def explain(connection, sql_text, parameters) -> str:
+    """Returns the EXPLAIN QUERY PLAN of a statement as an indented tree"""
+    if sql_text.lstrip().split(None, 1)[0].upper() not in _PLANNED:
+        return "(no query plan)"
+    if parameters is None:  # executemany, the parameters have already been consumed
+        return "(no query plan for executemany)"
+    try:
+        # Called on the base class so the EXPLAIN is not recorded itself
+        rows = sql.Connection.execute(
+            connection, f"EXPLAIN QUERY PLAN {sql_text}", parameters).fetchall()
+    except sql.Error as e_thrown:
+        return f"(no query plan: {e_thrown})"
+    depths = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depths[node_id] = depths.get(parent, -1) + 1
+        lines.append("  " * depths[node_id] + detail)
+    return "\n".join(lines)
+
+
+class InstrumentedCursor(sql.Cursor):
+    """sqlite3 cursor that times its statement from execute until its rows are fetched or it is discarded"""
+
+    def __init__(self, connection) -> None:
+        super().__init__(connection)
+        self._statement = None
+        self._parameters = None
+        self._many = False
+        self._elapsed = 0.0
+
+    def _timed(self, function, *args):
+        start = perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self._elapsed += perf_counter() - start
+
+    def _start(self, sql_text, parameters, many) -> None:
+        self._finish()
+        self._statement = sql_text
+        self._parameters = parameters
+        self._many = many
+        self.connection.metrics.count_statement()
+
+    def _finish(self) -> None:
+        """Records the statement once it has finished"""
+        if self._statement is None:
+            return
+        statement, self._statement = self._statement, None
+        self.connection.metrics.record_statement(
+            self.connection, statement, self._parameters, self._many, self._elapsed)
+        self._elapsed = 0.0
+
+    def execute(self, sql_text, parameters=(), /):
+        self._start(sql_text, parameters, False)
+        return self._timed(super().execute, sql_text, parameters)
+
+    def executemany(self, sql_text, seq_of_parameters, /):
+        self._start(sql_text, None, True)
+        return self._timed(super().executemany, sql_text, seq_of_parameters)
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._finish()
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, self.arraysize if size is None else size)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        try:
+            return self._timed(super().__next__)
+        except StopIteration:
+            self._finish()
+            raise
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except sql.Error:  # Connection already closed
+            pass
+
+
+class InstrumentedConnection(sql.Connection):
+    """sqlite3 connection passing every statement run with execute or executemany to its QueryMetrics
+
+    Pass as factory= to sqlite3.connect then set the metrics attribute, it behaves as a normal connection
+    while metrics is None or not enabled
+    """
+
+    metrics: QueryMetrics | None = None
+
+    def execute(self, sql_text, parameters=(), /):
+        if self.metrics is None or not self.metrics.enabled:
+            return super().execute(sql_text, parameters)
+        return self.cursor(InstrumentedCursor).execute(sql_text, parameters)
+
+    def executemany(self, sql_text, seq_of_parameters, /):
+        if self.metrics is None or not self.metrics.enabled:
+            return super().executemany(sql_text, seq_of_parameters)
+        return self.cursor(InstrumentedCursor).executemany(sql_text, seq_of_parameters)
+
+
+def instrument_methods(cls) -> None:
+    """Wraps every public method of cls to record its wall time and statement count in self.metrics
+
+    Times are inclusive, a method calling another is recorded with the time and statements of both.
+    Generator methods are left alone, their body runs as the caller iterates so only their statements are recorded
+    """
+    for name, function in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(function) or inspect.isgeneratorfunction(function):
+            continue
+        setattr(cls, name, _timed_method(name, function))
+
+
+def _timed_method(name, function):
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        metrics = self.metrics
+        if not metrics.enabled:
+            return function(self, *args, **kwargs)
+        statements = metrics.thread_statements()
+        start = perf_counter()
+        try:
+            return function(self, *args, **kwargs)
+        finally:
+            metrics.record_method(name, perf_counter() - start,
+                                  metrics.thread_statements() - statements)
+    return wrapper
@@ -0,0 +1,142 @@
+"""This module provides search-as-you-type for 'TaskMaster' lists"""
+# Use PEP 8
+# Use logging module not print statements
+# Use tick and cross symbols (✔/✖) in logging
+
+import logging
+import re
+import unicodedata
+
+# Milliseconds without a keystroke before a search runs
+SEARCH_DEBOUNCE_MS = 250
+
+# Characters that make up a token for the FTS5 unicode61 tokenizer, everything else separates tokens
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+def tokens(text) -> list:
+    """Splits text into case folded tokens without diacritics, following the FTS5 unicode61 tokenizer"""
+    if not text:
+        return []
+    if text.isascii():  # Nothing to normalise, the common case
+        return _TOKEN.findall(text.lower())
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _TOKEN.findall(text)
+
+
+def can_narrow(old_search, new_search) -> bool:
+    """Returns True if the results for new_search must be a subset of the results for old_search
+
+    This is the case when the new search extends the old one and every word is a single token,
+    so each word is still a prefix match and words are only ever added
+    """
+    if old_search is None or not old_search.split() or not new_search.startswith(old_search):
+        return False
+    return all(tokens(word) == [word.casefold()] for word in new_search.split())
+
+
+def fts_match(search, *texts) -> bool:
+    """Returns True if every word in search is a prefix of a token in texts, matching lib_file.fts_query in memory"""
+    return bool(fts_filter(search, [texts], range(len(texts))))
+
+
+def fts_filter(search, rows, columns) -> list:
+    """Returns the rows where every word in search is a prefix of a token in the given columns"""
+    words = tokens(search)
+    matched = []
+    for row in rows:
+        text = " ".join(row[column] or "" for column in columns)
+        if text.isascii():  # A prefix of a token is a substring of the text, cheap to reject before tokenizing
+            lower = text.lower()
+            if not all(word in lower for word in words):
+                continue
+        text_tokens = tokens(text)
+        if all(any(token.startswith(word) for token in text_tokens) for word in words):
+            matched.append(row)
+    return matched
+
+
+class IncrementalSearch:
+    """Runs a search as the user types
+
+    Keystrokes are debounced, a newer search cancels the one still running on the DB worker thread,
+    and when the new search extends the previous one its results are narrowed in memory without a query
+    """
+
+    def __init__(self, search, request, cancel, show, clear, schedule, unschedule, debounce_ms=SEARCH_DEBOUNCE_MS) -> None:
+        """
+        Args:
+            search (callable): search(term) returning tuples with the structure [0]ID, [1]Name, [2]Description, ...
+            request (callable): request(function, *args, callback=) runs function on the DB worker thread
+            cancel (callable): cancels the search request still running
+            show (callable): show(rows) displays the search results
+            clear (callable): clear() displays the full list when the search is empty
+            schedule (callable): schedule(ms, function), usually tkinter's after
+            unschedule (callable): unschedule(id), usually tkinter's after_cancel
+        """
+        self.search = search
+        self.request = request
+        self.cancel = cancel
+        self.show = show
+        self.clear = clear
+        self.schedule = schedule
+        self.unschedule = unschedule
+        self.debounce_ms: int = debounce_ms
+
+        self.term: str = ""  # Latest search that was run
+        self.rows: list | None = None  # Results of self.rows_term
+        self.rows_term: str | None = None
+        self._timer = None
+        self._pending = False  # A search request is running on the DB worker thread
+
+        # Counters for debugging and benchmarks
+        self.queries = 0
+        self.narrowed = 0
+        self.cancelled = 0
+
+    def key_pressed(self, term) -> None:
+        """Runs the search for term once no key has been pressed for debounce_ms"""
+        if self._timer is not None:
+            self.unschedule(self._timer)
+        self._timer = self.schedule(self.debounce_ms, lambda: self.run(term))
+
+    def run(self, term) -> None:
+        """Runs the search for term now"""
+        if self._timer is not None:
+            self.unschedule(self._timer)
+            self._timer = None
+        if term == self.term:
+            return
+
+        if self._pending:  # The previous search is out of date
+            self.cancel()
+            self._pending = False
+            self.cancelled += 1
+        self.term = term
+
+        if not term.split():
+            self.reset()
+            self.clear()
+        elif can_narrow(self.rows_term, term):
+            self.narrowed += 1
+            self.results(term, fts_filter(term, self.rows, (1, 2)))
+        else:
+            self.queries += 1
+            self._pending = True
+            self.request(self.search, term,
+                         callback=lambda rows: self.results(term, rows))
+
+    def results(self, term, rows) -> None:
+        """Stores and displays the results for term"""
+        self._pending = False
+        self.rows = rows
+        self.rows_term = term
+        logging.info("Search \"%s\": %s results", term, len(rows))
+        self.show(rows)
+
+    def reset(self) -> None:
+        """Forgets the stored results, called when the data they came from changes"""
+        self.term = ""
+        self.rows = None
+        self.rows_term = None
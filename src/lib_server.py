@@ -0,0 +1,297 @@
+"""This module serves the lib_file.Project operations of 'TaskMaster' to many users over a JSON API"""
+# Use PEP 8
+# Use logging module not print statements
+# Use tick and cross symbols (✔/✖) in logging
+
+import sqlite3 as sql
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import src.lib_file as lib_file
+
+READERS = 4  # Reader connections, reads run in parallel on these while writes wait for the single writer
+MAX_BODY = 1024 * 1024  # Largest request body accepted in bytes
+SESSION_TIMEOUT_S = 8 * 60 * 60  # Sessions unused for this long are dropped
+
+# Methods of lib_file.Project that can be called, reads run on any reader connection and writes on the writer
+READ_METHODS = ("list_groups", "get_group_id", "list_project", "list_project_page", "search_projects",
+                "project_data", "projects_data", "current_project", "list_tasks", "list_tasks_page", "task_data",
+                "search_tasks")
+WRITE_METHODS = ("create_user", "edit_user", "remove_user", "join_group", "create_group", "leave_group",
+                 "create_project", "edit_project", "delete_project", "create_task", "edit_task", "delete_task",
+                 "complete_tasks", "delete_tasks", "move_tasks", "shift_tasks")
+# Handled by the server itself, they only change the session
+SESSION_METHODS = ("login", "logout")
+# Can be called without logging in
+PUBLIC_METHODS = ("login", "create_user")
+
+# What the user of a session must have access to for each method, (parameter, kind) pairs checked by authorize.
+# Kinds: "user" the user's own name, "group"/"group_name" a group the user is a member of, "project"/"projects"
+# projects of those groups, "task" a task of those projects, "current" the project set with current_project.
+# Methods with no pairs only touch the user's own data, every method in READ_METHODS and WRITE_METHODS is listed
+ACCESS_RULES = {
+    "create_user": (), "edit_user": (), "remove_user": (),
+    "list_groups": (), "list_project": (), "list_project_page": (), "search_projects": (),
+    "get_group_id": (("name", "group_name"),),
+    "join_group": (("group_name", "group_name"),),
+    "create_group": (("owner", "user"),),
+    "leave_group": (("group_id", "group"),),
+    "create_project": (("group_id", "group"),),
+    "edit_project": (("group_id", "group"), ("project_id", "project")),
+    "delete_project": (("project_id", "project"),),
+    "project_data": (("project_id", "project"),),
+    "projects_data": (("project_ids", "projects"),),
+    "current_project": (("project_id", "project"),),
+    "list_tasks": (("", "current"),), "list_tasks_page": (("", "current"),), "search_tasks": (("", "current"),),
+    "create_task": (("", "current"),),
+    "task_data": (("task_id", "task"),), "edit_task": (("task_id", "task"),), "delete_task": (("task_id", "task"),),
+    "complete_tasks": (("", "current"),), "delete_tasks": (("", "current"),), "shift_tasks": (("", "current"),),
+    "move_tasks": (("", "current"), ("project_id", "project")),
+}
+
+# Access checks, each returns a row when the user :user_id has access to :value
+SQL_ACCESS = {
+    "group": """SELECT 1 FROM "Member" WHERE groupID = :value AND memberID = :user_id;""",
+    "group_name": """SELECT 1 FROM "Member" INNER JOIN "Group" ON "Group".ID = "Member".groupID \
+        WHERE groupName = :value AND memberID = :user_id;""",
+    "project": """SELECT 1 FROM Project INNER JOIN "Member" ON "Member".groupID = Project.groupID \
+        WHERE Project.ID = :value AND memberID = :user_id;""",
+    "task": """SELECT 1 FROM Task INNER JOIN Project ON Project.ID = Task.projectID \
+        INNER JOIN "Member" ON "Member".groupID = Project.groupID \
+        WHERE Task.ID = :value AND memberID = :user_id;""",
+}
+# :value is a JSON array of project IDs, the number of them the user has access to
+SQL_ACCESS_PROJECTS = """SELECT COUNT(DISTINCT Project.ID) FROM Project \
+    INNER JOIN "Member" ON "Member".groupID = Project.groupID \
+    WHERE Project.ID IN (SELECT value FROM json_each(:value)) AND memberID = :user_id;"""
+
+
+def has_access(session, kind, value) -> bool:
+    """Returns True if the user of session has access to value, see ACCESS_RULES for the kinds"""
+    if kind == "user":
+        return value == session.user_name
+    if kind == "current":
+        kind, value = "project", session.project_id
+    if kind == "group_name" and value == "Default":  # See lib_file.Project.get_group_id
+        value = session.user_name
+    if kind == "projects":
+        project_ids = set(value)
+        return session.project_db.execute(
+            SQL_ACCESS_PROJECTS, {"value": json.dumps(list(project_ids)), "user_id": session.user_id}
+        ).fetchone()[0] == len(project_ids)
+    if value is None:
+        return False
+    return session.project_db.execute(
+        SQL_ACCESS[kind], {"value": value, "user_id": session.user_id}).fetchone() is not None
+
+
+def authorize(session, name, args, kwargs) -> None:
+    """Checks the user of session has access to everything the arguments of the method name refer to
+
+    Raises:
+        TypeError: If the arguments do not match the method
+        PermissionError: If the user does not have access
+    """
+    arguments = inspect.signature(getattr(lib_file.Project, name)).bind(session, *args, **kwargs).arguments
+    for parameter, kind in ACCESS_RULES[name]:
+        value = arguments.get(parameter)
+        if not has_access(session, kind, value):
+            raise PermissionError(f"No access to {kind} {value!r}")
+
+
+def call_authorized(session, name, args, kwargs):
+    """Runs a method of session once authorize allows it, on the thread whose connection the check used"""
+    if name not in PUBLIC_METHODS:
+        authorize(session, name, args, kwargs)
+    return getattr(session, name)(*args, **kwargs)
+
+
+class Server:
+    """Serves one DB file over HTTP, every request is a POST to /api/<method> with a JSON body {"args": [], "kwargs": {}}
+
+    The response is {"result": ...} or {"error": "..."}, login also returns a "session" token that must be sent in the
+    X-Session header of later requests. GET /status returns counters for monitoring. Reads are spread over a pool of
+    read-only connections, writes are queued for a single writer connection so they never wait on SQLite's file lock.
+    Every logged in user is a lib_file.Project session on one shared lib_file.Store, which gives each reader and
+    writer thread its own connection and shares the query cache between users. Calls are refused (403) unless the
+    user is a member of the groups whose projects and tasks they refer to, see ACCESS_RULES
+    """
+
+    def __init__(self, project_dir, file_name, readers=READERS, profile=lib_file.DEFAULT_DB_PROFILE) -> None:
+        self.file_name: str = file_name
+        self.owner = lib_file.Project()  # Opens the DB, never logged in
+        self.owner.set_dir(project_dir)
+        self.owner.set_profile(profile)
+        self.readers: int = readers
+        self._read_pool = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="Reader",
+                                             initializer=self.owner.store.set_read_only)
+        self._write_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="Writer")
+        self.sessions: dict = {}  # token to lib_file.Project session
+        self.last_used: dict = {}  # token to time.monotonic() of its last request
+        self.counters: dict = {"requests": 0, "reads": 0, "writes": 0, "errors": 0}
+        self._server: asyncio.Server | None = None
+        self._handlers: set = set()  # Tasks answering open connections, cancelled by close
+
+    async def start(self, host="127.0.0.1", port=8765) -> asyncio.Server:
+        """Opens the DB connections and starts listening, returns the asyncio server
+
+        Raises:
+            sql.DatabaseError: If the DB can not be opened
+        """
+        # Opened on the writer thread, the only connection that can run migrations, readers connect on first use
+        if not await self.run(self._write_pool, self.owner.open_db, self.file_name):
+            raise sql.DatabaseError(f"Unable to open {self.file_name}")
+
+        self._server = await asyncio.start_server(self.handle, host, port)
+        logging.info("Serving %s on %s with %s readers ✔", self.file_name,
+                     ", ".join(str(socket.getsockname()) for socket in self._server.sockets), self.readers)
+        return self._server
+
+    async def run(self, pool, function, *args, **kwargs):
+        """Runs function on a thread of pool"""
+        return await asyncio.get_running_loop().run_in_executor(
+            pool, functools.partial(function, *args, **kwargs))
+
+    async def close(self) -> None:
+        """Stops listening and closes the DB connections"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        # Kept-alive connections are not closed by the asyncio server
+        for handler in list(self._handlers):
+            handler.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        self._read_pool.shutdown()
+        self._write_pool.shutdown()
+        self.owner.exit()
+        logging.info("Server stopped ✔")
+
+    async def handle(self, stream_reader, stream_writer) -> None:
+        """Answers the HTTP/1.1 requests sent on one connection, the connection is kept open between requests"""
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            while request_line := await stream_reader.readline():
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await stream_reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    await self.respond(stream_writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                       {"error": "Request body too large"}, keep_alive=False)
+                    break
+                body = await stream_reader.readexactly(length) if length else b""
+
+                status, payload = await self.route(method, path, headers, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self.respond(stream_writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError) as e_thrown:
+            logging.debug("Connection dropped: %s", e_thrown)
+        finally:
+            self._handlers.discard(handler)
+            stream_writer.close()
+
+    async def respond(self, stream_writer, status, payload, keep_alive=True) -> None:
+        """Writes a JSON response, dates and other values JSON has no type for are sent as strings"""
+        data = json.dumps(payload, default=str).encode()
+        head = [f"HTTP/1.1 {status.value} {status.phrase}", "Content-Type: application/json",
+                f"Content-Length: {len(data)}"]
+        if not keep_alive:
+            head.append("Connection: close")
+        stream_writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+        await stream_writer.drain()
+
+    async def route(self, method, path, headers, body) -> tuple:
+        """Returns the [0]HTTPStatus and [1]JSON payload for a request"""
+        self.counters["requests"] += 1
+        if method == "GET" and path == "/status":
+            return HTTPStatus.OK, {"result": self.status()}
+        if method != "POST" or not path.startswith("/api/"):
+            return HTTPStatus.NOT_FOUND, {"error": f"No such endpoint: {method} {path}"}
+
+        name = path.removeprefix("/api/")
+        if name not in READ_METHODS + WRITE_METHODS + SESSION_METHODS:
+            return HTTPStatus.NOT_FOUND, {"error": f"No such method: {name}"}
+        try:
+            request = json.loads(body or b"{}")
+            args = list(request.get("args", []))
+            kwargs = dict(request.get("kwargs", {}))
+        except (ValueError, TypeError, AttributeError) as e_thrown:
+            return HTTPStatus.BAD_REQUEST, {"error": f"Invalid request body: {e_thrown}"}
+
+        token = headers.get("x-session", "")
+        session = self.sessions.get(token)
+        if session is None and name not in PUBLIC_METHODS:
+            return HTTPStatus.UNAUTHORIZED, {"error": "Not logged in"}
+
+        try:
+            return HTTPStatus.OK, await self.dispatch(name, args, kwargs, token, session)
+        except PermissionError as e_thrown:
+            self.counters["errors"] += 1
+            logging.warning("%s refused for %s ✖: %s", name, session.user_name, e_thrown)
+            return HTTPStatus.FORBIDDEN, {"error": str(e_thrown)}
+        except TypeError as e_thrown:  # Wrong arguments for the method
+            self.counters["errors"] += 1
+            return HTTPStatus.BAD_REQUEST, {"error": str(e_thrown)}
+        except (sql.Error, ValueError) as e_thrown:
+            self.counters["errors"] += 1
+            logging.error("%s failed ✖: %s", name, e_thrown)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e_thrown)}
+
+    async def dispatch(self, name, args, kwargs, token, session) -> dict:
+        """Runs a method for a session, returns the JSON payload"""
+        if name == "login":
+            session = self.owner.session()
+            self.counters["reads"] += 1
+            if not await self.run(self._read_pool, session.login, *args, **kwargs):
+                return {"result": False}
+            self.expire_sessions()
+            token = secrets.token_urlsafe(32)
+            self.sessions[token] = session
+            self.last_used[token] = time.monotonic()
+            return {"result": True, "session": token}
+        if session is not None:
+            self.last_used[token] = time.monotonic()
+        if name == "logout":
+            self.end_session(token)
+            return {"result": True}
+
+        if name in READ_METHODS:
+            self.counters["reads"] += 1
+            return {"result": await self.run(self._read_pool, call_authorized, session, name, args, kwargs)}
+
+        # Writes run one at a time in the order they arrive, checked on the writer so nothing changes in between
+        self.counters["writes"] += 1
+        session = session or self.owner.session()
+        result = await self.run(self._write_pool, call_authorized, session, name, args, kwargs)
+        if name == "remove_user" and result:
+            self.end_session(token)
+        return {"result": result}
+
+    def end_session(self, token) -> None:
+        """Forgets a session"""
+        self.sessions.pop(token, None)
+        self.last_used.pop(token, None)
+
+    def expire_sessions(self) -> None:
+        """Drops sessions that have not been used for SESSION_TIMEOUT_S"""
+        cutoff = time.monotonic() - SESSION_TIMEOUT_S
+        for token in [token for token, last_used in self.last_used.items() if last_used < cutoff]:
+            self.end_session(token)
+
+    def status(self) -> dict:
+        """Returns the counters of the server"""
+        return {"file": self.file_name, "sessions": len(self.sessions), "readers": self.readers,
+                "cache": self.owner.cache.stats(), **self.counters}
@@ -0,0 +1,161 @@
+"""This module streams the rows of a 'TaskMaster' DB to and from JSON Lines and CSV files"""
+# Use PEP 8
+# Use logging module not print statements
+# Use tick and cross symbols (✔/✖) in logging
+
+import csv
+import gzip
+import json
+import logging
+import os
+
+import src.lib_file as lib_file
+
+FORMATS = ("jsonl", "csv")
+# Columns holding IDs and flags, read back from CSV as int so they round-trip unchanged
+INTEGER_COLUMNS = {"ID", "groupID", "memberID", "projectID", "Complete"}
+# Written to CSV for NULL so it is not read back as an empty string, text starting with \ gets another \ in front
+CSV_NULL = "\\N"
+
+
+def open_text(file_path, mode="r"):
+    """Opens a text file for streaming, compressed with gzip if the name ends in .gz"""
+    if file_path.endswith(".gz"):
+        return gzip.open(file_path, mode + "t", encoding="utf-8", newline="")
+    return open(file_path, mode, encoding="utf-8", newline="")
+
+
+def write_jsonl(rows, file_path) -> dict:
+    """Writes rows from Project.export_rows to a JSON Lines file, one object per row
+
+    Each object has a "table" key with the kind of row and a key for each of its columns
+
+    Returns:
+        dict: kind to number of rows written
+    """
+    written = dict.fromkeys(lib_file.TRANSFER_TABLES, 0)
+    with open_text(file_path, "w") as file:
+        for kind, values in rows:
+            columns = lib_file.TRANSFER_TABLES[kind][1]
+            file.write(json.dumps({"table": kind, **dict(zip(columns, values))}, ensure_ascii=False) + "\n")
+            written[kind] += 1
+    return written
+
+
+def read_jsonl(file_path):
+    """Yields (kind, values) pairs for Project.import_rows from a JSON Lines file, one line at a time
+
+    Raises:
+        ValueError: If a line is not a JSON object of a known kind
+    """
+    with open_text(file_path) as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                columns = lib_file.TRANSFER_TABLES[record["table"]][1]
+            except (ValueError, TypeError, KeyError) as e_thrown:
+                raise ValueError(f"{file_path} line {line_number}: {e_thrown!r}") from e_thrown
+            yield record["table"], tuple(record.get(column) for column in columns)
+
+
+def encode_csv(value):
+    """Returns value as written to CSV, see CSV_NULL"""
+    if value is None:
+        return CSV_NULL
+    if isinstance(value, str) and value.startswith("\\"):
+        return "\\" + value
+    return value
+
+
+def decode_csv(value, integer=False):
+    """Returns a CSV field written by encode_csv as it was in the DB, as int if integer is True
+
+    Empty integer fields are read as None, as written by versions before CSV_NULL
+    """
+    if value == CSV_NULL:
+        return None
+    if value.startswith("\\"):
+        value = value[1:]
+    if integer:
+        return int(value) if value else None
+    return value
+
+
+def write_csv(rows, directory) -> dict:
+    """Writes rows from Project.export_rows to one CSV file per kind in directory (users.csv, tasks.csv, ...)
+
+    Each file starts with a header of column names, NULL is written as CSV_NULL
+
+    Returns:
+        dict: kind to number of rows written
+    """
+    os.makedirs(directory, exist_ok=True)
+    written = dict.fromkeys(lib_file.TRANSFER_TABLES, 0)
+    files = {}
+    writers = {}
+    try:
+        for kind, (_, columns) in lib_file.TRANSFER_TABLES.items():
+            files[kind] = open_text(os.path.join(directory, f"{kind}.csv"), "w")
+            writers[kind] = csv.writer(files[kind])
+            writers[kind].writerow(columns)
+        for kind, values in rows:
+            writers[kind].writerow([encode_csv(value) for value in values])
+            written[kind] += 1
+    finally:
+        for file in files.values():
+            file.close()
+    return written
+
+
+def read_csv(directory):
+    """Yields (kind, values) pairs for Project.import_rows from the CSV files written by write_csv, one row at a time
+
+    Files are read in the order of lib_file.TRANSFER_TABLES, kinds without a file are skipped
+
+    Raises:
+        ValueError: If a header does not match the columns of its kind or a value is not a valid integer
+    """
+    for kind, (_, columns) in lib_file.TRANSFER_TABLES.items():
+        file_path = os.path.join(directory, f"{kind}.csv")
+        if not os.path.isfile(file_path):
+            logging.warning("No %s to import ✖: %s not found", kind, file_path)
+            continue
+        with open_text(file_path) as file:
+            reader = csv.reader(file)
+            header = tuple(next(reader, ()))
+            if header != columns:
+                raise ValueError(f"{file_path}: expected columns {', '.join(columns)}")
+            integers = [column in INTEGER_COLUMNS for column in columns]
+            for values in reader:
+                try:
+                    yield kind, tuple(decode_csv(value, integer) for integer, value in zip(integers, values))
+                except ValueError as e_thrown:
+                    raise ValueError(f"{file_path} line {reader.line_num}: {e_thrown}") from e_thrown
+
+
+def export_db(project, path, file_format="jsonl", chunk_size=lib_file.BULK_CHUNK_SIZE) -> dict:
+    """Streams every row of the open DB of project to path, a file for jsonl or a directory for csv
+
+    Returns:
+        dict: kind to number of rows written
+    """
+    rows = project.export_rows(chunk_size)
+    written = write_jsonl(rows, path) if file_format == "jsonl" else write_csv(rows, path)
+    logging.info("Exported %s to %s ✔", ", ".join(f"{count} {kind}" for kind, count in written.items()), path)
+    return written
+
+
+def import_db(project, path, file_format="jsonl", chunk_size=lib_file.BULK_CHUNK_SIZE) -> dict:
+    """Streams the rows in path, written by export_db, into the open DB of project
+
+    Returns:
+        dict: kind to number of rows added
+
+    Raises:
+        sql.Error: If a chunk can not be inserted, see Project.import_rows
+        ValueError: If the DB is not empty or the file can not be parsed
+    """
+    rows = read_jsonl(path) if file_format == "jsonl" else read_csv(path)
+    return project.import_rows(rows, chunk_size)
@@ -0,0 +1,158 @@
+"""This module runs DB work for 'TaskMaster' on a background thread so the GUI never waits on a query"""
+# Use PEP 8
+# Use logging module not print statements
+# Use tick and cross symbols (✔/✖) in logging
+
+import sqlite3 as sql
+import logging
+import queue
+import threading
+
+# SQLite VM instructions between checks for cancellation of the running request
+PROGRESS_STEPS = 1000
+
+
+class Request:
+    """A function queued to run on the DB worker thread"""
+
+    def __init__(self, function, args, kwargs, callback, error, tag, generation) -> None:
+        self.function = function
+        self.args: tuple = args
+        self.kwargs: dict = kwargs
+        self.callback = callback
+        self.error = error
+        self.tag = tag
+        self.generation: int = generation
+        self.result = None
+        self.exception: BaseException | None = None
+        self.done = threading.Event()
+
+
+class DBWorker:
+    """Owns the DB connection of a lib_file.Project by running every call that uses it on one dedicated thread
+
+    Requests are queued with submit and their results are passed to callbacks on the GUI thread,
+    the GUI thread collects finished requests every poll_ms using the schedule function (usually tkinter's after)
+    """
+
+    def __init__(self, project, schedule, poll_ms=20) -> None:
+        self.project = project
+        self._schedule = schedule
+        self._poll_ms: int = poll_ms
+        self._requests: queue.Queue = queue.Queue()
+        self._results: queue.Queue = queue.Queue()
+        self._generations: dict = {}  # tag to the generation of requests that are still wanted
+        self._lock = threading.Lock()
+
+        self._thread = threading.Thread(
+            target=self._run, name="DBWorker", daemon=True)
+        self._thread.start()
+        self._schedule(self._poll_ms, self._poll)
+        logging.info("DB worker started ✔")
+
+    def submit(self, function, *args, callback=None, error=None, tag=None, **kwargs) -> Request:
+        """Queues function(*args, **kwargs) to run on the worker thread
+
+        Args:
+            function (callable): usually a method of the lib_file.Project
+            callback (callable): called on the GUI thread with the return value
+            error (callable): called on the GUI thread with the exception if function raises one
+            tag (hashable): groups requests so they can be cancelled together with cancel(tag)
+
+        Returns:
+            Request: the queued request
+        """
+        with self._lock:
+            generation = self._generations.get(tag, 0)
+        request = Request(function, args, kwargs,
+                          callback, error, tag, generation)
+        self._requests.put(request)
+        return request
+
+    def call(self, function, *args, **kwargs):
+        """Runs function(*args, **kwargs) on the worker thread and waits for the result
+
+        The wait includes every request already queued, so the GUI thread should use submit with a callback instead
+
+        Raises:
+            Any exception raised by function
+        """
+        if threading.current_thread() is self._thread:
+            return function(*args, **kwargs)
+
+        request = self.submit(function, *args, **kwargs)
+        request.done.wait()
+        if request.exception is not None:
+            raise request.exception
+        return request.result
+
+    def cancel(self, tag) -> None:
+        """Drops every queued or running request with this tag, a running query is aborted by the progress handler"""
+        with self._lock:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def is_stale(self, request) -> bool:
+        """Returns True if the request was cancelled after it was submitted"""
+        # Reading a single dict entry is atomic, this is called by SQLite's progress handler so avoids the lock
+        return request.generation != self._generations.get(request.tag, 0)
+
+    def stop(self) -> None:
+        """Stops the worker thread once queued requests have run"""
+        self._requests.put(None)
+        self._thread.join()
+        logging.info("DB worker stopped ✔")
+
+    def _run(self) -> None:
+        """Worker thread loop, runs queued requests in order"""
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            if request.callback is not None and self.is_stale(request):
+                logging.debug("Skipped cancelled request: %s",
+                              request.function)
+                request.done.set()
+                continue
+
+            # Only a connection this thread already has, asking the Project for one would connect
+            store = getattr(self.project, "store", None)
+            connection = store.current_connection() if store is not None else None
+            if connection is not None and request.tag is not None:
+                # Aborts the running query with sql.OperationalError as soon as the request is cancelled
+                connection.set_progress_handler(
+                    lambda request=request: self.is_stale(request), PROGRESS_STEPS)
+            try:
+                request.result = request.function(
+                    *request.args, **request.kwargs)
+            except Exception as e_thrown:  # Passed back to the GUI thread
+                request.exception = e_thrown
+            finally:
+                if connection is not None and request.tag is not None:
+                    try:
+                        connection.set_progress_handler(None, 0)
+                    except sql.ProgrammingError:  # Connection closed by the request
+                        pass
+
+            request.done.set()
+            if request.callback is not None or request.error is not None:
+                self._results.put(request)
+
+    def _poll(self) -> None:
+        """GUI thread loop, passes the results of finished requests to their callbacks"""
+        try:
+            while True:
+                request = self._results.get_nowait()
+                if self.is_stale(request):
+                    continue
+                if request.exception is not None:
+                    if request.error is not None:
+                        request.error(request.exception)
+                    else:
+                        logging.error("DB request failed ✖ %s: %s",
+                                      request.function, request.exception)
+                elif request.callback is not None:
+                    request.callback(request.result)
+        except queue.Empty:
+            pass
+        finally:
+            self._schedule(self._poll_ms, self._poll)
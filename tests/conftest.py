@@ -0,0 +1,28 @@
+"""Shared fixtures for the TaskMaster tests"""
+
+import pytest
+
+import src.lib_file as lib_file
+
+
+@pytest.fixture
+def project(tmp_path):
+    """A lib_file.Project with a new DB open in tmp_path"""
+    db = lib_file.Project()
+    db.set_dir(str(tmp_path))
+    assert db.create_db("test.db") is True
+    assert db.open_db("test.db") is True
+    yield db
+    db.exit()
+
+
+@pytest.fixture
+def baseline_db(tmp_path, monkeypatch):
+    """Returns the path of a DB file with the original schema (version 0), as made before migrations existed"""
+    db = lib_file.Project()
+    db.set_dir(str(tmp_path))
+    monkeypatch.setattr(lib_file, "MIGRATIONS", [])
+    assert db.create_db("baseline.db") is True
+    db.exit()
+    monkeypatch.undo()
+    return tmp_path / "baseline.db"
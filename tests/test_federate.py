@@ -0,0 +1,73 @@
+"""Tests for querying many DB files at once with lib_federate"""
+
+from datetime import date, timedelta
+
+import pytest
+
+import src.lib_federate as lib_federate
+import src.lib_file as lib_file
+
+FILES = 7
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    """A directory of FILES DB files, each with alice's project holding one task due today, plus a corrupt file"""
+    db = lib_file.Project()
+    db.set_dir(str(tmp_path))
+    for i in range(FILES):
+        assert db.create_db(f"file{i}.db") is True
+        assert db.open_db(f"file{i}.db") is True
+        assert db.create_user("alice", "alice password") is True
+        assert db.login("alice", "alice password") is True
+        assert db.create_project(f"plan {i}", "shared roadmap", db.get_group_id("Default")) is True
+        db.current_project(*db.list_project()[0])
+        assert db.create_task(f"task {i}", "", date.today(), date.today(), i % 2 == 0) is True
+        db.exit()
+    (tmp_path / "broken.db").write_bytes(b"not a database" * 100)
+    return tmp_path
+
+
+@pytest.fixture
+def federation(project_dir, monkeypatch):
+    """Alice's federation, attaching at most 2 files per connection so the files are split over several batches"""
+    monkeypatch.setattr(lib_federate.Federation, "attach_limit", lambda self: 2)
+    return lib_federate.Federation(str(project_dir), "alice", lib_file.hash_password("alice password"), workers=3)
+
+
+def test_due_tasks_across_batches(federation):
+    rows = federation.due_tasks(date.today() - timedelta(days=1), date.today() + timedelta(days=1))
+    # Odd numbered tasks are incomplete
+    assert sorted(row[0] for row in rows) == [f"file{i}" for i in range(FILES) if i % 2]
+    assert "broken" in federation.skipped
+
+
+def test_search_across_batches(federation):
+    rows = federation.search_projects("roadmap")
+    assert sorted(row[0] for row in rows) == [f"file{i}" for i in range(FILES)]
+    assert {row[2] for row in rows} == {f"plan {i}" for i in range(FILES)}
+
+
+def test_completion_across_batches(federation):
+    rows = federation.completion()
+    assert [row[0] for row in rows] == [f"file{i}" for i in range(FILES)]
+    assert [row[4] for row in rows] == [0 if i % 2 else 100.0 for i in range(FILES)]
+
+
+def test_wrong_password_finds_nothing(project_dir):
+    federation = lib_federate.Federation(str(project_dir), "alice", lib_file.hash_password("guess"))
+    assert federation.due_tasks() == []
+    assert all(projects == 0 for _, projects, _, _, _ in federation.completion())
+
+
+def test_files_come_from_the_project_file_index(project_dir, monkeypatch):
+    db = lib_file.Project()
+    db.set_dir(str(project_dir))
+    assert db.open_db("file0.db") is True
+    assert db.login("alice", "alice password") is True
+    federation = lib_federate.Federation.for_project(db)
+    assert federation.file_index is db.file_index
+    monkeypatch.setattr(lib_federate.os, "listdir", None)  # The directory is only scanned through the index
+    assert federation.files() == ["broken"] + [f"file{i}" for i in range(FILES)]
+    assert len(federation.completion()) == FILES
+    db.exit()
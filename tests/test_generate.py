@@ -0,0 +1,39 @@
+"""Tests for the synthetic data of lib_generate"""
+
+import src.lib_generate as lib_generate
+
+
+def count(project, table):
+    return project.project_db.execute(f"""SELECT COUNT(*) FROM "{table}";""").fetchone()[0]
+
+
+def test_generate_counts(project):
+    counts = lib_generate.generate(project, users=50, tasks=500, seed=1)
+    assert counts["users"] == count(project, "User") == 50
+    assert counts["groups"] == 5
+    assert counts["tasks"] == count(project, "Task") == 500
+    assert project.check_counters() == []
+
+
+def test_generate_again_skips_existing_rows(project):
+    lib_generate.generate(project, users=50, tasks=500, seed=1)
+    counts = lib_generate.generate(project, users=50, tasks=500, seed=2)
+    assert counts == {"users": 0, "groups": 0, "memberships": 0, "projects": 0, "tasks": 0}
+    assert project.clean_up() == 0  # No shared group was left without members
+
+
+def test_zero_counts_leave_existing_users_alone(project):
+    project.create_users_bulk([("loaded", "password")])
+    counts = lib_generate.generate(project, users=0, tasks=0)
+    assert counts == {"users": 0, "groups": 0, "memberships": 0, "projects": 0, "tasks": 0}
+    assert count(project, "Project") == 0
+
+
+def test_user_named_like_a_team_is_not_a_shared_group(project):
+    project.create_users_bulk([("team00000", "password")])
+    counts = lib_generate.generate(project, users=20, groups=2, tasks=0, seed=1)
+    assert counts["groups"] == 2
+    member_counts = project.project_db.execute(
+        """SELECT COUNT(*) FROM "Member" INNER JOIN "Group" ON "Group".ID = "Member".groupID \
+        WHERE groupName = 'team00000';""").fetchone()[0]
+    assert member_counts == 1  # Only the user in their own personal group
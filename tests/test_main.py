@@ -0,0 +1,47 @@
+"""Tests for the list data of the GUI frames in main.py, called without widgets so they run without a display"""
+
+from types import SimpleNamespace
+
+import main
+
+
+def test_project_rows_show_completion(project):
+    assert project.create_user("alice", "password") is True
+    assert project.login("alice", "password") is True
+    assert project.create_project("first", "", project.get_group_id("Default")) is True
+    project.current_project(*project.list_project()[0])
+    for complete in (True, False, False, False):
+        assert project.create_task("task", "", "2024-01-01", "2024-01-10", complete) is True
+
+    frame = SimpleNamespace(projects_do=project)
+    rows = main.ProjectFrame.with_completeness(frame, project.list_project())
+    assert [main.ProjectFrame.item_text(frame, row) for row in rows] == ["1 first  (25.0% Complete)"]
+
+
+def test_save_project_resolves_the_group(project):
+    assert project.create_user("alice", "password") is True
+    assert project.login("alice", "password") is True
+    frame = SimpleNamespace(projects_do=project)
+    assert main.ProjectFrame.save_project(frame, "first", "old", "Default") is True
+    project_id = project.list_project()[0][0]
+    assert main.ProjectFrame.save_project(frame, "renamed", "new", "Default", project_id) is True
+    assert project.project_data(project_id)[:3] == ["renamed", "new", "alice"]  # "Default" is the personal group
+
+
+def test_move_to_project_by_name_or_id(project):
+    assert project.create_user("alice", "password") is True
+    assert project.login("alice", "password") is True
+    for name in ("first", "second"):
+        assert project.create_project(name, "", project.get_group_id("Default")) is True
+    (first, _), (second, _) = project.list_project()
+    project.current_project(first, "first")
+    for _ in range(3):
+        assert project.create_task("task", "", "2024-01-01", "2024-01-10", False) is True
+    task_ids = [task_id for task_id, _ in project.list_tasks()]
+
+    frame = SimpleNamespace(projects_do=project)
+    assert main.TasksFrame.move_to_project(frame, task_ids, "first", first) is None  # Already there
+    assert main.TasksFrame.move_to_project(frame, task_ids, "missing", first) is None
+    assert main.TasksFrame.move_to_project(frame, task_ids[:1], "second", first) == 1
+    assert main.TasksFrame.move_to_project(frame, task_ids[1:], str(second), first) == 2
+    assert project.list_tasks() == []
@@ -0,0 +1,117 @@
+"""Tests for recording DB metrics from many threads with lib_metrics"""
+
+import sqlite3 as sql
+import threading
+
+import src.lib_metrics as lib_metrics
+
+THREADS = 8
+STATEMENTS = 500
+
+
+def connect(metrics, file_path):
+    connection = sql.connect(file_path, factory=lib_metrics.InstrumentedConnection, check_same_thread=False)
+    connection.metrics = metrics
+    return connection
+
+
+def test_statements_counted_from_many_threads(tmp_path):
+    metrics = lib_metrics.QueryMetrics(enabled=True, summary_interval_s=0)
+    file_path = str(tmp_path / "metrics.db")
+    connect(metrics, file_path).execute("CREATE TABLE t (x);")
+    metrics.reset()
+
+    def run():
+        connection = connect(metrics, file_path)
+        for i in range(STATEMENTS):
+            connection.execute("SELECT ?;", (i,)).fetchone()
+        connection.close()
+
+    threads = [threading.Thread(target=run) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["statements"] == THREADS * STATEMENTS
+    assert snapshot["queries"]["SELECT ?;"]["executions"] == THREADS * STATEMENTS
+
+
+def test_slow_shape_explained_once(tmp_path, monkeypatch):
+    metrics = lib_metrics.QueryMetrics(enabled=True, slow_ms=0, summary_interval_s=0)
+    explained = []
+    explain = lib_metrics.explain
+    monkeypatch.setattr(lib_metrics, "explain", lambda *args: explained.append(args[1]) or explain(*args))
+    file_path = str(tmp_path / "metrics.db")
+    barrier = threading.Barrier(THREADS)
+
+    def run():
+        connection = connect(metrics, file_path)
+        barrier.wait()
+        for _ in range(20):
+            connection.execute("SELECT 1 WHERE 1 = ?;", (1,)).fetchall()
+        connection.close()
+
+    threads = [threading.Thread(target=run) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert explained == ["SELECT 1 WHERE 1 = ?;"]
+    assert len(metrics.snapshot()["slow"]) == lib_metrics.SLOW_LOG_SIZE
+
+
+def test_method_statements_only_count_its_thread(tmp_path):
+    metrics = lib_metrics.QueryMetrics(enabled=True, summary_interval_s=0)
+    file_path = str(tmp_path / "metrics.db")
+    noise_ran = threading.Event()
+    stop = threading.Event()
+
+    class Counter:
+        def __init__(self):
+            self.metrics = metrics
+            self.connection = connect(metrics, file_path)
+
+        def two_statements(self):
+            self.connection.execute("SELECT 1;").fetchone()
+            noise_ran.clear()
+            noise_ran.wait()  # Another thread runs statements during the method
+            self.connection.execute("SELECT 2;").fetchone()
+
+    lib_metrics.instrument_methods(Counter)
+
+    def noise():
+        connection = connect(metrics, file_path)
+        while not stop.is_set():
+            connection.execute("SELECT 3;").fetchone()
+            noise_ran.set()
+        connection.close()
+
+    thread = threading.Thread(target=noise)
+    thread.start()
+    try:
+        for _ in range(20):
+            Counter().two_statements()
+    finally:
+        stop.set()
+        thread.join()
+
+    method = metrics.snapshot()["methods"]["two_statements"]
+    assert method["calls"] == 20
+    assert method["statements"] == 40
+
+
+def test_generator_methods_not_wrapped():
+    class Rows:
+        def rows(self):
+            yield 1
+
+        def count(self):
+            return 1
+
+    rows, count = Rows.rows, Rows.count
+    lib_metrics.instrument_methods(Rows)
+    assert Rows.rows is rows
+    assert Rows.count is not count
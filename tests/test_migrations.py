@@ -0,0 +1,71 @@
+"""Tests for the schema migrations of lib_file.Project"""
+
+import sqlite3 as sql
+
+import src.lib_file as lib_file
+
+
+def fill_with_orphans(file_path):
+    """Adds a user with a group, project and tasks to a baseline DB, plus rows referring to missing rows"""
+    connection = sql.connect(file_path)  # Foreign keys are not enforced, as by the original program
+    with connection:
+        connection.execute("""INSERT INTO "User" (ID, UserName, PassHash) VALUES (1, 'alice', ?);""",
+                           (lib_file.hash_password("secret"),))
+        connection.execute("""INSERT INTO "Group" (ID, groupName) VALUES (1, 'alice');""")
+        connection.execute("""INSERT INTO "Member" (ID, groupID, memberID) VALUES (1, 1, 1);""")
+        connection.execute("""INSERT INTO Project (ID, Name, Description, groupID) VALUES (1, 'kept', '', 1);""")
+        connection.executemany("""INSERT INTO Task (ID, Name, Description, DateSet, DateDue, Complete, projectID) \
+            VALUES (?, 'task', '', '2024-01-01', '2024-01-02', ?, ?);""",
+                               [(1, 0, 1), (2, 1, 1),
+                                (3, 0, 99)])  # Project 99 does not exist
+        connection.execute("""INSERT INTO "Member" (ID, groupID, memberID) VALUES (2, 98, 1);""")  # No group 98
+        connection.execute("""INSERT INTO "Member" (ID, groupID, memberID) VALUES (3, 1, 97);""")  # No user 97
+        connection.execute("""INSERT INTO Project (ID, Name, Description, groupID) VALUES (2, 'gone', '', 98);""")
+        connection.execute("""INSERT INTO Task (ID, Name, Description, DateSet, DateDue, Complete, projectID) \
+            VALUES (4, 'task', '', '2024-01-01', '2024-01-02', 0, 2);""")  # Project 2 is an orphan itself
+    connection.close()
+
+
+def test_new_db_is_latest_version(project):
+    assert project.schema_version() == lib_file.SCHEMA_VERSION
+
+
+def test_baseline_db_migrates(baseline_db):
+    db = lib_file.Project()
+    db.set_dir(str(baseline_db.parent))
+    assert db.open_db(baseline_db.name) is True
+    assert db.schema_version() == lib_file.SCHEMA_VERSION
+    db.exit()
+
+
+def test_orphaned_rows_are_dropped_by_migration(baseline_db):
+    fill_with_orphans(baseline_db)
+    db = lib_file.Project()
+    db.set_dir(str(baseline_db.parent))
+
+    assert db.open_db(baseline_db.name) is True
+    assert db.schema_version() == lib_file.SCHEMA_VERSION
+    connection = db.project_db
+    assert connection.execute("PRAGMA foreign_key_check;").fetchall() == []
+    assert connection.execute("SELECT ID FROM Member ORDER BY ID;").fetchall() == [(1,)]
+    assert connection.execute("SELECT ID FROM Project ORDER BY ID;").fetchall() == [(1,)]
+    assert connection.execute("SELECT ID FROM Task ORDER BY ID;").fetchall() == [(1,), (2,)]
+    assert db.check_counters() == []
+    assert connection.execute("SELECT TotalTasks, CompletedTasks FROM Project;").fetchone() == (2, 1)
+
+    assert db.login("alice", "secret") is True
+    assert db.search_projects("kept") == [(1, "kept")]
+    db.exit()
+
+
+def test_migrated_foreign_keys_cascade(baseline_db):
+    fill_with_orphans(baseline_db)
+    db = lib_file.Project()
+    db.set_dir(str(baseline_db.parent))
+    assert db.open_db(baseline_db.name) is True
+
+    db.project_db.execute("""DELETE FROM "Group" WHERE ID = 1;""")
+    db.project_db.commit()
+    assert db.project_db.execute("SELECT COUNT(*) FROM Task;").fetchone() == (0,)
+    assert db.project_db.execute("SELECT COUNT(*) FROM Member;").fetchone() == (0,)
+    db.exit()
@@ -0,0 +1,114 @@
+"""Tests for the access rules of lib_server, run against a server on a local port"""
+
+import asyncio
+import threading
+from datetime import date
+
+import pytest
+
+import src.lib_client as lib_client
+import src.lib_file as lib_file
+import src.lib_server as lib_server
+
+
+@pytest.fixture
+def server_url(tmp_path):
+    """Serves a DB where alice and bob each have a project with a task, returns the URL of the server"""
+    db = lib_file.Project()
+    db.set_dir(str(tmp_path))
+    assert db.create_db("server.db") is True
+    assert db.open_db("server.db") is True
+    for user_name in ("alice", "bob"):
+        assert db.create_user(user_name, f"{user_name} password") is True
+        assert db.login(user_name, f"{user_name} password") is True
+        assert db.create_project(f"{user_name} plan", "", db.get_group_id("Default")) is True
+        db.current_project(*db.list_project()[0])
+        assert db.create_task(f"{user_name} task", "", date.today(), date.today(), False) is True
+    db.exit()
+
+    loop = asyncio.new_event_loop()
+    server = lib_server.Server(str(tmp_path), "server.db", readers=2)
+    listener = loop.run_until_complete(server.start("127.0.0.1", 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{listener.sockets[0].getsockname()[1]}"
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def log_in(url, user_name):
+    """Returns a RemoteProject logged in as user_name with their first project as the current project"""
+    remote = lib_client.RemoteProject(url)
+    assert remote.login(user_name, f"{user_name} password") is True
+    remote.current_project(*remote.list_project()[0])
+    return remote
+
+
+def test_every_method_has_access_rules():
+    assert set(lib_server.READ_METHODS + lib_server.WRITE_METHODS) == set(lib_server.ACCESS_RULES)
+
+
+def test_not_logged_in_is_refused(server_url):
+    remote = lib_client.RemoteProject(server_url)
+    with pytest.raises(lib_client.RemoteError, match="Not logged in"):
+        remote.list_project()
+    remote.exit()
+
+
+def test_own_data_is_allowed(server_url):
+    alice = log_in(server_url, "alice")
+    project_id, project_name = alice.list_project()[0]
+    assert project_name == "alice plan"
+    assert alice.project_data(project_id)[0] == "alice plan"
+    task_id = alice.list_tasks()[0][0]
+    assert alice.task_data(task_id)[0] == "alice task"
+    assert alice.complete_tasks([task_id]) == 1
+    assert alice.delete_project(project_id) is True
+    assert alice.list_project() == []
+    alice.exit()
+
+
+@pytest.mark.parametrize("method, arguments", [
+    ("project_data", lambda ids: (ids["project"],)),
+    ("projects_data", lambda ids: ([ids["project"], ids["own_project"]],)),
+    ("current_project", lambda ids: (ids["project"], "alice plan")),
+    ("task_data", lambda ids: (ids["task"],)),
+    ("edit_task", lambda ids: (ids["task"], "taken", "", date.today(), True)),
+    ("delete_task", lambda ids: (ids["task"],)),
+    ("delete_project", lambda ids: (ids["project"],)),
+    ("edit_project", lambda ids: ("taken", "", ids["own_group"], ids["project"])),
+    ("create_project", lambda ids: ("intruder", "", ids["group"])),
+    ("leave_group", lambda ids: (ids["group"],)),
+    ("join_group", lambda ids: ("bob", "alice")),
+    ("create_group", lambda ids: ("alice", "alice's new group")),
+    ("get_group_id", lambda ids: ("alice",)),
+    ("move_tasks", lambda ids: ([ids["own_task"]], ids["project"])),
+])
+def test_other_users_data_is_refused(server_url, method, arguments):
+    alice = log_in(server_url, "alice")
+    ids = {"project": alice.list_project()[0][0], "task": alice.list_tasks()[0][0],
+           "group": alice.get_group_id("Default")}
+    bob = log_in(server_url, "bob")
+    ids.update(own_project=bob.list_project()[0][0], own_task=bob.list_tasks()[0][0],
+               own_group=bob.get_group_id("Default"))
+
+    with pytest.raises(lib_client.RemoteError, match="No access"):
+        getattr(bob, method)(*arguments(ids))
+
+    # Nothing of alice's has changed
+    assert alice.list_project() == [(ids["project"], "alice plan")]
+    assert tuple(alice.task_data(ids["task"])) == ("alice task", "", str(date.today()), 0)
+    assert alice.list_groups() == [(ids["group"], "alice")]
+    assert bob.list_tasks() == [(ids["own_task"], "bob task")]
+    alice.exit()
+    bob.exit()
+
+
+def test_tasks_need_a_current_project(server_url):
+    remote = lib_client.RemoteProject(server_url)
+    assert remote.login("bob", "bob password") is True
+    with pytest.raises(lib_client.RemoteError, match="No access"):
+        remote.list_tasks()
+    remote.exit()
@@ -0,0 +1,76 @@
+"""Tests for the task methods of lib_file.Project, the task counters and search index kept by the Task triggers"""
+
+from datetime import date
+
+import pytest
+
+
+@pytest.fixture
+def tasks(project):
+    """Logs in a user with two projects, opens the first and adds five incomplete tasks, returns their IDs"""
+    assert project.create_user("alice", "password") is True
+    assert project.login("alice", "password") is True
+    group_id = project.get_group_id("Default")
+    assert project.create_project("first", "", group_id) is True
+    assert project.create_project("second", "", group_id) is True
+    project.current_project(*project.list_project()[0])
+    for i in range(5):
+        assert project.create_task(f"task {i}", "weekly report", date(2024, 1, 1), date(2024, 1, 10), False) is True
+    return [task_id for task_id, _ in project.list_tasks()]
+
+
+def counters(project):
+    return project.project_db.execute("SELECT Name, TotalTasks, CompletedTasks FROM Project ORDER BY ID;").fetchall()
+
+
+def test_complete_tasks(project, tasks):
+    assert project.complete_tasks(tasks[:3]) == 3
+    assert project.complete_tasks(tasks[:3]) == 0  # Already complete
+    assert counters(project) == [("first", 5, 3), ("second", 0, 0)]
+    assert project.complete_tasks(tasks[:1], complete=False) == 1
+    assert counters(project) == [("first", 5, 2), ("second", 0, 0)]
+    assert project.task_data(tasks[1])[3] == 1
+    assert project.check_counters() == []
+
+
+def test_delete_tasks(project, tasks):
+    project.complete_tasks(tasks[:2])
+    assert project.delete_tasks(tasks[1:3]) == 2
+    assert counters(project) == [("first", 3, 1), ("second", 0, 0)]
+    assert project.task_data(tasks[1]) is None
+    assert [task_id for task_id, _ in project.search_tasks("weekly")] == [tasks[0], tasks[3], tasks[4]]
+
+
+def test_move_tasks(project, tasks):
+    second = project.list_project()[1]
+    project.complete_tasks(tasks[:1])
+    assert project.move_tasks(tasks[:2], second[0]) == 2
+    assert counters(project) == [("first", 3, 0), ("second", 2, 1)]
+    project.current_project(*second)
+    assert [task_id for task_id, _ in project.list_tasks()] == tasks[:2]
+    assert project.check_counters() == []
+
+
+def test_move_tasks_needs_membership(project, tasks):
+    assert project.create_user("bob", "password") is True
+    assert project.login("bob", "password") is True
+    assert project.create_project("bob's", "", project.get_group_id("Default")) is True
+    bobs_project = project.list_project()[0][0]
+    assert project.login("alice", "password") is True
+    assert project.move_tasks(tasks, bobs_project) == 0
+    assert counters(project)[0] == ("first", 5, 0)
+
+
+def test_shift_tasks(project, tasks):
+    assert project.shift_tasks(tasks[:2], 5) == 2
+    assert project.shift_tasks(tasks[1:2], -30) == 1
+    assert [project.task_data(task_id)[2] for task_id in tasks[:3]] == ["2024-01-15", "2023-12-16", "2024-01-10"]
+
+
+def test_bulk_methods_only_touch_the_current_project(project, tasks):
+    project.current_project(*project.list_project()[1])
+    assert project.complete_tasks(tasks) == 0
+    assert project.delete_tasks(tasks) == 0
+    assert project.shift_tasks(tasks, 1) == 0
+    assert project.delete_tasks([]) == 0
+    assert counters(project) == [("first", 5, 0), ("second", 0, 0)]
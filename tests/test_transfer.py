@@ -0,0 +1,70 @@
+"""Tests for exporting and importing DB files with lib_transfer"""
+
+import pytest
+
+import src.lib_file as lib_file
+import src.lib_generate as lib_generate
+import src.lib_transfer as lib_transfer
+
+
+@pytest.fixture
+def source(project):
+    """The project fixture filled with generated data, including text that needs quoting in CSV and JSON
+    and descriptions that are NULL, empty or look like the CSV NULL marker"""
+    lib_generate.generate(project, users=40, tasks=3000, seed=3)
+    assert project.create_user('quote "and", comma', "password") is True
+    assert project.login('quote "and", comma', "password") is True
+    assert project.create_project("Ünïcode\nnew line", None, project.get_group_id("Default")) is True
+    for description in ("", "\\N", "\\\\N", "\\path"):
+        assert project.create_project("escapes", description, project.get_group_id("Default")) is True
+    return project
+
+
+def new_db(tmp_path, name):
+    db = lib_file.Project()
+    db.set_dir(str(tmp_path))
+    assert db.create_db(name) is True
+    assert db.open_db(name) is True
+    return db
+
+
+def rows(db):
+    return {kind: db.project_db.execute(statement).fetchall()
+            for kind, statement in lib_file.SQL_TRANSFER_SELECT.items()}
+
+
+@pytest.mark.parametrize("file_format, path", [("jsonl", "dump.jsonl"), ("jsonl", "dump.jsonl.gz"),
+                                               ("csv", "dump")])
+def test_round_trip(source, tmp_path, file_format, path):
+    written = lib_transfer.export_db(source, str(tmp_path / path), file_format, chunk_size=100)
+    copy = new_db(tmp_path, "copy.db")
+    imported = lib_transfer.import_db(copy, str(tmp_path / path), file_format, chunk_size=100)
+
+    assert imported == written
+    assert rows(copy) == rows(source)
+    assert copy.check_counters() == []
+    counters = "SELECT ID, TotalTasks, CompletedTasks FROM Project ORDER BY ID;"
+    assert copy.project_db.execute(counters).fetchall() == source.project_db.execute(counters).fetchall()
+    assert copy.login('quote "and", comma', "password") is True
+    assert copy.search_projects("Ünïcode")[0][1] == "Ünïcode\nnew line"
+    copy.exit()
+
+
+def test_import_into_db_with_data_is_refused(source, tmp_path):
+    lib_transfer.export_db(source, str(tmp_path / "dump.jsonl"))
+    copy = new_db(tmp_path, "copy.db")
+    assert copy.create_user("existing", "password") is True
+
+    with pytest.raises(ValueError, match="already has data"):
+        lib_transfer.import_db(copy, str(tmp_path / "dump.jsonl"))
+    assert rows(copy)["users"] == [(1, "existing", lib_file.hash_password("password"))]
+    copy.exit()
+
+
+def test_bad_row_keeps_earlier_chunks(tmp_path):
+    copy = new_db(tmp_path, "copy.db")
+    good = [("users", (i, f"user{i}", "hash")) for i in range(1, 6)]
+    with pytest.raises(ValueError, match="Unknown kind"):
+        copy.import_rows(good + [("robots", (1,))], chunk_size=5)
+    assert len(rows(copy)["users"]) == 5
+    copy.exit()
@@ -0,0 +1,77 @@
+"""Tests for lib_worker.DBWorker, the GUI thread is played by the test calling poll"""
+
+import sqlite3 as sql
+import threading
+import time
+
+import pytest
+
+import src.lib_worker as lib_worker
+
+# Recursive query that runs until it is interrupted
+SQL_ENDLESS = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT count(*) FROM n;"
+
+
+@pytest.fixture
+def worker(project):
+    """A DBWorker for project whose schedule does nothing, results are collected with poll"""
+    db_worker = lib_worker.DBWorker(project, lambda poll_ms, function: None)
+    yield db_worker
+    db_worker.stop()
+
+
+def poll(worker, until, timeout=5):
+    """Passes finished results to their callbacks like the GUI thread until until() is True"""
+    deadline = time.monotonic() + timeout
+    while not until():
+        assert time.monotonic() < deadline, "timed out waiting for the DB worker"
+        worker._poll()
+        time.sleep(0.01)
+
+
+def test_call_runs_on_the_worker_thread(worker):
+    assert worker.call(threading.current_thread) is worker._thread
+    assert worker.call(lambda: worker.call(sum, (1, 2))) == 3  # Nested calls run directly
+
+
+def test_call_raises_the_exception(worker):
+    with pytest.raises(ZeroDivisionError):
+        worker.call(lambda: 1 / 0)
+
+
+def test_submit_callbacks(worker):
+    results = []
+    worker.submit(sum, (1, 2), callback=results.append)
+    worker.submit(lambda: 1 / 0, callback=results.append, error=results.append)
+    poll(worker, lambda: len(results) == 2)
+    assert results[0] == 3
+    assert isinstance(results[1], ZeroDivisionError)
+
+
+def test_cancel_drops_queued_requests(worker):
+    release = threading.Event()
+    results = []
+    worker.submit(release.wait)  # Holds the worker until the requests below are queued
+    worker.submit(results.append, "dropped", callback=results.append, tag="search")
+    worker.submit(results.append, "kept", callback=results.append, tag="other")
+    untagged = worker.submit(results.append, "write")
+    worker.cancel("search")
+    release.set()
+    untagged.done.wait()
+    worker.submit(results.append, "after", callback=results.append, tag="search")
+    poll(worker, lambda: "after" in results)
+    assert [result for result in results if result is not None] == ["kept", "write", "after"]
+
+
+def test_cancel_aborts_running_query(project, worker):
+    worker.call(project.list_project)  # Connects the worker thread so the progress handler can be set
+    errors = []
+    running = worker.submit(lambda: project.project_db.execute(SQL_ENDLESS).fetchone(),
+                            callback=errors.append, error=errors.append, tag="search")
+    time.sleep(0.1)
+    worker.cancel("search")
+    assert running.done.wait(5)
+    assert isinstance(running.exception, sql.OperationalError)
+    worker._poll()
+    assert errors == []  # Stale results are not passed to callbacks
+    assert worker.call(project.list_project) == []  # Connection still usable
@@ -0,0 +1,67 @@
+"""Exports a TaskMaster DB to JSON Lines or CSV, or imports such a dump into a new DB, see src/lib_transfer.py
+
+Rows are streamed in chunks so memory use stays flat however large the DB or dump is. JSON Lines dumps are a single
+file (compressed if the name ends in .gz), CSV dumps are a directory with a file per table with NULL written as \\N.
+Imports keep the IDs of the rows, so they are meant for an empty DB such as one made with --create.
+
+Usage:
+    python transfer.py export --dir Tests --db test.db --path dump.jsonl.gz [--format jsonl]
+    python transfer.py import --dir Tests --db copy.db --path dump.jsonl.gz --create
+    python transfer.py export --dir Tests --db test.db --path dump --format csv
+"""
+
+import argparse
+import logging
+import os
+import sqlite3 as sql
+import sys
+import time
+
+import src.lib_file as lib_file
+import src.lib_transfer as lib_transfer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("--dir", default="Tests", help="Directory containing the DB")
+    parser.add_argument("--db", default="test.db", help="DB file name")
+    parser.add_argument("--path", required=True, help="Dump file (jsonl) or directory (csv)")
+    parser.add_argument("--format", choices=lib_transfer.FORMATS, default="jsonl")
+    parser.add_argument("--chunk-size", type=int, default=lib_file.BULK_CHUNK_SIZE,
+                        help="Rows fetched or committed at a time")
+    parser.add_argument("--create", action="store_true", help="Create the DB before importing")
+    parser.add_argument("--profile", choices=lib_file.DB_PROFILES, default="fast",
+                        help="DB profile used while importing")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(levelname)s: %(message)s",
+                        level=logging.INFO)
+
+    db = lib_file.Project()
+    db.set_dir(args.dir)
+    if args.command == "import":
+        db.set_profile(args.profile)
+        if args.create and not os.path.isfile(os.path.join(args.dir, args.db)):
+            assert db.create_db(args.db) is True
+    if not db.open_db(args.db):
+        sys.exit(f"Unable to open {args.db}")
+
+    start = time.perf_counter()
+    try:
+        if args.command == "export":
+            counts = lib_transfer.export_db(db, args.path, args.format, args.chunk_size)
+        else:
+            counts = lib_transfer.import_db(db, args.path, args.format, args.chunk_size)
+    except (sql.Error, ValueError, OSError) as e_thrown:
+        sys.exit(f"Unable to {args.command} ✖: {e_thrown}")
+    finally:
+        db.exit()
+    elapsed = time.perf_counter() - start
+    rows = sum(counts.values())
+    print(f"{args.command.capitalize()}ed {rows} rows in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):.0f} rows/s): " +
+          ", ".join(f"{count} {kind}" for kind, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()